@@ -0,0 +1,71 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from lib.tools_daemon import ToolsDaemon, default_socket_path, is_supported, send_command
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Local daemon that keeps Google credentials and API clients warm for the tools CLIs'
+    )
+    parser.add_argument(
+        'command',
+        choices=['serve', 'status', 'stop'],
+        help='serve: run the daemon in the foreground; status/stop: talk to a running daemon'
+    )
+    parser.add_argument('--socket', help='Unix socket path (default: $FF_TOOLS_DAEMON_SOCKET or the per-user runtime dir; CLIs only find a non-default socket through FF_TOOLS_DAEMON_SOCKET)')
+    return parser.parse_args()
+
+
+def serve(socket_path: Path) -> None:
+    try:
+        from lib import google_clients
+    except ModuleNotFoundError as err:
+        print(f'Error: {err.name} is not installed.')
+        print('Run "pip install google-api-python-client google-auth-oauthlib google-auth"')
+        raise SystemExit(1) from err
+
+    print('Loading credentials and discovery documents...', flush=True)
+    google_clients.warm()
+
+    # Import the shared modules the CLIs use so forked jobs start with them loaded
+    from lib import developer_metadata, sheet_templates, sheets_utils  # noqa: F401
+
+    try:
+        ToolsDaemon(socket_path).serve_forever(google_clients.refresh_if_expiring)
+    except RuntimeError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+
+
+def main():
+    args = parse_args()
+    if not is_supported():
+        print('Error: The tools daemon needs Unix sockets with descriptor passing (Linux/macOS, Python 3.9+).')
+        raise SystemExit(1)
+
+    socket_path = Path(args.socket) if args.socket else default_socket_path()
+
+    if args.command == 'serve':
+        serve(socket_path)
+        return
+
+    response = send_command(args.command, socket_path)
+    if response is None:
+        print(f'No tools daemon is listening on {socket_path}')
+        raise SystemExit(1)
+    print(json.dumps(response, indent=2))
+
+
+if __name__ == '__main__':
+    main()
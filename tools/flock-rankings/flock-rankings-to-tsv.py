@@ -1,6 +1,8 @@
 """Convert Flock Fantasy rankings (8 lines per player) to TSV.
 
 Invokes remove-tiers tool and outputs TSV with only columns needed by target sheet.
+With --api-json, reads a saved Flock rankings API response instead of a paste and adds
+consensus columns across every expert (see lib/flock_consensus.py).
 NOTE: Column selection will be finalized after sheet structure exploration.
 """
 import argparse
@@ -8,8 +10,24 @@ import re
 import subprocess
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+FLOCK_POSITIONS = ['QB', 'RB', 'WR', 'TE']
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script, traced
+trace_script(__file__)
+
+from lib.fantasypros import add_fantasypros_args
+
+@traced()
 def invoke_remove_tiers(input_content: str) -> str:
     """Invoke remove-tiers script on input content."""
     try:
@@ -59,6 +77,7 @@ def infer_column_count(lines: List[str]) -> int:
     return 8
 
 
+@traced()
 def parse_rankings_to_tsv(cleaned_content: str, columns_needed: list, ranking_type: str, position: Optional[str] = None) -> str:
     """Parse cleaned rankings format to TSV with specified columns.
     
@@ -157,6 +176,51 @@ def parse_rankings_to_tsv(cleaned_content: str, columns_needed: list, ranking_ty
     return '\n'.join(tsv_lines)
 
 
+@traced()
+def consensus_from_api_json(path: Path, ranking_type: str, position: Optional[str]) -> str:
+    """TSV with consensus columns from a saved Flock rankings API response (no paste or remove-tiers)."""
+    try:
+        from lib.flock_consensus import consensus, consensus_tsv, load_flock_json, rank_matrix
+    except ModuleNotFoundError as e:
+        print(f"Error: {e.name} is not installed (needed for --api-json).", file=sys.stderr)
+        print('Run "pip install numpy"', file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        matrix = rank_matrix(load_flock_json(path), ranking_type, position)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Flock API: {len(matrix.names)} players x {len(matrix.experts)} experts", file=sys.stderr)
+    return consensus_tsv(matrix, consensus(matrix), ranking_type)
+
+
+@traced()
+def load_ownership_for_flock(args):
+    """League rosters plus the FantasyPros ROS name -> player ID index that Flock names are matched through."""
+    from lib.fantasypros import fetch_rankings
+    from lib.ownership import load_ownership
+
+    ownership = load_ownership(args.roster)
+    results = fetch_rankings(args, [('ROS', position) for position in FLOCK_POSITIONS])
+    ownership.index_rankings(results.values())
+    return ownership
+
+
+def add_owner_columns(tsv_content: str, ownership, position: Optional[str], available_only: bool) -> str:
+    """Append an owner column per league (and drop rostered players if available_only)."""
+    from lib.ownership import tsv_with_owners
+    from lib.player_master import parse_position_rank, split_rank_name
+
+    def player_id_of(row: Dict[str, str]) -> Optional[int]:
+        _, name = split_rank_name(row.get('rank + name', ''))
+        row_position = parse_position_rank(row.get('pos + rk', ''))[0] or position
+        return ownership.player_id_for(name, row_position, row.get('tm') or None)
+
+    return tsv_with_owners(tsv_content, ownership, player_id_of, available_only)
+
+
+@traced()
 def generate_html(tsv_content: str) -> str:
     """Generate HTML preview from TSV."""
     lines = tsv_content.strip().split('\n')
@@ -187,13 +251,23 @@ def generate_html(tsv_content: str) -> str:
 def main():
     parser = argparse.ArgumentParser(description='Convert Flock Fantasy rankings to TSV (invokes remove-tiers)')
     parser.add_argument('--input', '-i', type=Path, help='Input file (raw rankings, before remove-tiers; default: read from stdin)')
+    parser.add_argument('--api-json', type=Path, help='Saved Flock rankings API response (per-expert ranks) instead of a paste; adds consensus columns')
     parser.add_argument('--output', '-o', type=Path, help='Output TSV file (default: write TSV to stdout)')
     parser.add_argument('--type', type=str.upper, choices=['ROS', 'WEEKLY'], required=True, help='Ranking type (case-insensitive)')
     parser.add_argument('--position', type=str.upper, choices=['QB', 'RB', 'WR', 'TE'], help='Position (required for WEEKLY, case-insensitive)')
     parser.add_argument('--week', type=int, help='Week number (required for WEEKLY, optional for ROS; used for HTML filename inference)')
     parser.add_argument('--html', action='store_true', help='Also write HTML file to docs/flock-rankings/ with inferred filename (in addition to TSV output)')
+    parser.add_argument('--roster', action='append', default=[], help='League roster JSON as PATH or NAME=PATH: adds an owner column per league (repeatable)')
+    parser.add_argument('--available-only', action='store_true', help='Only players unrostered in at least one --roster league')
+    add_fantasypros_args(parser)
     args = parser.parse_args()
     
+    if args.api_json and args.input:
+        parser.error("--api-json and --input are mutually exclusive")
+    
+    if args.available_only and not args.roster:
+        parser.error("--available-only needs at least one --roster")
+    
     if args.type == 'WEEKLY':
         if not args.position:
             parser.error("--position is required for WEEKLY type")
@@ -205,26 +279,39 @@ def main():
         if args.position:
             print(f"Warning: --position is not needed for ROS rankings (ignoring position {args.position})", file=sys.stderr)
     
-    # Read input (from file or stdin)
-    if args.input:
-        input_content = args.input.read_text(encoding='utf-8')
+    if args.api_json:
+        # Structured path: same leading columns as a paste (API-less stats blank), then consensus columns
+        tsv_content = consensus_from_api_json(args.api_json, args.type, args.position if args.type == 'WEEKLY' else None)
     else:
-        input_content = sys.stdin.read()
-    
-    # Invoke remove-tiers
-    cleaned_content = invoke_remove_tiers(input_content)
-    
-    # Columns needed based on actual sheet structure:
-    # ROS: 8 input columns, filter out gamesplayed (4th), output 7 columns
-    # WEEKLY: Position-specific input, only take first 2 columns (rankname, opponent)
-    if args.type == 'ROS':
-        columns_needed = ['rank + name', 'pos + rk', 'tm', 'snap%', 'PPR FPs', 'FPs pos rk', 'FPs rk']
-    else:  # WEEKLY
-        columns_needed = ['rank + name', 'opp']
+        # Read input (from file or stdin)
+        if args.input:
+            input_content = args.input.read_text(encoding='utf-8')
+        else:
+            input_content = sys.stdin.read()
+        
+        # Invoke remove-tiers
+        cleaned_content = invoke_remove_tiers(input_content)
+        
+        # Columns needed based on actual sheet structure:
+        # ROS: 8 input columns, filter out gamesplayed (4th), output 7 columns
+        # WEEKLY: Position-specific input, only take first 2 columns (rankname, opponent)
+        if args.type == 'ROS':
+            columns_needed = ['rank + name', 'pos + rk', 'tm', 'snap%', 'PPR FPs', 'FPs pos rk', 'FPs rk']
+        else:  # WEEKLY
+            columns_needed = ['rank + name', 'opp']
+        
+        # Generate TSV
+        # Note: position is only used/read during WEEKLY processing (ignored for ROS to keep things flowing)
+        tsv_content = parse_rankings_to_tsv(cleaned_content, columns_needed, args.type, args.position if args.type == 'WEEKLY' else None)
     
-    # Generate TSV
-    # Note: position is only used/read during WEEKLY processing (ignored for ROS to keep things flowing)
-    tsv_content = parse_rankings_to_tsv(cleaned_content, columns_needed, args.type, args.position if args.type == 'WEEKLY' else None)
+    # Owner columns go after the sheet's columns, so the upload (which takes the first num_cols) ignores them
+    if args.roster:
+        try:
+            ownership = load_ownership_for_flock(args)
+        except RuntimeError as e:
+            print(f"Error loading league rosters: {e}", file=sys.stderr)
+            sys.exit(1)
+        tsv_content = add_owner_columns(tsv_content, ownership, args.position if args.type == 'WEEKLY' else None, args.available_only)
     
     # Determine default output directory (same as waiver tool: docs/flock-rankings/)
     repo_root = Path(__file__).resolve().parent.parent.parent
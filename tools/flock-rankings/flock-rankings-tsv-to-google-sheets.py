@@ -7,25 +7,39 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from google_auth_utils import get_credentials
+# Import shared library functions
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Hand this run to the tools daemon if one is running (returns if not)
+from lib.tools_daemon import delegate_to_daemon
+delegate_to_daemon(__file__)
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script, traced
+trace_script(__file__)
 
 try:
-    from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
 except ModuleNotFoundError as err:
     print('Error: google-api-python-client is not installed.')
     print('Run "pip install google-api-python-client google-auth-oauthlib google-auth"')
     raise SystemExit(1) from err
 
-# Import shared library functions
-SCRIPT_DIR = Path(__file__).resolve().parent
-TOOLS_DIR = SCRIPT_DIR.parent
-if str(TOOLS_DIR) not in sys.path:
-    sys.path.insert(0, str(TOOLS_DIR))
-
-from lib.sheets_utils import ensure_grid_with_boundary, auto_resize_rows, auto_resize_columns, clear_cells_in_range
+from lib.google_clients import build_service, get_credentials
+from lib.sheets_utils import ensure_grid_with_boundary, auto_resize_rows, auto_resize_columns, clear_cells_in_range, find_last_row_by_probing
+from lib.sheet_templates import get_tab_properties, tab_from_template_requests, unused_tab_id
+from lib.developer_metadata import anchored_row, find_row_anchors, row_anchor_request
 
 CONFIG_FILE = SCRIPT_DIR / 'flock-rankings-sheets.json'
+TEMPLATE_TAB_NAME = 'Flock raw data template'
+# DeveloperMetadata key anchored to the last row written for each paste range
+LAST_ROW_ANCHOR_KEY = 'flock-rankings-last-row'
+# How to find the old last row when there is no anchor: read the whole window, or probe + binary search
+LAST_ROW_STRATEGIES = ['scan', 'probe']
+LAST_ROW_MAX_ROWS = 1000
 
 
 def load_config() -> Dict[str, Any]:
@@ -71,48 +85,96 @@ def get_tab_id_by_name(sheets_service, sheet_id: str, tab_name: str) -> Optional
     return None
 
 
+@traced()
 def get_or_create_tab(sheets_service, sheet_id: str, tab_name: str) -> Tuple[int, bool]:
-    """Get tab ID by name, or create it if it doesn't exist.
+    """Get tab ID by name, or create it from the hidden template tab if it doesn't exist.
     
     Returns:
         Tuple of (tab_id, was_created) where was_created is True if tab was just created.
     """
-    tab_id = get_tab_id_by_name(sheets_service, sheet_id, tab_name)
-    if tab_id is not None:
-        return tab_id, False
+    tabs = get_tab_properties(sheets_service, sheet_id)
+    if tab_name in tabs:
+        return tabs[tab_name]['sheetId'], False
     
-    # Tab doesn't exist, create it
-    result = sheets_service.spreadsheets().batchUpdate(
+    # Tab doesn't exist: duplicate the pre-formatted template (created on first use, same batch)
+    new_tab_id = unused_tab_id(tabs)
+    sheets_service.spreadsheets().batchUpdate(
         spreadsheetId=sheet_id,
-        body={'requests': [{'addSheet': {'properties': {'title': tab_name}}}]}
+        body={'requests': tab_from_template_requests(tabs, TEMPLATE_TAB_NAME, template_format_requests, new_tab_id, tab_name)}
     ).execute()
     
-    new_tab_id = result['replies'][0]['addSheet']['properties']['sheetId']
     return new_tab_id, True
 
 
-def initialize_tab(sheets_service, sheet_id: str, tab_id: int) -> None:
-    """Initialize a newly created tab with empty cell A1 (1x1 grid).
+def minimize_dimension_request(tab_id: int, dimension: str, index: int) -> Dict[str, Any]:
+    """Set a single row or column (0-indexed) to the minimal 2 pixel size."""
+    return {
+        'updateDimensionProperties': {
+            'range': {
+                'sheetId': tab_id,
+                'dimension': dimension,
+                'startIndex': index,
+                'endIndex': index + 1
+            },
+            'properties': {
+                'pixelSize': 2
+            },
+            'fields': 'pixelSize'
+        }
+    }
+
+
+def template_format_requests(tab_id: int) -> List[Dict[str, Any]]:
+    """Raw data tab layout: empty A1 in a 2x2 grid, with column A, row 1 and the boundary row/column minimized.
     
-    Uses shared ensure_grid_with_boundary from waiver-report lib.
-    Also minimizes column A and row 1 for raw data tabs.
+    Same result as ensure_grid_with_boundary(data_rows=1, data_cols=1, minimize_a1=True); baked into the
+    hidden template tab once, and reused by reset_tab.
     """
-    ensure_grid_with_boundary(sheets_service, sheet_id, tab_id, data_rows=1, data_cols=1, minimize_a1=True)
+    return [
+        minimize_dimension_request(tab_id, 'ROWS', 1),
+        minimize_dimension_request(tab_id, 'COLUMNS', 1),
+        minimize_dimension_request(tab_id, 'ROWS', 0),
+        minimize_dimension_request(tab_id, 'COLUMNS', 0)
+    ]
 
 
+@traced()
 def reset_tab(sheets_service, sheet_id: str, tab_name: str) -> None:
-    """Reset a tab by clearing all contents and reinitializing to empty 2x2 grid."""
+    """Reset a tab by clearing all contents, shrinking it to the template's 2x2 grid and reapplying
+    the template layout in one batch.
+    
+    The tab itself is kept (not replaced by a fresh template copy) so formulas in other tabs
+    that reference it stay valid.
+    """
     tab_id = get_tab_id_by_name(sheets_service, sheet_id, tab_name)
     if tab_id is None:
         print(f"Tab '{tab_name}' does not exist. Nothing to reset.")
         return
     
     print(f"Resetting tab '{tab_name}'...")
-    clear_tab(sheets_service, sheet_id, tab_id)
-    ensure_grid_with_boundary(sheets_service, sheet_id, tab_id, data_rows=1, data_cols=1, minimize_a1=True)
+    requests = [{
+        'updateCells': {
+            'range': {'sheetId': tab_id},
+            'fields': 'userEnteredValue'
+        }
+    }, {
+        'updateSheetProperties': {
+            'properties': {
+                'sheetId': tab_id,
+                'gridProperties': {'rowCount': 2, 'columnCount': 2}
+            },
+            'fields': 'gridProperties(rowCount,columnCount)'
+        }
+    }]
+    requests.extend(template_format_requests(tab_id))
+    sheets_service.spreadsheets().batchUpdate(
+        spreadsheetId=sheet_id,
+        body={'requests': requests}
+    ).execute()
     print(f"Tab '{tab_name}' reset to empty 2x2 grid")
 
 
+@traced()
 def clear_tab(sheets_service, sheet_id: str, tab_id: int) -> None:
     """Clear all contents of a tab using the values().clear() API (faster than writing empty values)."""
     # Get the sheet name from tab_id (needed for values().clear() which uses A1 notation)
@@ -182,6 +244,12 @@ def get_paste_location(ranking_type: str, position: Optional[str] = None) -> Dic
         }
 
 
+def last_row_anchor_key(ranking_type: str, position: Optional[str] = None) -> str:
+    """Metadata key for a paste range's last-row anchor (one per ROS range / WEEKLY position)."""
+    return f'{LAST_ROW_ANCHOR_KEY}:{ranking_type}:{position}' if position else f'{LAST_ROW_ANCHOR_KEY}:{ranking_type}'
+
+
+@traced()
 def parse_tsv(input_stream) -> Tuple[List[str], List[List[str]]]:
     """Parse TSV from stdin or file. Returns (headers, rows)."""
     reader = csv.reader(input_stream, delimiter='\t')
@@ -190,6 +258,7 @@ def parse_tsv(input_stream) -> Tuple[List[str], List[List[str]]]:
     return headers, rows
 
 
+@traced()
 def find_last_row_in_range(
     sheets_service,
     sheet_id: str,
@@ -197,11 +266,22 @@ def find_last_row_in_range(
     start_row: int,
     start_col: int,
     num_cols: int,
-    max_rows_to_check: int = 1000
+    max_rows_to_check: int = LAST_ROW_MAX_ROWS,
+    strategy: str = 'scan'
 ) -> int:
     """Find the last row with data in a specific column range.
     Returns the last row index (1-indexed) that has data, or start_row - 1 if none found.
+    strategy 'probe' finds it with a few batches of single-row reads instead of reading the whole window.
     """
+    if strategy == 'probe':
+        try:
+            return find_last_row_by_probing(
+                sheets_service, sheet_id, tab_name, start_row, start_col - 1, num_cols, max_rows_to_check
+            )
+        except RuntimeError as err:
+            # Assuming the range is empty would leave a stale tail behind, so read the window instead
+            print(f'Warning: Could not probe range to find last row ({err}); scanning instead')
+    
     # Convert column indices to A1 notation (1-indexed columns to letters)
     # Simple approach for columns A-Z (0-25) and AA-AZ (26-51), etc.
     def col_to_letter(col_idx_1based: int) -> str:
@@ -247,6 +327,7 @@ def find_last_row_in_range(
     return start_row + last_row_offset
 
 
+@traced()
 def write_rows_to_sheet(
     sheets_service,
     sheet_id: str,
@@ -258,7 +339,8 @@ def write_rows_to_sheet(
     start_col: int,
     num_cols: int,
     ranking_type: str,
-    position: Optional[str] = None
+    position: Optional[str] = None,
+    last_row_strategy: str = 'scan'
 ) -> None:
     """Write headers and rows to Google Sheets.
     
@@ -268,15 +350,26 @@ def write_rows_to_sheet(
         print('Warning: No data rows or headers to write')
         return
     
-    # Find the current last row in this range before writing (to clean up old data if new data is shorter)
-    old_last_row = find_last_row_in_range(
-        sheets_service,
-        sheet_id,
-        tab_name,
-        start_row,  # Start from data row (headers are above)
-        start_col,
-        num_cols
-    )
+    # Find the current last row in this range before writing (to clean up old data if new data is shorter).
+    # The previous run anchored it with row metadata; scan only if there is no usable anchor.
+    anchor_key = last_row_anchor_key(ranking_type, position)
+    extent = {'start_row': start_row, 'start_col': start_col, 'num_cols': num_cols}
+    try:
+        anchors = find_row_anchors(sheets_service, sheet_id, [anchor_key])
+    except RuntimeError as err:
+        print(f'Warning: {err}')
+        anchors = {}
+    old_last_row = anchored_row(anchors, anchor_key, tab_id, extent)
+    if old_last_row is None:
+        old_last_row = find_last_row_in_range(
+            sheets_service,
+            sheet_id,
+            tab_name,
+            start_row,  # Start from data row (headers are above)
+            start_col,
+            num_cols,
+            strategy=last_row_strategy
+        )
     
     # Header row is one row before data rows
     # For ROS: headers in row 2 (data starts row 3)
@@ -486,15 +579,17 @@ def write_rows_to_sheet(
             }
         })
     
-    if requests:
-        sheets_service.spreadsheets().batchUpdate(
-            spreadsheetId=sheet_id,
-            body={'requests': requests}
-        ).execute()
-    
     # Calculate the new last row (1-indexed)
     new_last_row = start_row + len(rows) - 1 if rows else start_row - 1
     
+    # Move the anchor to the new last row in the same batch (the row metadata follows row inserts/deletes)
+    requests.append(row_anchor_request(tab_id, anchor_key, new_last_row, extent, anchors.get(anchor_key)))
+    
+    sheets_service.spreadsheets().batchUpdate(
+        spreadsheetId=sheet_id,
+        body={'requests': requests}
+    ).execute()
+    
     # Clear cells below the new data if the new range is shorter than the old range
     # old_last_row will be start_row - 1 if no old data was found
     if old_last_row >= start_row and new_last_row < old_last_row:
@@ -612,6 +707,13 @@ def main():
     parser.add_argument('--mock', action='store_true', help='Generate and write mock data instead of reading from file')
     parser.add_argument('--mock-players', type=int, default=10, help='Number of mock players to generate (default: 10)')
     parser.add_argument('--reset', action='store_true', help='Reset tab (clear and reinitialize) without writing data')
+    parser.add_argument(
+        '--last-row-strategy',
+        choices=LAST_ROW_STRATEGIES,
+        default='scan',
+        help='How to find old data below the paste range when no row anchor exists: scan reads the whole '
+             f'{LAST_ROW_MAX_ROWS}-row window, probe binary-searches with single-row reads (default: scan)'
+    )
     args = parser.parse_args()
     
     if args.type == 'WEEKLY' and not args.position and not args.reset:
@@ -634,7 +736,7 @@ def main():
     sheet_id = config['target_sheet_id']
     
     creds = get_credentials(['https://www.googleapis.com/auth/spreadsheets'], app_name='fantasy-football-tools')
-    service = build('sheets', 'v4', credentials=creds)
+    service = build_service('sheets', 'v4', creds)
     
     # Determine tab name based on type
     if args.type == 'ROS':
@@ -657,8 +759,7 @@ def main():
     paste_loc = get_paste_location(args.type, args.position if args.type == 'WEEKLY' else None)
     
     if was_created:
-        print(f"Created new tab '{tab_name}'")
-        initialize_tab(service, sheet_id, tab_id)
+        print(f"Created new tab '{tab_name}' from template '{TEMPLATE_TAB_NAME}'")
     else:
         print(f"Found existing tab '{tab_name}'")
         # For ROS, clear entire tab. For WEEKLY, only clear the specific position's range
@@ -696,7 +797,8 @@ def main():
         paste_loc['start_col'],
         paste_loc['num_cols'],
         args.type,
-        args.position if args.type == 'WEEKLY' else None  # Note: position is only used/read during WEEKLY processing (ignored for ROS to keep things flowing)
+        args.position if args.type == 'WEEKLY' else None,  # Note: position is only used/read during WEEKLY processing (ignored for ROS to keep things flowing)
+        args.last_row_strategy
     )
     
     print(f"Done! https://docs.google.com/spreadsheets/d/{sheet_id}")
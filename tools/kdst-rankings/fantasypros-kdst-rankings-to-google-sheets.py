@@ -10,18 +10,35 @@ from typing import Any, Dict, List, Optional, Tuple
 SCRIPT_DIR = Path(__file__).resolve().parent
 TOOLS_DIR = SCRIPT_DIR.parent
 
-# Import google_auth_utils from editable package
-from google_auth_utils import get_credentials
+# Import shared library functions
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Hand this run to the tools daemon if one is running (returns if not)
+from lib.tools_daemon import delegate_to_daemon
+delegate_to_daemon(__file__)
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script, traced
+trace_script(__file__)
 
 try:
-    from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
 except ModuleNotFoundError as err:
     print('Error: google-api-python-client is not installed.')
     print('Run "pip install google-api-python-client google-auth-oauthlib google-auth"')
     raise SystemExit(1) from err
 
+from lib.google_clients import build_service, get_credentials
+from lib.sheets_utils import column_index_to_letter, find_last_row_by_probing, find_last_rows_by_probing
+from lib.developer_metadata import anchored_row, find_row_anchors, row_anchor_request
+
 CONFIG_FILE = SCRIPT_DIR / 'kdst-rankings-sheets.json'
+LAST_ROW_SCAN_ROWS = 200
+# How to find the old last row when there is no anchor: read the whole window, or probe + binary search
+LAST_ROW_STRATEGIES = ['scan', 'probe']
+# DeveloperMetadata key anchored to the last row written for each paste target
+LAST_ROW_ANCHOR_KEY = 'kdst-rankings-last-row'
 
 # Paste target mappings based on exploration
 PASTE_TARGETS = {
@@ -34,6 +51,7 @@ PASTE_TARGETS = {
         'DST': {'tab': 'FantasyPros weekly K/DST rankings', 'start_col': 18, 'start_row': 3, 'num_cols': 4}  # S3 (rank, name, team, opp)
     }
 }
+ALL_TARGETS = [(ranking_type, position) for ranking_type in PASTE_TARGETS for position in PASTE_TARGETS[ranking_type]]
 
 
 def load_config() -> Dict[str, Any]:
@@ -62,6 +80,27 @@ def load_config() -> Dict[str, Any]:
     return data
 
 
+def last_row_anchor_key(ranking_type: str, position: str) -> str:
+    """Metadata key for a paste target's last-row anchor."""
+    return f'{LAST_ROW_ANCHOR_KEY}:{ranking_type}:{position}'
+
+
+def target_extent(target: Dict[str, Any]) -> Dict[str, int]:
+    """Columns/start row recorded with an anchor, so an anchor from a different layout is ignored."""
+    return {'start_row': target['start_row'], 'start_col': target['start_col'], 'num_cols': target['num_cols']}
+
+
+@traced()
+def lookup_row_anchors(sheets_service, sheet_id: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    """find_row_anchors, falling back to no anchors (and scanning) if the search fails."""
+    try:
+        return find_row_anchors(sheets_service, sheet_id, keys)
+    except RuntimeError as err:
+        print(f'Warning: {err}')
+        return {}
+
+
+@traced()
 def parse_tsv(input_stream) -> Tuple[List[str], List[Dict[str, str]]]:
     """Parse TSV from stdin or file. Returns (headers, rows)."""
     reader = csv.DictReader(input_stream, delimiter='\t')
@@ -90,6 +129,31 @@ def get_tab_id_by_name(sheets_service, sheet_id: str, tab_name: str) -> Optional
     return None
 
 
+def week_cell_request(tab_id: int, week: int) -> Dict[str, Any]:
+    """Request that writes the week number to I1."""
+    # I1 = column 8, row 0 (0-indexed)
+    return {
+        'updateCells': {
+            'range': {
+                'sheetId': tab_id,
+                'startRowIndex': 0,  # Row 1 (0-indexed)
+                'endRowIndex': 1,
+                'startColumnIndex': 8,  # Column I (0-indexed)
+                'endColumnIndex': 9
+            },
+            'rows': [{
+                'values': [{
+                    'userEnteredValue': {
+                        'numberValue': float(week)
+                    }
+                }]
+            }],
+            'fields': 'userEnteredValue'
+        }
+    }
+
+
+@traced()
 def update_week_cell(
     sheets_service,
     sheet_id: str,
@@ -108,26 +172,7 @@ def update_week_cell(
         h1_value = result.get('values', [['']])[0][0] if result.get('values') else ''
         
         if 'WEEK:' in str(h1_value).upper():
-            # Update I1 (column 8, row 0, 0-indexed)
-            requests = [{
-                'updateCells': {
-                    'range': {
-                        'sheetId': tab_id,
-                        'startRowIndex': 0,  # Row 1 (0-indexed)
-                        'endRowIndex': 1,
-                        'startColumnIndex': 8,  # Column I (0-indexed)
-                        'endColumnIndex': 9
-                    },
-                    'rows': [{
-                        'values': [{
-                            'userEnteredValue': {
-                                'numberValue': float(week)
-                            }
-                        }]
-                    }],
-                    'fields': 'userEnteredValue'
-                }
-            }]
+            requests = [week_cell_request(tab_id, week)]
             
             sheets_service.spreadsheets().batchUpdate(
                 spreadsheetId=sheet_id,
@@ -141,6 +186,26 @@ def update_week_cell(
     return False
 
 
+def insert_rows_request(tab_id: int, current_row_count: int, required_rows: int) -> Optional[Dict[str, Any]]:
+    """Request that grows the tab to required_rows, or None if it is already big enough."""
+    if current_row_count >= required_rows:
+        return None
+
+    # Insert rows to expand the sheet
+    return {
+        'insertDimension': {
+            'range': {
+                'sheetId': tab_id,
+                'dimension': 'ROWS',
+                'startIndex': current_row_count,
+                'endIndex': required_rows
+            },
+            'inheritFromBefore': True
+        }
+    }
+
+
+@traced()
 def ensure_sheet_has_rows(
     sheets_service,
     sheet_id: str,
@@ -166,21 +231,11 @@ def ensure_sheet_has_rows(
             current_row_count = grid_props.get('rowCount', 1000)
             break
     
-    if current_row_count >= required_rows:
+    request = insert_rows_request(tab_id, current_row_count, required_rows)
+    if request is None:
         return  # Already has enough rows
     
-    # Insert rows to expand the sheet
-    requests = [{
-        'insertDimension': {
-            'range': {
-                'sheetId': tab_id,
-                'dimension': 'ROWS',
-                'startIndex': current_row_count,
-                'endIndex': required_rows
-            },
-            'inheritFromBefore': True
-        }
-    }]
+    requests = [request]
     
     sheets_service.spreadsheets().batchUpdate(
         spreadsheetId=sheet_id,
@@ -188,6 +243,7 @@ def ensure_sheet_has_rows(
     ).execute()
 
 
+@traced()
 def find_last_row_in_range(
     sheets_service,
     sheet_id: str,
@@ -195,16 +251,26 @@ def find_last_row_in_range(
     start_row: int,
     start_col: int,
     num_cols: int,
-    max_rows_to_check: int = 200
+    max_rows_to_check: int = LAST_ROW_SCAN_ROWS,
+    strategy: str = 'scan'
 ) -> int:
     """Find the last row with data in a specific column range.
     Returns the last row index (1-indexed) that has data, or start_row if none found.
+    strategy 'probe' finds it with a few batches of single-row reads instead of reading the whole window.
     """
+    if strategy == 'probe':
+        try:
+            return find_last_row_by_probing(
+                sheets_service, sheet_id, tab_name, start_row, start_col, num_cols, max_rows_to_check
+            )
+        except RuntimeError as err:
+            # Assuming the range is empty would leave a stale tail behind, so read the window instead
+            print(f'Warning: Could not probe range to find last row ({err}); scanning instead')
+
     # Read a range starting from start_row down to max_rows_to_check
     # start_row is 1-indexed, convert to A1 notation
-    start_col_letter = chr(65 + start_col) if start_col < 26 else f'A{chr(65 + (start_col-26))}'
-    end_col = start_col + num_cols - 1
-    end_col_letter = chr(65 + end_col) if end_col < 26 else f'A{chr(65 + (end_col-26))}'
+    start_col_letter = column_index_to_letter(start_col)
+    end_col_letter = column_index_to_letter(start_col + num_cols - 1)
     
     range_name = f"'{tab_name}'!{start_col_letter}{start_row}:{end_col_letter}{start_row + max_rows_to_check - 1}"
     
@@ -218,10 +284,11 @@ def find_last_row_in_range(
         print(f'Warning: Could not read range to find last row: {err}')
         return start_row - 1
     
-    values = result.get('values', [])
-    if not values:
-        return start_row - 1
-    
+    return last_row_in_values(result.get('values', []), start_row)
+
+
+def last_row_in_values(values: List[List[Any]], start_row: int) -> int:
+    """Last row (1-indexed) with any non-empty cell in values read from start_row, or start_row - 1 if none."""
     # Find the last row that has any non-empty cell in the range
     # The values array already contains only the columns we requested, so check all cells in each row
     last_row_offset = -1  # Will be 0-indexed offset from start_row
@@ -238,6 +305,45 @@ def find_last_row_in_range(
     return start_row + last_row_offset
 
 
+def clear_cells_request(
+    tab_id: int,
+    start_row: int,
+    end_row: int,
+    start_col: int,
+    num_cols: int,
+    row_count: int
+) -> Optional[Dict[str, Any]]:
+    """Request that empties a range (start_row and end_row 1-indexed, inclusive), capped at row_count."""
+    # Convert to 0-indexed for API
+    # start_row and end_row are 1-indexed (inclusive), convert to 0-indexed (start inclusive, end exclusive)
+    start_row_index = start_row - 1  # 1-indexed row 40 → 0-indexed row 39
+    end_row_index = min(end_row, row_count)  # Don't clear beyond sheet size
+    
+    if end_row_index <= start_row_index:
+        return None
+    
+    # Create empty cells for the range
+    num_rows_to_clear = end_row_index - start_row_index
+    empty_rows = []
+    for _ in range(num_rows_to_clear):
+        empty_rows.append({'values': [{}] * num_cols})
+    
+    return {
+        'updateCells': {
+            'range': {
+                'sheetId': tab_id,
+                'startRowIndex': start_row_index,
+                'endRowIndex': end_row_index,
+                'startColumnIndex': start_col,
+                'endColumnIndex': start_col + num_cols
+            },
+            'rows': empty_rows,
+            'fields': 'userEnteredValue'
+        }
+    }
+
+
+@traced()
 def clear_cells_in_range(
     sheets_service,
     sheet_id: str,
@@ -271,33 +377,11 @@ def clear_cells_in_range(
             current_row_count = grid_props.get('rowCount', 1000)
             break
     
-    # Convert to 0-indexed for API
-    # start_row and end_row are 1-indexed (inclusive), convert to 0-indexed (start inclusive, end exclusive)
-    start_row_index = start_row - 1  # 1-indexed row 40 → 0-indexed row 39
-    end_row_index = min(end_row, current_row_count)  # Don't clear beyond sheet size
-    
-    if end_row_index <= start_row_index:
+    request = clear_cells_request(tab_id, start_row, end_row, start_col, num_cols, current_row_count)
+    if request is None:
         return  # Nothing to clear after adjusting for sheet size
     
-    # Create empty cells for the range
-    num_rows_to_clear = end_row_index - start_row_index
-    empty_rows = []
-    for _ in range(num_rows_to_clear):
-        empty_rows.append({'values': [{}] * num_cols})
-    
-    requests = [{
-        'updateCells': {
-            'range': {
-                'sheetId': tab_id,
-                'startRowIndex': start_row_index,
-                'endRowIndex': end_row_index,
-                'startColumnIndex': start_col,
-                'endColumnIndex': start_col + num_cols
-            },
-            'rows': empty_rows,
-            'fields': 'userEnteredValue'
-        }
-    }]
+    requests = [request]
     
     sheets_service.spreadsheets().batchUpdate(
         spreadsheetId=sheet_id,
@@ -305,17 +389,15 @@ def clear_cells_in_range(
     ).execute()
 
 
-def write_rows_to_sheet(
-    sheets_service,
-    sheet_id: str,
+def write_rows_request(
     tab_id: int,
     rows: List[Dict[str, str]],
     start_row: int,
     start_col: int,
     num_cols: int,
     headers: List[str]
-) -> None:
-    """Write TSV rows to Google Sheets starting at specified cell."""
+) -> Optional[Dict[str, Any]]:
+    """Request that writes TSV rows starting at the specified cell, or None if there are no rows."""
     # Map TSV headers to column order
     # Expected: rank, name, team (and optionally opponent/bye)
     column_order = []
@@ -354,13 +436,11 @@ def write_rows_to_sheet(
         cell_values.append(cell_row)
     
     if not cell_values:
-        print('Warning: No data rows to write')
-        return
+        return None
     
-    # Write to sheet
     # start_row is 1-indexed (row 3 = start_row 3), convert to 0-indexed for API
     start_row_index = start_row - 1
-    requests = [{
+    return {
         'updateCells': {
             'range': {
                 'sheetId': tab_id,
@@ -372,11 +452,31 @@ def write_rows_to_sheet(
             'rows': [{'values': row} for row in cell_values],
             'fields': 'userEnteredValue'
         }
-    }]
+    }
+
+
+@traced()
+def write_rows_to_sheet(
+    sheets_service,
+    sheet_id: str,
+    tab_id: int,
+    rows: List[Dict[str, str]],
+    start_row: int,
+    start_col: int,
+    num_cols: int,
+    headers: List[str],
+    extra_requests: Optional[List[Dict[str, Any]]] = None
+) -> None:
+    """Write TSV rows to Google Sheets starting at specified cell (extra_requests ride along in the same batch)."""
+    request = write_rows_request(tab_id, rows, start_row, start_col, num_cols, headers)
+    if request is None:
+        print('Warning: No data rows to write')
+        return
     
+    # Write to sheet
     sheets_service.spreadsheets().batchUpdate(
         spreadsheetId=sheet_id,
-        body={'requests': requests}
+        body={'requests': [request] + (extra_requests or [])}
     ).execute()
 
 
@@ -390,13 +490,11 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         '--position', '-p',
-        required=True,
         choices=['K', 'DST'],
         help='Position: K (Kicker) or DST (Defense/Special Teams)'
     )
     parser.add_argument(
         '--type', '-t',
-        required=True,
         choices=['ROS', 'WEEKLY'],
         help='Ranking type: ROS (Rest of Season) or WEEKLY'
     )
@@ -405,7 +503,286 @@ def parse_args() -> argparse.Namespace:
         type=int,
         help='Week number (optional, used to update I1 for weekly DST if provided)'
     )
-    return parser.parse_args()
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help='Upload all four ROS/WEEKLY x K/DST rankings in one batch (inputs via --ros-k etc. or --manifest)'
+    )
+    for ranking_type, position in ALL_TARGETS:
+        parser.add_argument(
+            f'--{ranking_type.lower()}-{position.lower()}',
+            dest=f'{ranking_type.lower()}_{position.lower()}',
+            metavar='TSV',
+            help=f'--all mode: {ranking_type} {position} rankings TSV file'
+        )
+    parser.add_argument(
+        '--manifest',
+        help='--all mode: JSON file mapping {"ROS": {"K": "k.tsv", "DST": ...}, "WEEKLY": {...}} to TSV files'
+    )
+    parser.add_argument(
+        '--last-row-strategy',
+        choices=LAST_ROW_STRATEGIES,
+        default='scan',
+        help='How to find old data below the paste range when no row anchor exists: scan reads the whole '
+             f'{LAST_ROW_SCAN_ROWS}-row window, probe binary-searches with single-row reads (default: scan)'
+    )
+    args = parser.parse_args()
+
+    if args.all:
+        if args.input or args.position or args.type:
+            parser.error('--input/--position/--type do not apply with --all')
+    else:
+        if not args.position or not args.type:
+            parser.error('--position and --type are required (or use --all)')
+        if args.manifest or any(getattr(args, f'{t.lower()}_{p.lower()}') for t, p in ALL_TARGETS):
+            parser.error('--manifest/--ros-k/--ros-dst/--weekly-k/--weekly-dst require --all')
+
+    return args
+
+
+def resolve_all_inputs(args: argparse.Namespace) -> Dict[Tuple[str, str], Path]:
+    """Map every (type, position) in ALL_TARGETS to its TSV file from --manifest and/or the per-target options."""
+    inputs: Dict[Tuple[str, str], Path] = {}
+
+    if args.manifest:
+        manifest_path = Path(args.manifest)
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError) as err:
+            raise ValueError(f"Could not read manifest '{manifest_path}': {err}") from err
+
+        for ranking_type, position in ALL_TARGETS:
+            entry = manifest.get(ranking_type, {}).get(position)
+            if entry:
+                # Relative paths are relative to the manifest
+                inputs[(ranking_type, position)] = manifest_path.parent / entry
+
+    for ranking_type, position in ALL_TARGETS:
+        entry = getattr(args, f'{ranking_type.lower()}_{position.lower()}')
+        if entry:
+            inputs[(ranking_type, position)] = Path(entry)
+
+    missing = [f'{t} {p}' for t, p in ALL_TARGETS if (t, p) not in inputs]
+    if missing:
+        raise ValueError(f"--all needs an input for every target; missing: {', '.join(missing)}")
+
+    for path in inputs.values():
+        if not path.exists():
+            raise ValueError(f"Input file '{path}' does not exist")
+
+    return inputs
+
+
+@traced()
+def read_targets_state(
+    sheets_service,
+    sheet_id: str,
+    targets: List[Dict[str, Any]],
+    scan_targets: List[Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """One field-masked read of everything the batch plan needs.
+
+    Returns {tab name: {'sheetId', 'rowCount', 'h1', 'blocks': {(start_row, start_col): values}}}
+    where each block holds the current contents of a scan_targets paste target (LAST_ROW_SCAN_ROWS rows).
+    """
+    ranges = []
+    for tab_name in sorted({target['tab'] for target in targets}):
+        ranges.append(f"'{tab_name}'!H1")
+    for target in scan_targets:
+        ranges.append(
+            f"'{target['tab']}'!{column_index_to_letter(target['start_col'])}{target['start_row']}:"
+            f"{column_index_to_letter(target['start_col'] + target['num_cols'] - 1)}"
+            f"{target['start_row'] + LAST_ROW_SCAN_ROWS - 1}"
+        )
+
+    try:
+        spreadsheet = sheets_service.spreadsheets().get(
+            spreadsheetId=sheet_id,
+            ranges=ranges,
+            fields=(
+                'sheets(properties(sheetId,title,gridProperties(rowCount)),'
+                'data(startRow,startColumn,rowData(values(formattedValue))))'
+            )
+        ).execute()
+    except HttpError as err:
+        raise RuntimeError(
+            f"Unable to read Google Sheet '{sheet_id}'. Status: {err.resp.status}"
+        ) from err
+
+    state: Dict[str, Dict[str, Any]] = {}
+    for sheet in spreadsheet.get('sheets', []):
+        props = sheet.get('properties', {})
+        tab_state: Dict[str, Any] = {
+            'sheetId': props.get('sheetId'),
+            'rowCount': props.get('gridProperties', {}).get('rowCount', 1000),
+            'h1': '',
+            'blocks': {},
+        }
+        for grid in sheet.get('data', []):
+            values = [
+                [cell.get('formattedValue', '') for cell in row.get('values', [])]
+                for row in grid.get('rowData', [])
+            ]
+            start_row = grid.get('startRow', 0)
+            start_col = grid.get('startColumn', 0)
+            if (start_row, start_col) == (0, 7):
+                tab_state['h1'] = values[0][0] if values and values[0] else ''
+            else:
+                # Keyed like PASTE_TARGETS: 1-indexed start_row, 0-indexed start_col
+                tab_state['blocks'][(start_row + 1, start_col)] = values
+        state[props.get('title')] = tab_state
+    return state
+
+
+@traced()
+def run_all(args: argparse.Namespace, target_sheet_id: str) -> None:
+    """Upload every PASTE_TARGETS range with one read and one batchUpdate."""
+    try:
+        inputs = resolve_all_inputs(args)
+    except ValueError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+
+    targets: List[Dict[str, Any]] = []
+    for ranking_type, position in ALL_TARGETS:
+        path = inputs[(ranking_type, position)]
+        with open(path, 'r', encoding='utf-8') as f:
+            headers, rows = parse_tsv(f)
+        if not rows:
+            print(f'Error: No data rows found in {ranking_type} {position} input {path}')
+            raise SystemExit(1)
+        print(f'Read {len(rows)} rows for {ranking_type} {position} from {path}')
+        targets.append({
+            **PASTE_TARGETS[ranking_type][position],
+            'type': ranking_type,
+            'position': position,
+            'headers': headers,
+            'rows': rows,
+        })
+
+    creds = get_credentials(['https://www.googleapis.com/auth/spreadsheets'], app_name='fantasy-football-tools')
+    sheets_service = build_service('sheets', 'v4', creds)
+
+    # Targets whose last row is anchored by the previous run skip the block read
+    anchors = lookup_row_anchors(
+        sheets_service, target_sheet_id, [last_row_anchor_key(t['type'], t['position']) for t in targets]
+    )
+    scan_targets = []
+    for target in targets:
+        target['anchor_key'] = last_row_anchor_key(target['type'], target['position'])
+        anchor = anchors.get(target['anchor_key'])
+        if anchor is None or anchor['value'] != target_extent(target):
+            scan_targets.append(target)
+
+    # With --last-row-strategy probe the unanchored targets are probed together below instead of read whole
+    block_targets = scan_targets if args.last_row_strategy == 'scan' else []
+    try:
+        state = read_targets_state(sheets_service, target_sheet_id, targets, block_targets)
+    except RuntimeError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+
+    for tab_name in {target['tab'] for target in targets}:
+        if tab_name not in state:
+            print(f'Error: Tab "{tab_name}" not found in sheet')
+            raise SystemExit(1)
+
+    probed_last_rows: Dict[Tuple[str, str], int] = {}
+    if args.last_row_strategy == 'probe' and scan_targets:
+        try:
+            last_rows = find_last_rows_by_probing(
+                sheets_service,
+                target_sheet_id,
+                [(t['tab'], t['start_row'], t['start_col'], t['num_cols']) for t in scan_targets],
+                LAST_ROW_SCAN_ROWS,
+                row_counts={tab_name: tab_state['rowCount'] for tab_name, tab_state in state.items()}
+            )
+        except RuntimeError as err:
+            print(f'Warning: Could not probe ranges to find last rows ({err}); scanning instead')
+            last_rows = [
+                find_last_row_in_range(
+                    sheets_service, target_sheet_id, t['tab'], t['start_row'], t['start_col'], t['num_cols']
+                )
+                for t in scan_targets
+            ]
+        probed_last_rows = {(t['type'], t['position']): row for t, row in zip(scan_targets, last_rows)}
+
+    # Grow tabs first, then write every target, then clear stale tails and set the week
+    requests: List[Dict[str, Any]] = []
+    row_counts: Dict[str, int] = {}
+    for tab_name in sorted({target['tab'] for target in targets}):
+        tab_state = state[tab_name]
+        required_rows = max(
+            target['start_row'] + len(target['rows']) - 1 for target in targets if target['tab'] == tab_name
+        )
+        request = insert_rows_request(tab_state['sheetId'], tab_state['rowCount'], required_rows)
+        if request is not None:
+            requests.append(request)
+        row_counts[tab_name] = max(tab_state['rowCount'], required_rows)
+
+    clear_requests: List[Dict[str, Any]] = []
+    for target in targets:
+        tab_state = state[target['tab']]
+        tab_id = tab_state['sheetId']
+        start_row = target['start_row']
+        start_col = target['start_col']
+        num_cols = target['num_cols']
+
+        request = write_rows_request(tab_id, target['rows'], start_row, start_col, num_cols, target['headers'])
+        if request is not None:
+            requests.append(request)
+
+        old_last_row = anchored_row(anchors, target['anchor_key'], tab_id, target_extent(target))
+        if old_last_row is None:
+            block = tab_state['blocks'].get((start_row, start_col))
+            if (target['type'], target['position']) in probed_last_rows:
+                old_last_row = probed_last_rows[(target['type'], target['position'])]
+            elif block is not None:
+                old_last_row = last_row_in_values(block, start_row)
+            else:
+                # Anchor found but on another tab: search after all
+                old_last_row = find_last_row_in_range(
+                    sheets_service, target_sheet_id, target['tab'], start_row, start_col, num_cols,
+                    strategy=args.last_row_strategy
+                )
+        new_last_row = start_row + len(target['rows']) - 1
+        clear_requests.append(row_anchor_request(
+            tab_id, target['anchor_key'], new_last_row, target_extent(target), anchors.get(target['anchor_key'])
+        ))
+        cleared = ''
+        if old_last_row >= start_row and new_last_row < old_last_row:
+            request = clear_cells_request(
+                tab_id, new_last_row + 1, old_last_row + 1, start_col, num_cols, row_counts[target['tab']]
+            )
+            if request is not None:
+                clear_requests.append(request)
+                cleared = f', clearing {old_last_row - new_last_row} old rows'
+        print(f"{target['type']} {target['position']}: {len(target['rows'])} rows -> "
+              f"'{target['tab']}'!{column_index_to_letter(start_col)}{start_row}{cleared}")
+    requests.extend(clear_requests)
+
+    week_updated = False
+    if args.week is not None:
+        for tab_name in sorted({target['tab'] for target in targets if target['type'] == 'WEEKLY'}):
+            if 'WEEK:' in str(state[tab_name]['h1']).upper():
+                requests.append(week_cell_request(state[tab_name]['sheetId'], args.week))
+                week_updated = True
+
+    try:
+        sheets_service.spreadsheets().batchUpdate(
+            spreadsheetId=target_sheet_id,
+            body={'requests': requests}
+        ).execute()
+    except HttpError as err:
+        print(f'Error: Batch update failed: {err}')
+        raise SystemExit(1)
+
+    print(f'Wrote all {len(targets)} targets in one batch ({len(requests)} requests)')
+    if week_updated:
+        print(f'Updated week number to {args.week}')
+
+    print('Done! View the sheet at:')
+    print(f'https://docs.google.com/spreadsheets/d/{target_sheet_id}')
 
 
 def main():
@@ -414,6 +791,10 @@ def main():
     
     args = parse_args()
     
+    if args.all:
+        run_all(args, target_sheet_id)
+        return
+    
     # Get paste target configuration
     if args.type not in PASTE_TARGETS:
         print(f'Error: Unknown ranking type: {args.type}')
@@ -445,7 +826,7 @@ def main():
     
     # Authenticate and get sheet service
     creds = get_credentials(['https://www.googleapis.com/auth/spreadsheets'], app_name='fantasy-football-tools')
-    sheets_service = build('sheets', 'v4', credentials=creds)
+    sheets_service = build_service('sheets', 'v4', creds)
     
     # Get tab ID
     tab_id = get_tab_id_by_name(sheets_service, target_sheet_id, tab_name)
@@ -454,18 +835,23 @@ def main():
         raise SystemExit(1)
     
     print(f'Target: Sheet "{target_sheet_id}", Tab "{tab_name}" (ID: {tab_id})')
-    col_letter = chr(65 + start_col) if start_col < 26 else f'A{chr(65 + (start_col-26))}'
-    print(f'Writing to: {col_letter}{start_row} ({num_cols} columns)')
-    
-    # Find the current last row in this range before writing (to clean up old data if new data is shorter)
-    old_last_row = find_last_row_in_range(
-        sheets_service,
-        target_sheet_id,
-        tab_name,
-        start_row,
-        start_col,
-        num_cols
-    )
+    print(f'Writing to: {column_index_to_letter(start_col)}{start_row} ({num_cols} columns)')
+    
+    # Find the current last row in this range before writing (to clean up old data if new data is shorter).
+    # The previous run anchored it with row metadata; scan only if there is no usable anchor.
+    anchor_key = last_row_anchor_key(args.type, args.position)
+    anchors = lookup_row_anchors(sheets_service, target_sheet_id, [anchor_key])
+    old_last_row = anchored_row(anchors, anchor_key, tab_id, target_extent(target_config))
+    if old_last_row is None:
+        old_last_row = find_last_row_in_range(
+            sheets_service,
+            target_sheet_id,
+            tab_name,
+            start_row,
+            start_col,
+            num_cols,
+            strategy=args.last_row_strategy
+        )
     
     # Ensure sheet has enough rows (API doesn't auto-expand like UI does)
     required_rows = start_row + len(rows) - 1  # start_row is 1-indexed
@@ -480,7 +866,11 @@ def main():
         start_row,
         start_col,
         num_cols,
-        headers
+        headers,
+        # Move the anchor to the new last row with the write (the row metadata follows row inserts/deletes)
+        [row_anchor_request(
+            tab_id, anchor_key, start_row + len(rows) - 1, target_extent(target_config), anchors.get(anchor_key)
+        )]
     )
     print(f'Wrote {len(rows)} rows successfully')
     
@@ -0,0 +1,157 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+ROOT_DIR = TOOLS_DIR.parent
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script, traced
+trace_script(__file__)
+
+from lib.fantasypros import POSITIONS, Rankings, add_fantasypros_args, fetch_rankings
+from lib.ownership import Ownership, load_ownership, rankings_tsv_with_owners
+
+TYPES = ['ROS', 'WEEKLY']
+MANIFEST_NAME = 'kdst-inputs.json'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Fetch FantasyPros consensus rankings (cached) and write them as TSV, replacing the Node dump scripts'
+    )
+    parser.add_argument('--type', '-t', choices=TYPES, help='Ranking type (single dump)')
+    parser.add_argument('--position', '-p', choices=POSITIONS, help='Position (single dump)')
+    parser.add_argument('--output', '-o', help='Output TSV file for a single dump (defaults to stdout)')
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help=f'Fetch all {len(TYPES) * len(POSITIONS)} type/position combinations concurrently into --output-dir'
+    )
+    parser.add_argument('--output-dir', default='.', help='Directory for --all TSVs and the K/DST manifest (default: .)')
+    add_fantasypros_args(parser)
+    parser.add_argument(
+        '--roster',
+        action='append',
+        default=[],
+        help='League roster JSON as PATH or NAME=PATH: adds an owner column per league (repeatable)'
+    )
+    parser.add_argument('--available-only', action='store_true', help='Only players unrostered in at least one --roster league')
+    parser.add_argument('--tiers', action='store_true', help='Add a tier column computed from rank_ave/rank_std (needs numpy)')
+    args = parser.parse_args()
+    if args.available_only and not args.roster:
+        parser.error('--available-only needs at least one --roster')
+    if args.all and (args.type or args.position or args.output):
+        parser.error('--all cannot be combined with --type, --position or --output')
+    if not args.all and not (args.type and args.position):
+        parser.error('--type and --position are required unless --all is given')
+    return args
+
+
+def load_tiering() -> Callable:
+    try:
+        from lib.tiers import ranking_tiers
+    except ModuleNotFoundError as err:
+        raise RuntimeError(f'{err.name} is not installed (needed for --tiers). Run "pip install numpy"') from err
+    return ranking_tiers
+
+
+def render_tsv(
+    rankings: Rankings,
+    ownership: Optional[Ownership],
+    available_only: bool,
+    ranking_tiers: Optional[Callable] = None
+) -> str:
+    extra_headers: List[str] = []
+    extra = None
+    if ranking_tiers:
+        # Tiers come from the full ranking, before --available-only drops anyone
+        tier_of = dict(zip(rankings.players, ranking_tiers(rankings.players)))
+        extra_headers = ['tier']
+
+        def extra(player):
+            return [str(tier_of[player])]
+    if ownership is None:
+        return rankings.to_tsv(extra_headers, extra)
+    return rankings_tsv_with_owners(rankings, ownership, available_only, extra_headers, extra)
+
+
+@traced()
+def write_all(
+    args,
+    output_dir: Path,
+    ownership: Optional[Ownership] = None,
+    available_only: bool = False,
+    ranking_tiers: Optional[Callable] = None
+) -> None:
+    combinations = [(ranking_type, position) for ranking_type in TYPES for position in POSITIONS]
+    started = time.perf_counter()
+    results = fetch_rankings(args, combinations)
+    elapsed = time.perf_counter() - started
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {ranking_type: {} for ranking_type in TYPES}
+    for (ranking_type, position), rankings in results.items():
+        file_name = f'{ranking_type.lower()}-{position.lower()}.tsv'
+        (output_dir / file_name).write_text(render_tsv(rankings, ownership, available_only, ranking_tiers), encoding='utf-8')
+        if position in ('K', 'DST'):
+            manifest[ranking_type][position] = file_name
+
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + '\n', encoding='utf-8')
+
+    cached = sum(1 for rankings in results.values() if rankings.from_cache)
+    print(f'Wrote {len(results)} TSVs to {output_dir} in {elapsed:.2f}s '
+          f'({cached} from cache, {len(results) - cached} fetched)', file=sys.stderr)
+    print(f'K/DST manifest: {output_dir / MANIFEST_NAME}', file=sys.stderr)
+
+
+@traced()
+def write_one(
+    args,
+    ranking_type: str,
+    position: str,
+    output,
+    ownership: Optional[Ownership] = None,
+    available_only: bool = False,
+    ranking_tiers: Optional[Callable] = None
+) -> None:
+    rankings = fetch_rankings(args, [(ranking_type, position)])[(ranking_type, position)]
+    tsv = render_tsv(rankings, ownership, available_only, ranking_tiers)
+    if output:
+        Path(output).write_text(tsv, encoding='utf-8')
+    else:
+        sys.stdout.write(tsv)
+    source = 'cache' if rankings.from_cache else 'API'
+    print(f'{ranking_type} {position}: {len(rankings.players)} players from {source}', file=sys.stderr)
+
+
+def run(args) -> None:
+    # Rosters load once and serve every type/position
+    ownership = load_ownership(args.roster) if args.roster else None
+    ranking_tiers = load_tiering() if args.tiers else None
+    if args.all:
+        write_all(args, Path(args.output_dir), ownership, args.available_only, ranking_tiers)
+    else:
+        write_one(args, args.type, args.position, args.output, ownership, args.available_only, ranking_tiers)
+
+
+def main():
+    args = parse_args()
+    try:
+        run(args)
+    except RuntimeError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,12 @@
 """ABOUTME: Shared library for tools.
 ABOUTME: Common utilities shared across multiple tool directories."""
-from . import sheets_utils
+import importlib
 
 __all__ = ['sheets_utils']
+
+
+def __getattr__(name):
+    # Submodules load on first use so a light import (e.g. lib.tools_daemon) does not pull in the Google stack
+    if name in __all__:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,230 @@
+"""ABOUTME: Content-addressed store for pipeline stage outputs, keyed by a hash of the stage's inputs, parameters and code.
+ABOUTME: Re-runs restore the outputs of unchanged stages instead of running them; gc evicts entries by age and total size."""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Bump to invalidate every stored key when the key recipe changes
+KEY_FORMAT = 1
+_CHUNK_SIZE = 1 << 20
+# Temp files younger than this may belong to a save() still running in another process
+STRAY_GRACE_SECONDS = 60 * 60
+
+
+def default_store_dir() -> Path:
+    """Per-user cache directory (%LOCALAPPDATA% on Windows, $XDG_CACHE_HOME or ~/.cache elsewhere)."""
+    if sys.platform == 'win32' and os.environ.get('LOCALAPPDATA'):
+        base = Path(os.environ['LOCALAPPDATA'])
+    else:
+        base = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+    return base / 'fantasy-football-tools' / 'artifacts'
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_path(path: Path) -> Optional[str]:
+    """Hash of a file, or of every file under a directory (names and contents); None if it does not exist."""
+    path = Path(path)
+    if path.is_file():
+        return hash_file(path)
+    if not path.is_dir():
+        return None
+    digest = hashlib.sha256()
+    for child in sorted(path.rglob('*')):
+        if child.is_file() and '__pycache__' not in child.parts:
+            digest.update(child.relative_to(path).as_posix().encode('utf-8') + b'\0')
+            digest.update(hash_file(child).encode('ascii'))
+    return digest.hexdigest()
+
+
+def stage_key(
+    name: str,
+    argv: List[str],
+    inputs: Iterable[str] = (),
+    code: Iterable[str] = (),
+    stdin: Optional[str] = None,
+    extra: str = ''
+) -> str:
+    """Key for one stage run: the command line plus the contents of its input files and code.
+
+    Python scripts named on the command line count as code automatically. extra carries anything
+    else the output depends on (e.g. a Google Doc revision ID).
+    """
+    code_paths = list(code) + [arg for arg in argv if arg.endswith('.py') and Path(arg).is_file()]
+    material = {
+        'format': KEY_FORMAT,
+        'stage': name,
+        'run': argv,
+        'stdin': hash_path(Path(stdin)) if stdin else None,
+        'inputs': {path: hash_path(Path(path)) for path in inputs},
+        'code': {path: hash_path(Path(path)) for path in sorted(set(code_paths))},
+        'extra': extra,
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ArtifactStore:
+    """Stage outputs under <root>/objects/<sha256 of content>, with one entry per stage key under <root>/entries.
+
+    An entry maps each output path to its object. Identical outputs share one object. An entry
+    file's mtime records when it was last stored or restored, which gc uses for age and LRU eviction.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else default_store_dir()
+        self.objects_dir = self.root / 'objects'
+        self.entries_dir = self.root / 'entries'
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _entry_path(self, key: str) -> Path:
+        return self.entries_dir / f'{key}.json'
+
+    def _write_atomic(self, target: Path, write) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                write(handle)
+            os.replace(tmp_name, target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """The entry stored under key, or None if there is none or one of its objects is gone."""
+        try:
+            entry = json.loads(self._entry_path(key).read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not all(self._object_path(digest).is_file() for digest in entry.get('outputs', {}).values()):
+            return None
+        return entry
+
+    def restore(self, key: str, entry: Dict[str, Any]) -> List[Path]:
+        """Copy an entry's objects back to their output paths and mark the entry as used."""
+        restored = []
+        for output, digest in entry.get('outputs', {}).items():
+            target = Path(output)
+            source = self._object_path(digest)
+            self._write_atomic(target, lambda handle: handle.write(source.read_bytes()))
+            restored.append(target)
+        os.utime(self._entry_path(key))
+        return restored
+
+    def save(self, key: str, stage: str, outputs: Iterable[str]) -> Dict[str, Any]:
+        """Store the given output files under key; raises RuntimeError if one is missing."""
+        stored: Dict[str, str] = {}
+        sizes: Dict[str, int] = {}
+        for output in outputs:
+            path = Path(output)
+            if not path.is_file():
+                raise RuntimeError(f"stage '{stage}' did not produce declared output '{output}'")
+            digest = hash_file(path)
+            target = self._object_path(digest)
+            if not target.exists():
+                self._write_atomic(target, lambda handle: handle.write(path.read_bytes()))
+            stored[output] = digest
+            sizes[output] = path.stat().st_size
+
+        entry = {'stage': stage, 'created': time.time(), 'outputs': stored, 'sizes': sizes}
+        payload = json.dumps(entry, indent=2).encode('utf-8')
+        self._write_atomic(self._entry_path(key), lambda handle: handle.write(payload))
+        return entry
+
+    def _entries(self) -> Dict[str, Dict[str, Any]]:
+        entries = {}
+        for path in self.entries_dir.glob('*.json'):
+            try:
+                entry = json.loads(path.read_text(encoding='utf-8'))
+                entry['last_used'] = path.stat().st_mtime
+            except (OSError, json.JSONDecodeError):
+                continue
+            entries[path.stem] = entry
+        return entries
+
+    def _objects(self) -> Dict[str, int]:
+        if not self.objects_dir.is_dir():
+            return {}
+        return {
+            path.name: path.stat().st_size
+            for path in self.objects_dir.glob('*/*')
+            if path.is_file() and not path.name.startswith('.tmp-')
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        objects = self._objects()
+        by_stage: Dict[str, int] = {}
+        for entry in entries.values():
+            by_stage[entry.get('stage', '?')] = by_stage.get(entry.get('stage', '?'), 0) + 1
+        return {
+            'root': str(self.root),
+            'entries': len(entries),
+            'objects': len(objects),
+            'bytes': sum(objects.values()),
+            'entries_by_stage': dict(sorted(by_stage.items())),
+        }
+
+    def gc(self, max_bytes: Optional[int] = None, max_age_seconds: Optional[float] = None) -> Dict[str, int]:
+        """Evict entries unused for max_age_seconds, then least recently used entries until the
+        objects they reference fit in max_bytes, then delete objects no entry references."""
+        entries = self._entries()
+        objects = self._objects()
+        evict = set()
+
+        if max_age_seconds is not None:
+            cutoff = time.time() - max_age_seconds
+            evict.update(key for key, entry in entries.items() if entry['last_used'] < cutoff)
+
+        if max_bytes is not None:
+            def referenced_bytes() -> int:
+                digests = {
+                    digest
+                    for key, entry in entries.items() if key not in evict
+                    for digest in entry.get('outputs', {}).values()
+                }
+                return sum(objects.get(digest, 0) for digest in digests)
+
+            for key in sorted(entries, key=lambda name: entries[name]['last_used']):
+                if referenced_bytes() <= max_bytes:
+                    break
+                evict.add(key)
+
+        for key in evict:
+            self._entry_path(key).unlink(missing_ok=True)
+
+        kept = {
+            digest
+            for key, entry in entries.items() if key not in evict
+            for digest in entry.get('outputs', {}).values()
+        }
+        removed_objects = 0
+        freed = 0
+        for digest, size in objects.items():
+            if digest not in kept:
+                self._object_path(digest).unlink(missing_ok=True)
+                removed_objects += 1
+                freed += size
+        # Leftovers from writes that were interrupted; recent ones may still be in progress
+        stray_cutoff = time.time() - STRAY_GRACE_SECONDS
+        for stray in list(self.objects_dir.glob('*/.tmp-*')) + list(self.entries_dir.glob('.tmp-*')):
+            try:
+                if stray.stat().st_mtime < stray_cutoff:
+                    stray.unlink()
+            except OSError:
+                continue
+
+        return {'removed_entries': len(evict), 'removed_objects': removed_objects, 'freed_bytes': freed}
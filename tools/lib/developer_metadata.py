@@ -0,0 +1,155 @@
+"""ABOUTME: DeveloperMetadata helpers for remembering state on a Google Sheets tab.
+ABOUTME: Used to store content hashes so scripts can skip work when the source has not changed,
+ABOUTME: and row anchors that record where a script's last write ended."""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from googleapiclient.errors import HttpError
+from lib.tracing import traced
+
+# Field mask fragment for spreadsheets().get so tab metadata comes back with the tab properties
+SHEET_METADATA_FIELDS = 'developerMetadata(metadataId,metadataKey,metadataValue)'
+
+
+def content_hash(content: Any) -> str:
+    """Stable SHA-256 of any JSON-serializable value (dict key order does not matter)."""
+    encoded = json.dumps(content, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def find_sheet_metadata(sheet: Dict[str, Any], key: str) -> Optional[Dict[str, Any]]:
+    """Return the tab-level metadata entry with metadataKey == key from a spreadsheets().get sheet resource."""
+    for entry in sheet.get('developerMetadata', []):
+        if entry.get('metadataKey') == key:
+            return entry
+    return None
+
+
+def upsert_sheet_metadata_request(
+    tab_id: int,
+    key: str,
+    value: str,
+    existing: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Request that sets key=value on the tab, updating the existing entry (from find_sheet_metadata) if given."""
+    if existing is not None:
+        return {
+            'updateDeveloperMetadata': {
+                'dataFilters': [{
+                    'developerMetadataLookup': {'metadataId': existing['metadataId']}
+                }],
+                'developerMetadata': {'metadataValue': value},
+                'fields': 'metadataValue'
+            }
+        }
+
+    return {
+        'createDeveloperMetadata': {
+            'developerMetadata': {
+                'metadataKey': key,
+                'metadataValue': value,
+                'location': {'sheetId': tab_id},
+                'visibility': 'DOCUMENT'
+            }
+        }
+    }
+
+
+@traced()
+def find_row_anchors(sheets_service, sheet_id: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Look up row-located metadata for several keys with one developerMetadata.search call.
+
+    Returns {key: {'metadataId', 'sheetId', 'row' (1-indexed), 'value' (decoded JSON)}}; keys with no
+    anchor are omitted. The row follows the anchored row when rows are inserted or deleted above it.
+    """
+    if not keys:
+        return {}
+
+    try:
+        response = sheets_service.spreadsheets().developerMetadata().search(
+            spreadsheetId=sheet_id,
+            body={'dataFilters': [
+                {'developerMetadataLookup': {'metadataKey': key, 'locationType': 'ROW'}}
+                for key in keys
+            ]}
+        ).execute()
+    except HttpError as err:
+        raise RuntimeError(
+            f"Unable to search developer metadata in sheet '{sheet_id}'. Status: {err.resp.status}"
+        ) from err
+
+    anchors: Dict[str, Dict[str, Any]] = {}
+    for match in response.get('matchedDeveloperMetadata', []):
+        metadata = match.get('developerMetadata', {})
+        key = metadata.get('metadataKey')
+        dimension_range = metadata.get('location', {}).get('dimensionRange', {})
+        if key not in keys or 'startIndex' not in dimension_range:
+            continue
+        try:
+            value = json.loads(metadata.get('metadataValue') or '{}')
+        except ValueError:
+            value = {}
+        anchors[key] = {
+            'metadataId': metadata.get('metadataId'),
+            'sheetId': dimension_range.get('sheetId'),
+            'row': dimension_range['startIndex'] + 1,
+            'value': value,
+        }
+    return anchors
+
+
+def row_anchor_request(
+    tab_id: int,
+    key: str,
+    row: int,
+    value: Dict[str, Any],
+    existing: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Request that anchors key (with a JSON value) to 1-indexed row, moving the existing anchor if given."""
+    location = {
+        'dimensionRange': {
+            'sheetId': tab_id,
+            'dimension': 'ROWS',
+            'startIndex': row - 1,
+            'endIndex': row
+        }
+    }
+    encoded = json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+    if existing is not None:
+        return {
+            'updateDeveloperMetadata': {
+                'dataFilters': [{
+                    'developerMetadataLookup': {'metadataId': existing['metadataId']}
+                }],
+                'developerMetadata': {'metadataValue': encoded, 'location': location},
+                'fields': 'metadataValue,location'
+            }
+        }
+
+    return {
+        'createDeveloperMetadata': {
+            'developerMetadata': {
+                'metadataKey': key,
+                'metadataValue': encoded,
+                'location': location,
+                'visibility': 'DOCUMENT'
+            }
+        }
+    }
+
+
+def anchored_row(
+    anchors: Dict[str, Dict[str, Any]],
+    key: str,
+    tab_id: int,
+    extent: Dict[str, Any]
+) -> Optional[int]:
+    """Row of the key's anchor if it is on tab_id and was written for the same extent (same columns), else None."""
+    anchor = anchors.get(key)
+    if anchor is None or anchor['sheetId'] != tab_id:
+        return None
+    if any(anchor['value'].get(name) != value for name, value in extent.items()):
+        return None
+    return anchor['row']
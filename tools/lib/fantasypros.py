@@ -0,0 +1,464 @@
+"""ABOUTME: FantasyPros consensus-rankings client with a persistent, revalidating disk cache.
+ABOUTME: Parses the API JSON (see docs/api-samples/fantasypros-*.json) into typed records, like server/utils.js."""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from lib.tracing import in_current_span, traced
+
+API_BASE_URL = 'https://api.fantasypros.com/v2/json/nfl'
+API_KEY_ENV = 'FANTASYPROS_API_KEY'
+DEFAULT_SEASON = 2025
+DEFAULT_SCORING = 'STD'
+# GeekSquadron league (server/settings.js); league rankings are what the client requests
+DEFAULT_LEAGUE_KEY = 'nfl~686bb718-0adf-4076-bbca-f78f0d5176e1'
+
+RANKING_TYPES = {'ROS': 'ros', 'WEEKLY': 'weekly', 'DYNASTY': 'dynasty', 'DRAFT': 'draft'}
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'K', 'DST']
+SCORING_TYPES = ['STD', 'PPR', 'HALF']
+
+# How long a cached response is served without asking the API again. Weekly rankings move
+# through the week as experts update; ROS/dynasty/draft rankings change far less often.
+CACHE_TTL_SECONDS = {
+    'ROS': 6 * 60 * 60,
+    'WEEKLY': 30 * 60,
+    'DYNASTY': 24 * 60 * 60,
+    'DRAFT': 24 * 60 * 60,
+}
+
+# Same headers as the Node dump (client/settings.js tabDelimitedHeader)
+TSV_HEADERS = {
+    'ROS': 'rank\tname\tteam\tbye',
+    'WEEKLY': 'rank\tname\tteam\topponent',
+    'DYNASTY': 'rank\tname\tteam\tbye',
+    'DRAFT': 'rank\tname\tteam\tbye',
+}
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+SAMPLES_DIR = Path(__file__).resolve().parents[2] / 'docs' / 'api-samples'
+# Any free port: sample responses are cached under the samples directory, not the server's address
+SAMPLES_PORT = 0
+
+
+@dataclass(frozen=True)
+class PlayerRanking:
+    rank: int
+    name: str
+    team: str
+    position: str
+    bye: Optional[str]
+    opponent: Optional[str]
+    player_id: Optional[int] = None
+    pos_rank: Optional[str] = None
+    rank_min: Optional[int] = None
+    rank_max: Optional[int] = None
+    rank_ave: Optional[float] = None
+    rank_std: Optional[float] = None
+    owned_avg: Optional[float] = None
+    # Weekly rankings only: projected fantasy points for the week (r2p_pts)
+    projected_points: Optional[float] = None
+
+    def to_tsv_row(self, extra: Sequence[str] = ()) -> str:
+        """Row in the Node dump format: opponent if known, otherwise bye week, then any extra columns."""
+        opponent_or_bye = self.opponent or self.bye
+        suffix = f'\t{opponent_or_bye or ""}' if opponent_or_bye or extra else ''
+        return f'{self.rank}\t{self.name}\t{self.team}{suffix}' + ''.join(f'\t{value}' for value in extra)
+
+
+@dataclass
+class Rankings:
+    ranking_type: Optional[str]
+    position: Optional[str]
+    scoring: Optional[str]
+    season: Optional[int]
+    week: Optional[int]
+    last_updated: Optional[str]
+    last_updated_ts: Optional[int]
+    total_experts: Optional[int]
+    players: List[PlayerRanking] = field(default_factory=list)
+    from_cache: bool = False
+
+    def to_tsv(
+        self,
+        extra_headers: Sequence[str] = (),
+        extra: Optional[Callable[['PlayerRanking'], Sequence[str]]] = None
+    ) -> str:
+        """TSV in the Node dump format; extra(player) supplies values for extra_headers columns."""
+        header = TSV_HEADERS.get(self.ranking_type or 'ROS', TSV_HEADERS['ROS'])
+        header += ''.join(f'\t{name}' for name in extra_headers)
+        rows = [player.to_tsv_row(extra(player) if extra else ()) for player in self.players]
+        return '\n'.join([header] + rows) + '\n'
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _reverse_lookup(mapping: Dict[str, str], api_value: Optional[str]) -> Optional[str]:
+    for key, value in mapping.items():
+        if value == api_value:
+            return key
+    return None
+
+
+def normalize_opponent(opponent: Optional[str]) -> Optional[str]:
+    """'vs. WAS' -> 'vs WAS', 'at DEN' -> '@ DEN' (same as the Node client)."""
+    if not opponent:
+        return None
+    opponent = re.sub(r'^vs\.\s*', 'vs ', opponent, flags=re.IGNORECASE)
+    return re.sub(r'^at\s+', '@ ', opponent, flags=re.IGNORECASE)
+
+
+def parse_rankings(data: Dict) -> Rankings:
+    """Convert a consensus-rankings response into Rankings/PlayerRanking records."""
+    ranking_type = _reverse_lookup(RANKING_TYPES, data.get('ranking_type_name'))
+    week = data.get('week')
+
+    players = []
+    for player in data.get('players') or []:
+        opponent = normalize_opponent(player.get('player_opponent'))
+        bye = player.get('player_bye_week') or None
+        # No opponent in weekly rankings because the team is on bye this week
+        if not opponent and ranking_type == 'WEEKLY' and bye and bye == week:
+            opponent = 'BYE'
+
+        players.append(PlayerRanking(
+            rank=_to_int(player.get('rank_ecr')),
+            name=player.get('player_name'),
+            team=player.get('player_team_id'),
+            position=player.get('player_position_id'),
+            bye=bye,
+            opponent=opponent,
+            player_id=_to_int(player.get('player_id')),
+            pos_rank=player.get('pos_rank'),
+            rank_min=_to_int(player.get('rank_min')),
+            rank_max=_to_int(player.get('rank_max')),
+            rank_ave=_to_float(player.get('rank_ave')),
+            rank_std=_to_float(player.get('rank_std')),
+            owned_avg=_to_float(player.get('player_owned_avg')),
+            projected_points=_to_float(player.get('r2p_pts')),
+        ))
+
+    return Rankings(
+        ranking_type=ranking_type,
+        position=data.get('position_id') if data.get('position_id') in POSITIONS else None,
+        scoring=data.get('scoring') if data.get('scoring') in SCORING_TYPES else None,
+        season=_to_int(data.get('year')),
+        week=_to_int(week),
+        last_updated=data.get('last_updated'),
+        last_updated_ts=_to_int(data.get('last_updated_ts')),
+        total_experts=_to_int(data.get('total_experts')),
+        players=players,
+    )
+
+
+def rankings_url(
+    ranking_type: str,
+    position: str,
+    season: int = DEFAULT_SEASON,
+    scoring: str = DEFAULT_SCORING,
+    league_key: Optional[str] = DEFAULT_LEAGUE_KEY,
+    base_url: str = API_BASE_URL
+) -> str:
+    params = {
+        'scoring': scoring,
+        'type': RANKING_TYPES[ranking_type],
+        'position': position,
+    }
+    if league_key:
+        params['league_key'] = league_key
+    return f"{base_url.rstrip('/')}/{season}/consensus-rankings?{urllib.parse.urlencode(params, safe='~')}"
+
+
+def default_cache_dir() -> Path:
+    """Per-user cache directory (%LOCALAPPDATA% on Windows, $XDG_CACHE_HOME or ~/.cache elsewhere)."""
+    if sys.platform == 'win32' and os.environ.get('LOCALAPPDATA'):
+        base = Path(os.environ['LOCALAPPDATA'])
+    else:
+        base = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+    return base / 'fantasy-football-tools' / 'fantasypros'
+
+
+class ResponseCache:
+    """One JSON file per key (the request URL) holding the body plus the validators needed to revalidate it."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / (hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == key else None
+
+    def put(self, key: str, entry: Dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        # Unique temp name per thread so concurrent fetches never share a partial file
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(dict(entry, url=key), handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class FantasyProsClient:
+    """Fetches consensus rankings, serving fresh cache entries directly and revalidating stale ones.
+
+    Cache entries are keyed by the request URL built on cache_base (default: base_url), so a stand-in
+    server on a different port each run can still share one set of entries.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        season: int = DEFAULT_SEASON,
+        scoring: str = DEFAULT_SCORING,
+        league_key: Optional[str] = DEFAULT_LEAGUE_KEY,
+        base_url: str = API_BASE_URL,
+        cache_dir: Optional[Path] = None,
+        ttl_seconds: Optional[Dict[str, int]] = None,
+        use_cache: bool = True,
+        cache_base: Optional[str] = None
+    ):
+        self.api_key = api_key if api_key is not None else os.environ.get(API_KEY_ENV)
+        self.season = season
+        self.scoring = scoring
+        self.league_key = league_key
+        self.base_url = base_url
+        self.cache = ResponseCache(cache_dir or default_cache_dir()) if use_cache else None
+        self.ttl_seconds = dict(CACHE_TTL_SECONDS, **(ttl_seconds or {}))
+        self.cache_base = cache_base or base_url
+
+    def url(self, ranking_type: str, position: str) -> str:
+        return rankings_url(ranking_type, position, self.season, self.scoring, self.league_key, self.base_url)
+
+    def cache_key(self, ranking_type: str, position: str) -> str:
+        return rankings_url(ranking_type, position, self.season, self.scoring, self.league_key, self.cache_base)
+
+    def _request(self, url: str, cached: Optional[Dict]) -> Tuple[int, Optional[bytes], Dict[str, str]]:
+        headers = {'accept': 'application/json'}
+        if self.api_key:
+            headers['x-api-key'] = self.api_key
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT_SECONDS) as response:
+                return response.status, response.read(), dict(response.headers)
+        except urllib.error.HTTPError as err:
+            if err.code == 304:
+                return 304, None, dict(err.headers)
+            raise RuntimeError(f'FantasyPros request failed ({err.code} {err.reason}): {url}') from err
+        except urllib.error.URLError as err:
+            raise RuntimeError(f'FantasyPros request failed ({err.reason}): {url}') from err
+
+    @traced()
+    def fetch_json(self, ranking_type: str, position: str, force_refresh: bool = False) -> Tuple[Dict, bool]:
+        """Return (response JSON, served_from_cache). force_refresh revalidates even a fresh entry."""
+        url = self.url(ranking_type, position)
+        key = self.cache_key(ranking_type, position)
+        cached = self.cache.get(key) if self.cache else None
+        now = time.time()
+
+        if cached and not force_refresh and now - cached.get('fetched_at', 0) < self.ttl_seconds[ranking_type]:
+            return cached['body'], True
+
+        if not self.api_key and self.base_url == API_BASE_URL:
+            raise RuntimeError(f'{API_KEY_ENV} is not set')
+
+        status, body, headers = self._request(url, cached)
+        if status == 304 and cached:
+            # Unchanged upstream: keep the body, restart the TTL
+            entry = dict(cached, fetched_at=now)
+            self.cache.put(key, entry)
+            return cached['body'], True
+
+        try:
+            data = json.loads(body.decode('utf-8'))
+        except ValueError as err:
+            raise RuntimeError(f'FantasyPros returned invalid JSON: {url}') from err
+
+        if self.cache:
+            self.cache.put(key, {
+                'fetched_at': now,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'body': data,
+            })
+        return data, False
+
+    def fetch(self, ranking_type: str, position: str, force_refresh: bool = False) -> Rankings:
+        data, from_cache = self.fetch_json(ranking_type, position, force_refresh)
+        rankings = parse_rankings(data)
+        rankings.from_cache = from_cache
+        return rankings
+
+    @traced()
+    def fetch_many(
+        self,
+        combinations: List[Tuple[str, str]],
+        force_refresh: bool = False,
+        max_workers: int = 6
+    ) -> Dict[Tuple[str, str], Rankings]:
+        """Fetch several (ranking_type, position) pairs concurrently; results keyed by the pair."""
+        if not combinations:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(combinations))) as executor:
+            futures = {
+                combination: executor.submit(in_current_span(self.fetch), combination[0], combination[1], force_refresh)
+                for combination in combinations
+            }
+            return {combination: future.result() for combination, future in futures.items()}
+
+
+def sample_file_for(samples_dir: Path, ranking_type: str, position: str) -> Optional[Path]:
+    """Map a request to docs/api-samples naming: fantasypros-ROS(W8)-K.json, fantasypros-W8-K.json."""
+    if ranking_type == 'ros':
+        pattern = f'fantasypros-ROS(W*)-{position}.json'
+    elif ranking_type == 'weekly':
+        pattern = f'fantasypros-W*-{position}.json'
+    else:
+        pattern = f'fantasypros-{ranking_type.upper()}*-{position}.json'
+    matches = sorted(Path(samples_dir).glob(pattern))
+    return matches[-1] if matches else None
+
+
+class _SampleHandler(SimpleHTTPRequestHandler):
+    """Answers /<season>/consensus-rankings?type=..&position=.. from the sample files."""
+
+    def __init__(self, *args, samples_dir: Path, **kwargs):
+        self.samples_dir = samples_dir
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        parsed = urllib.parse.urlparse(self.path)
+        query = urllib.parse.parse_qs(parsed.query)
+        if not parsed.path.endswith('/consensus-rankings'):
+            self.send_error(404)
+            return
+        sample = sample_file_for(
+            self.samples_dir, query.get('type', [''])[0], query.get('position', [''])[0]
+        )
+        if sample is None:
+            self.send_error(404, 'No sample file for this type/position')
+            return
+
+        body = sample.read_bytes()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        last_modified = formatdate(sample.stat().st_mtime, usegmt=True)
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SampleServer:
+    """Local stand-in for the FantasyPros API serving docs/api-samples; use as a context manager."""
+
+    def __init__(self, samples_dir: Path, host: str = '127.0.0.1', port: int = SAMPLES_PORT):
+        self.samples_dir = Path(samples_dir)
+        handler = partial(_SampleHandler, samples_dir=self.samples_dir)
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def cache_base(self) -> str:
+        """Cache key base for responses from this server: the samples directory, whatever the port."""
+        return f'samples:{self.samples_dir.resolve().as_posix()}'
+
+    def __enter__(self) -> 'SampleServer':
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def add_fantasypros_args(parser: argparse.ArgumentParser) -> None:
+    """FantasyPros fetching options shared by the tools; fetch_rankings() reads them back."""
+    parser.add_argument('--refresh', action='store_true', help='Revalidate cached FantasyPros responses even if they are still fresh')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the on-disk FantasyPros response cache')
+    parser.add_argument('--cache-dir', help='FantasyPros response cache directory (default: per-user cache dir)')
+    parser.add_argument('--base-url', help='FantasyPros API base URL override (e.g. a local stand-in server)')
+    parser.add_argument(
+        '--samples',
+        nargs='?',
+        const=str(SAMPLES_DIR),
+        help='Serve FantasyPros sample responses from a local stand-in server (default dir: docs/api-samples)'
+    )
+    parser.add_argument('--samples-port', type=int, default=SAMPLES_PORT, help='Port for --samples (default: any free port)')
+
+
+def fetch_rankings(args: argparse.Namespace, combinations: List[Tuple[str, str]], **client_options) -> Dict[Tuple[str, str], Rankings]:
+    """fetch_many() with the add_fantasypros_args() options; --samples serves the requests from a SampleServer.
+
+    client_options (season, scoring, league_key, ...) are passed to FantasyProsClient.
+    """
+    options = dict(client_options, use_cache=not args.no_cache)
+    if args.cache_dir:
+        options['cache_dir'] = Path(args.cache_dir)
+    if args.base_url:
+        options['base_url'] = args.base_url
+    if not args.samples:
+        return FantasyProsClient(**options).fetch_many(combinations, force_refresh=args.refresh)
+
+    samples_dir = Path(args.samples)
+    if not samples_dir.is_dir():
+        raise RuntimeError(f"Samples directory '{samples_dir}' does not exist.")
+    with SampleServer(samples_dir, port=args.samples_port) as server:
+        options.update(base_url=server.base_url, cache_base=server.cache_base)
+        return FantasyProsClient(**options).fetch_many(combinations, force_refresh=args.refresh)
@@ -0,0 +1,173 @@
+"""ABOUTME: Flock rankings API JSON (per-expert ranks) as a NumPy players x experts matrix.
+ABOUTME: Consensus mean/median/std/min/max, tiers and per-expert deviation in whole-array operations, rendered as Flock TSV."""
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from lib.tiers import assign_tiers
+
+# Per-expert rank field of each player in a Flock rankings response, by ranking type
+RANK_FIELDS = {'ROS': 'overallRanks', 'WEEKLY': 'weeklyPositionalRanks'}
+# Same columns flock-rankings-to-tsv.py writes from a paste; the stats the API lacks stay blank
+ROS_COLUMNS = ['rank + name', 'pos + rk', 'tm', 'snap%', 'PPR FPs', 'FPs pos rk', 'FPs rk']
+WEEKLY_COLUMNS = ['rank + name', 'opp']
+CONSENSUS_COLUMNS = ['tier', 'avg rk', 'median rk', 'std dev', 'best rk', 'worst rk', 'experts']
+# Players ranked by fewer than this share of the experts in the matrix sort after all others: a lone
+# expert's rank 2 (e.g. a weekly rank the rest left out) says less than five experts averaging 3
+MIN_COVERAGE = 0.5
+
+
+@dataclass
+class RankMatrix:
+    """ranks[i, j] is expert j's rank of player i (NaN when the expert did not rank the player)."""
+    experts: List[str]
+    names: List[str]
+    positions: np.ndarray
+    teams: List[str]
+    ranks: np.ndarray
+
+
+@dataclass
+class Consensus:
+    """Per-player consensus statistics, aligned with the RankMatrix rows."""
+    mean: np.ndarray
+    median: np.ndarray
+    std: np.ndarray
+    best: np.ndarray
+    worst: np.ndarray
+    count: np.ndarray
+    # ranks - mean: positive when the expert is lower on the player than consensus (NaN where unranked)
+    deviation: np.ndarray
+    # 1-based order by mean (ties: median, then best rank) overall and within position, players
+    # below MIN_COVERAGE last
+    rank: np.ndarray
+    pos_rank: np.ndarray
+    # Per position, from mean and std (lib.tiers); 0 for players below MIN_COVERAGE
+    tier: np.ndarray
+
+
+def load_flock_json(path: Path) -> Dict[str, Any]:
+    path = Path(path)
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except OSError as err:
+        raise RuntimeError(f"Unable to read Flock rankings '{path}': {err}") from err
+    except json.JSONDecodeError as err:
+        raise RuntimeError(f"'{path}' is not valid JSON: {err}") from err
+
+
+def rank_matrix(data: Dict[str, Any], ranking_type: str = 'ROS', position: Optional[str] = None) -> RankMatrix:
+    """Players x experts rank matrix from a Flock rankings response (docs/api-samples/flockfantasy-REDRAFT-ALL.json).
+
+    Players that no expert ranks for ranking_type (and draft picks) are left out.
+    """
+    field = RANK_FIELDS[ranking_type]
+    players = [
+        player for player in data.get('data') or []
+        if not player.get('isDraftPick') and player.get('playerName') and player.get(field)
+        and (position is None or player.get('position') == position)
+    ]
+
+    # Experts in lastUpdated order, then any that only appear on players
+    experts: Dict[str, int] = {}
+    for expert in list(data.get('lastUpdated') or {}) + [expert for player in players for expert in player[field]]:
+        experts.setdefault(expert, len(experts))
+
+    ranks = np.full((len(players), len(experts)), np.nan)
+    for row, player in enumerate(players):
+        for expert, rank in player[field].items():
+            if rank is not None:
+                ranks[row, experts[expert]] = rank
+
+    return RankMatrix(
+        experts=list(experts),
+        names=[player['playerName'] for player in players],
+        positions=np.array([player.get('position') or '' for player in players], dtype=str),
+        teams=[player.get('team') or '' for player in players],
+        ranks=ranks,
+    )
+
+
+def _order_rank(*keys: np.ndarray) -> np.ndarray:
+    """1-based rank of each row when sorted by keys (first key most significant)."""
+    order = np.lexsort(keys[::-1])
+    rank = np.empty(len(order), dtype=int)
+    rank[order] = np.arange(1, len(order) + 1)
+    return rank
+
+
+def _rank_within(groups: np.ndarray, rank: np.ndarray) -> np.ndarray:
+    """1-based rank of each row within its group, following rank."""
+    order = np.lexsort((rank, groups))
+    sorted_groups = groups[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    within = np.empty(len(order), dtype=int)
+    within[order] = np.arange(len(order)) - group_start + 1
+    return within
+
+
+def consensus(matrix: RankMatrix) -> Consensus:
+    """Consensus statistics over each player's available expert ranks (population std dev)."""
+    ranks = matrix.ranks
+    if not len(ranks):
+        empty = np.empty(0)
+        return Consensus(empty, empty, empty, empty, empty, empty.astype(int), ranks, empty.astype(int), empty.astype(int), empty.astype(int))
+
+    # Every row has at least one rank (rank_matrix drops the rest), so the nan-reductions never see an all-NaN row
+    mean = np.nanmean(ranks, axis=1)
+    median = np.nanmedian(ranks, axis=1)
+    std = np.nanstd(ranks, axis=1)
+    best = np.nanmin(ranks, axis=1)
+    count = np.count_nonzero(~np.isnan(ranks), axis=1)
+    experts = np.count_nonzero((~np.isnan(ranks)).any(axis=0))
+    low_coverage = count < np.ceil(MIN_COVERAGE * experts)
+    rank = _order_rank(low_coverage, mean, median, best)
+    return Consensus(
+        mean=mean,
+        median=median,
+        std=std,
+        best=best,
+        worst=np.nanmax(ranks, axis=1),
+        count=count,
+        deviation=ranks - mean[:, None],
+        rank=rank,
+        pos_rank=_rank_within(matrix.positions, rank),
+        tier=assign_tiers(np.where(low_coverage, np.nan, mean), std, matrix.positions),
+    )
+
+
+def _format_number(value: float, signed: bool = False) -> str:
+    if np.isnan(value):
+        return ''
+    # + 0.0 turns a rounded -0.0 into 0
+    value = round(float(value), 2) + 0.0
+    text = f'{value:+.2f}' if signed and value else f'{value:.2f}'
+    return text[:-3] if text.endswith('.00') else text
+
+
+def consensus_tsv(matrix: RankMatrix, stats: Consensus, ranking_type: str = 'ROS') -> str:
+    """TSV in the flock-rankings-to-tsv.py column layout, in consensus order, plus consensus columns.
+
+    ROS rows read '<rank>. <name>' / '<pos><pos rank>' like the paste; WEEKLY rows are positional,
+    so they lead with '<pos rank>. <name>'. One '<expert> dev' column per expert follows the stats.
+    Players below MIN_COVERAGE have a blank tier.
+    """
+    columns = ROS_COLUMNS if ranking_type == 'ROS' else WEEKLY_COLUMNS
+    headers = columns + CONSENSUS_COLUMNS + [f'{expert} dev' for expert in matrix.experts]
+    lines = ['\t'.join(headers)]
+    for row in np.argsort(stats.rank, kind='stable'):
+        position = matrix.positions[row]
+        if ranking_type == 'ROS':
+            leading = [f'{stats.rank[row]}. {matrix.names[row]}', f'{position}{stats.pos_rank[row]}', matrix.teams[row]]
+        else:
+            leading = [f'{stats.pos_rank[row]}. {matrix.names[row]}']
+        leading += [''] * (len(columns) - len(leading))
+        values = [stats.mean[row], stats.median[row], stats.std[row], stats.best[row], stats.worst[row]]
+        cells = leading + [str(stats.tier[row]) if stats.tier[row] else ''] + [_format_number(value) for value in values] + [str(stats.count[row])]
+        cells += [_format_number(value, signed=True) for value in stats.deviation[row]]
+        lines.append('\t'.join(cells))
+    return '\n'.join(lines) + '\n'
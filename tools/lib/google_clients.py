@@ -0,0 +1,87 @@
+"""ABOUTME: Process-wide cache of Google OAuth credentials and API discovery documents.
+ABOUTME: Lets a long-lived process (tools daemon, pipeline) authenticate once and build clients cheaply."""
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from google_auth_utils import get_credentials as load_credentials
+
+from googleapiclient.discovery import build, build_from_document
+
+from lib.tracing import span
+
+try:
+    from googleapiclient.discovery_cache import get_static_doc
+except ImportError:  # older google-api-python-client without bundled discovery documents
+    get_static_doc = None
+
+APP_NAME = 'fantasy-football-tools'
+SHEETS_SCOPE = 'https://www.googleapis.com/auth/spreadsheets'
+DOCS_READONLY_SCOPE = 'https://www.googleapis.com/auth/documents.readonly'
+# Everything the tools ask for; a daemon holding these can serve any tool
+ALL_SCOPES = [SHEETS_SCOPE, DOCS_READONLY_SCOPE]
+ALL_SERVICES = [('sheets', 'v4'), ('docs', 'v1')]
+
+# Refresh the access token ahead of expiry so forked jobs never each refresh it themselves
+REFRESH_MARGIN = timedelta(minutes=5)
+
+_lock = threading.Lock()
+_credentials = None
+_credential_scopes: frozenset = frozenset()
+_discovery_documents: Dict[Tuple[str, str], Optional[str]] = {}
+
+
+def get_credentials(scopes: Iterable[str], app_name: str = APP_NAME):
+    """google_auth_utils.get_credentials, reusing the cached credentials when they already cover scopes."""
+    global _credentials, _credential_scopes
+    requested = frozenset(scopes)
+    with _lock:
+        if _credentials is None or not requested <= _credential_scopes:
+            with span('auth', scopes=sorted(requested | _credential_scopes)):
+                _credentials = load_credentials(sorted(requested | _credential_scopes), app_name=app_name)
+            _credential_scopes = requested | _credential_scopes
+        return _credentials
+
+
+def build_service(service_name: str, version: str, credentials):
+    """build(), but from a discovery document read once per process.
+
+    Every call returns a new service object (they are not thread-safe, so callers must not share one).
+    """
+    key = (service_name, version)
+    with _lock:
+        if key not in _discovery_documents:
+            _discovery_documents[key] = get_static_doc(service_name, version) if get_static_doc else None
+        document = _discovery_documents[key]
+
+    with span('build client', service=f'{service_name} {version}', cached_discovery=document is not None):
+        if document is None:
+            return build(service_name, version, credentials=credentials)
+        return build_from_document(document, credentials=credentials)
+
+
+def refresh_if_expiring() -> None:
+    """Refresh the cached access token if it is expired or within REFRESH_MARGIN of expiring."""
+    with _lock:
+        credentials = _credentials
+        if credentials is None or not getattr(credentials, 'refresh_token', None):
+            return
+        expiry = getattr(credentials, 'expiry', None)
+        # google-auth keeps expiry as a naive UTC datetime
+        if credentials.valid and expiry is not None and expiry - datetime.utcnow() > REFRESH_MARGIN:
+            return
+
+        from google.auth.transport.requests import Request
+        try:
+            with span('auth refresh'):
+                credentials.refresh(Request())
+        except Exception as err:
+            raise RuntimeError(f'Unable to refresh Google credentials: {err}') from err
+
+
+def warm(scopes: Iterable[str] = ALL_SCOPES, services: Iterable[Tuple[str, str]] = ALL_SERVICES) -> None:
+    """Load credentials for scopes and the discovery documents for services up front."""
+    credentials = get_credentials(scopes)
+    for service_name, version in services:
+        build_service(service_name, version, credentials)
+    refresh_if_expiring()
@@ -0,0 +1,266 @@
+"""ABOUTME: League roster ownership: player_id -> team dicts and per-team bitsets, loaded once per league.
+ABOUTME: Answers owner/availability for any ranked player in O(1), across several leagues at once."""
+import dataclasses
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from lib.fantasypros import PlayerRanking, Rankings
+from lib.player_master import canonical_key, normalize_name
+
+FREE_AGENT = 'FA'
+MY_TEAM = 'My Team'
+# Short team nicknames used for defenses, by the nickname FantasyPros uses (last word of the DST name)
+DST_NICKNAMES = {
+    'buccaneers': ['bucs'],
+    '49ers': ['niners'],
+    'patriots': ['pats'],
+    'jaguars': ['jags'],
+    'cardinals': ['cards'],
+    'dolphins': ['fins'],
+}
+# Matchup appended to a defense in waiver reports: 'Saints vs NYJ', 'Giants at LV', 'Bucs @ MIA'
+MATCHUP_SUFFIX = re.compile(r'\s+(?:at|vs\.?|v\.?|@)\s+[A-Z]{2,3}$')
+
+
+@dataclass
+class LeagueRoster:
+    """One league's rosters. Team i owns the players whose bits are set in team_bits[i]."""
+    name: str
+    my_team_id: Optional[str]
+    team_ids: List[str]
+    team_names: List[str]
+    # player_id -> index into team_ids/team_names/team_bits
+    team_of: Dict[int, int]
+    team_bits: List[int]
+    # Union of team_bits: every rostered player in the league
+    rostered: int
+
+    @property
+    def my_team(self) -> Optional[int]:
+        return self.team_ids.index(self.my_team_id) if self.my_team_id in self.team_ids else None
+
+
+def parse_roster_spec(spec: str) -> Tuple[Optional[str], Path]:
+    """'NAME=PATH' -> (NAME, PATH); a bare path leaves the name to the roster JSON."""
+    name, sep, path = spec.partition('=')
+    if sep and name and not Path(spec).exists():
+        return name, Path(path)
+    return None, Path(spec)
+
+
+class Ownership:
+    """Rosters of one or more leagues, with a shared bit position per FantasyPros player ID.
+
+    owner()/label() are single dict lookups. Availability checks and team/league views are bit
+    operations on ints, so "free agent in any of my leagues" is one AND and one shift per player.
+    Players are matched by FantasyPros player ID (shared by the roster and rankings APIs); sources
+    without IDs (Flock, waiver reports) resolve names through index_rankings() first.
+    """
+
+    def __init__(self):
+        self.leagues: Dict[str, LeagueRoster] = {}
+        self._bit: Dict[int, int] = {}
+        self._player_ids: List[int] = []
+        self._ids_by_key: Dict[str, int] = {}
+        # Normalized name -> player ID, None when several players share the name
+        self._ids_by_name: Dict[str, Optional[int]] = {}
+        self._rostered_everywhere: Optional[int] = None
+
+    def _bit_for(self, player_id: int) -> int:
+        bit = self._bit.get(player_id)
+        if bit is None:
+            bit = self._bit[player_id] = len(self._player_ids)
+            self._player_ids.append(player_id)
+        return bit
+
+    def add_league(self, data: Dict[str, Any], name: Optional[str] = None) -> LeagueRoster:
+        """Add a league from a league roster response (docs/api-samples/fantasypros-league-roster-*.json)."""
+        name = name or data.get('name') or data.get('nickname') or f'league {len(self.leagues) + 1}'
+        if name in self.leagues:
+            raise RuntimeError(f"League '{name}' was loaded twice")
+
+        team_ids: List[str] = []
+        team_names: List[str] = []
+        team_of: Dict[int, int] = {}
+        team_bits: List[int] = []
+        for index, team in enumerate(data.get('teams') or []):
+            team_ids.append(str(team.get('id')))
+            team_names.append(team.get('name') or f"team {team.get('id')}")
+            bits = 0
+            for player_id in team.get('players') or []:
+                player_id = int(player_id)
+                team_of[player_id] = index
+                bits |= 1 << self._bit_for(player_id)
+            team_bits.append(bits)
+
+        rostered = 0
+        for bits in team_bits:
+            rostered |= bits
+        my_team_id = data.get('teamId')
+        league = LeagueRoster(
+            name=name,
+            my_team_id=str(my_team_id) if my_team_id is not None else None,
+            team_ids=team_ids,
+            team_names=team_names,
+            team_of=team_of,
+            team_bits=team_bits,
+            rostered=rostered,
+        )
+        self.leagues[name] = league
+        self._rostered_everywhere = None
+        return league
+
+    def load_league(self, spec: str) -> LeagueRoster:
+        """Add a league from a roster JSON file given as PATH or NAME=PATH."""
+        name, path = parse_roster_spec(spec)
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError) as err:
+            raise RuntimeError(f"Unable to read league roster '{path}': {err}") from err
+        return self.add_league(data, name)
+
+    def index_rankings(self, rankings: Iterable[Rankings]) -> None:
+        """Learn player IDs by name from FantasyPros rankings, for sources that only have names."""
+        for ranking in rankings:
+            for player in ranking.players:
+                if player.player_id is None:
+                    continue
+                self._ids_by_key[canonical_key(player.name, player.position, player.team)] = player.player_id
+                names = [normalize_name(player.name)]
+                if player.position == 'DST':
+                    # Waiver reports name defenses by nickname ("Seahawks", "Bucs") or city
+                    words = player.name.split()
+                    nickname = normalize_name(words[-1])
+                    names += [nickname, normalize_name(' '.join(words[:-1]))] + DST_NICKNAMES.get(nickname, [])
+                for slug in names:
+                    if slug and self._ids_by_name.get(slug, player.player_id) != player.player_id:
+                        self._ids_by_name[slug] = None
+                    elif slug:
+                        self._ids_by_name[slug] = player.player_id
+
+    def player_id_for(self, name: str, position: Optional[str] = None, team: Optional[str] = None) -> Optional[int]:
+        """FantasyPros ID for a name (position disambiguates; without it the name must be unique).
+
+        A trailing matchup ('Saints vs NYJ', 'Giants at LV') is ignored.
+        """
+        name = MATCHUP_SUFFIX.sub('', name.strip())
+        if position:
+            player_id = self._ids_by_key.get(canonical_key(name, position, team))
+            if player_id is not None:
+                return player_id
+        return self._ids_by_name.get(normalize_name(name))
+
+    def owner(self, player_id: Optional[int], league: str) -> Optional[str]:
+        """Team name owning the player in league, None if unrostered."""
+        roster = self.leagues[league]
+        index = roster.team_of.get(player_id)
+        return roster.team_names[index] if index is not None else None
+
+    def label(self, player_id: Optional[int], league: str) -> str:
+        """'FA', 'My Team' or the owning team's name (blank for an unknown player)."""
+        if player_id is None:
+            return ''
+        roster = self.leagues[league]
+        index = roster.team_of.get(player_id)
+        if index is None:
+            return FREE_AGENT
+        return MY_TEAM if roster.team_ids[index] == roster.my_team_id else roster.team_names[index]
+
+    def labels(self, player_id: Optional[int]) -> List[str]:
+        """label() in every league, in load order."""
+        return [self.label(player_id, league) for league in self.leagues]
+
+    def is_mine(self, player_id: Optional[int], league: str) -> bool:
+        roster = self.leagues[league]
+        index = roster.team_of.get(player_id)
+        return index is not None and roster.team_ids[index] == roster.my_team_id
+
+    def is_available(self, player_id: Optional[int], league: Optional[str] = None) -> bool:
+        """Unrostered in league, or (league=None) in at least one loaded league.
+
+        Player IDs no league has ever rostered are available everywhere.
+        """
+        bit = self._bit.get(player_id)
+        if bit is None:
+            return True
+        if league is not None:
+            mask = self.leagues[league].rostered
+        else:
+            if self._rostered_everywhere is None:
+                mask = -1
+                for roster in self.leagues.values():
+                    mask &= roster.rostered
+                self._rostered_everywhere = mask if self.leagues else 0
+            mask = self._rostered_everywhere
+        return not (mask >> bit) & 1
+
+    def team_players(self, league: str, team_index: int) -> List[int]:
+        """Player IDs on one team, from its bitset."""
+        bits = self.leagues[league].team_bits[team_index]
+        players = []
+        while bits:
+            low = bits & -bits
+            players.append(self._player_ids[low.bit_length() - 1])
+            bits ^= low
+        return players
+
+    def column_headers(self) -> List[str]:
+        """'owner' for one league, 'owner (<league>)' per league for several."""
+        if len(self.leagues) == 1:
+            return ['owner']
+        return [f'owner ({league})' for league in self.leagues]
+
+
+def load_ownership(specs: Iterable[str]) -> Ownership:
+    """Ownership for roster files given as PATH or NAME=PATH."""
+    ownership = Ownership()
+    for spec in specs:
+        ownership.load_league(spec)
+    return ownership
+
+
+def rankings_tsv_with_owners(
+    rankings: Rankings,
+    ownership: Ownership,
+    available_only: bool = False,
+    extra_headers: Sequence[str] = (),
+    extra: Optional[Callable[[PlayerRanking], Sequence[str]]] = None
+) -> str:
+    """Rankings TSV with an owner column per league; available_only drops players rostered in every league.
+
+    extra_headers/extra (as for Rankings.to_tsv) come before the owner columns.
+    """
+    if available_only:
+        players = [
+            player for player in rankings.players
+            if player.player_id is not None and ownership.is_available(player.player_id)
+        ]
+        rankings = dataclasses.replace(rankings, players=players)
+    return rankings.to_tsv(
+        list(extra_headers) + ownership.column_headers(),
+        lambda player: list(extra(player) if extra else ()) + ownership.labels(player.player_id)
+    )
+
+
+def tsv_with_owners(
+    tsv_content: str,
+    ownership: Ownership,
+    player_id_of: Callable[[Dict[str, str]], Optional[int]],
+    available_only: bool = False
+) -> str:
+    """Append owner columns to a TSV whose rows have no player IDs (player_id_of maps a row to one).
+
+    With available_only, rows that cannot be matched to a player ID are dropped along with rostered ones.
+    """
+    lines = tsv_content.rstrip('\n').split('\n')
+    headers = lines[0].split('\t')
+    output = ['\t'.join(headers + ownership.column_headers())]
+    for line in lines[1:]:
+        player_id = player_id_of(dict(zip(headers, line.split('\t'))))
+        if available_only and (player_id is None or not ownership.is_available(player_id)):
+            continue
+        output.append('\t'.join([line] + ownership.labels(player_id)))
+    return '\n'.join(output) + '\n'
@@ -0,0 +1,528 @@
+"""ABOUTME: Declarative stage graph runner for the weekly update pipeline.
+ABOUTME: Runs stages as subprocesses, independent ones concurrently under a shared API call budget, and reports the critical path."""
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lib.artifact_store import ArtifactStore, stage_key
+from lib.tools_daemon import SOCKET_ENV, default_socket_path, is_supported, send_command
+from lib.tracing import child_env, span
+
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+CACHED = 'cached'
+# Statuses that let the stages that need a stage run
+DONE = (SUCCEEDED, CACHED)
+
+# {name} placeholders in stage commands, stdin/stdout paths and other variables
+_PLACEHOLDER = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)\}')
+# Stage fields that may contain placeholders
+_TEMPLATED_FIELDS = ('run', 'stdin', 'stdout', 'inputs', 'outputs', 'code', 'key_command')
+# Seconds a stage's key_command may take
+KEY_COMMAND_TIMEOUT = 120
+
+# How long to wait for a private tools daemon to come up (the first start may show the OAuth consent page)
+DAEMON_STARTUP_TIMEOUT = 300.0
+
+
+@dataclass
+class Stage:
+    name: str
+    run: List[str]
+    needs: List[str] = field(default_factory=list)
+    # Estimated Google API calls, charged against the shared budget before the stage starts
+    api_calls: int = 0
+    # Shared remote targets (e.g. a spreadsheet the stage rewrites); stages holding one never run at once
+    resources: List[str] = field(default_factory=list)
+    description: str = ''
+    stdin: Optional[str] = None
+    stdout: Optional[str] = None
+    # Files the stage reads and writes; outputs are removed before the stage runs
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    # Pure stages: reuse stored outputs when the key (command, inputs, code, key_command output) is unchanged
+    cache: bool = False
+    # Extra code files/directories the outputs depend on (scripts on the command line count automatically)
+    code: List[str] = field(default_factory=list)
+    # Command whose stdout joins the key, for inputs that are not local files (e.g. a Doc revision ID)
+    key_command: Optional[List[str]] = None
+
+    @property
+    def produced_files(self) -> List[str]:
+        return self.outputs + ([self.stdout] if self.stdout else [])
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str = PENDING
+    returncode: Optional[int] = None
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    budget_wait: float = 0.0
+    log_path: Optional[Path] = None
+
+    @property
+    def duration(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+def substitute(template: str, variables: Dict[str, Optional[str]]) -> str:
+    """Replace {name} placeholders; raises RuntimeError for names that are undefined or have no value."""
+    def replace(match):
+        key = match.group(1)
+        if variables.get(key) is None:
+            raise RuntimeError(f"variable '{key}' has no value (pass --set {key}=...)")
+        return str(variables[key])
+    return _PLACEHOLDER.sub(replace, template)
+
+
+def resolve_variables(defaults: Dict[str, Optional[str]], overrides: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Merge graph defaults with overrides and expand variables that reference other variables.
+
+    Variables left without a value stay None; they only become an error when a selected stage uses one.
+    """
+    variables: Dict[str, Optional[str]] = {**defaults, **overrides}
+    for _ in range(len(variables) + 1):
+        changed = False
+        for key, value in variables.items():
+            if value is None or not _PLACEHOLDER.search(value):
+                continue
+            names = _PLACEHOLDER.findall(value)
+            if any(_PLACEHOLDER.search(variables.get(name) or '') for name in names):
+                continue  # expand the referenced variables first
+            try:
+                variables[key] = substitute(value, variables)
+            except RuntimeError:
+                variables[key] = None  # depends on a missing value, so it is missing too
+            changed = True
+        if not changed:
+            break
+    unresolved = [key for key, value in variables.items() if value and _PLACEHOLDER.search(value)]
+    if unresolved:
+        raise RuntimeError(f"circular variable references: {', '.join(sorted(unresolved))}")
+    return variables
+
+
+def topological_order(stages: Dict[str, Stage]) -> List[str]:
+    """Stage names with every stage after the stages it needs (graph order among independent stages)."""
+    remaining = {name: set(stage.needs) for name, stage in stages.items()}
+    order: List[str] = []
+    while remaining:
+        ready = [name for name, needs in remaining.items() if not needs]
+        if not ready:
+            raise RuntimeError(f"dependency cycle between stages: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+            order.append(name)
+        for needs in remaining.values():
+            needs.difference_update(ready)
+    return order
+
+
+def load_graph(graph_path: Path) -> Tuple[Dict[str, Optional[str]], Dict[str, Stage]]:
+    """Read a stage graph JSON file into (variable defaults, stages in topological order)."""
+    try:
+        graph = json.loads(Path(graph_path).read_text(encoding='utf-8'))
+    except (OSError, json.JSONDecodeError) as err:
+        raise RuntimeError(f"Unable to read stage graph '{graph_path}': {err}") from err
+
+    stages: Dict[str, Stage] = {}
+    for entry in graph.get('stages', []):
+        name = entry.get('name')
+        if not name or not isinstance(entry.get('run'), list) or not entry['run']:
+            raise RuntimeError(f"Stage graph '{graph_path}': every stage needs a name and a non-empty run list ({entry})")
+        if name in stages:
+            raise RuntimeError(f"Stage graph '{graph_path}': duplicate stage '{name}'")
+        stages[name] = Stage(
+            name=name,
+            run=[str(arg) for arg in entry['run']],
+            needs=list(entry.get('needs', [])),
+            api_calls=int(entry.get('api_calls', 0)),
+            resources=[str(resource) for resource in entry.get('resources', [])],
+            description=entry.get('description', ''),
+            stdin=entry.get('stdin'),
+            stdout=entry.get('stdout'),
+            inputs=[str(path) for path in entry.get('inputs', [])],
+            outputs=[str(path) for path in entry.get('outputs', [])],
+            cache=bool(entry.get('cache', False)),
+            code=[str(path) for path in entry.get('code', [])],
+            key_command=[str(arg) for arg in entry['key_command']] if entry.get('key_command') else None,
+        )
+
+    for stage in stages.values():
+        unknown = [need for need in stage.needs if need not in stages]
+        if unknown:
+            raise RuntimeError(f"Stage graph '{graph_path}': stage '{stage.name}' needs unknown stage(s) {', '.join(unknown)}")
+
+    ordered = {name: stages[name] for name in topological_order(stages)}
+    return dict(graph.get('variables', {})), ordered
+
+
+def select_stages(stages: Dict[str, Stage], patterns: Iterable[str]) -> Dict[str, Stage]:
+    """Stages matching any glob pattern plus everything they (transitively) need, in graph order."""
+    patterns = list(patterns)
+    if not patterns:
+        return dict(stages)
+
+    selected = set()
+    pending = []
+    for pattern in patterns:
+        matches = [name for name in stages if fnmatchcase(name, pattern)]
+        if not matches:
+            raise RuntimeError(f"no stage matches '{pattern}'")
+        pending.extend(matches)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(stages[name].needs)
+    return {name: stage for name, stage in stages.items() if name in selected}
+
+
+def expand_stages(stages: Dict[str, Stage], variables: Dict[str, Optional[str]]) -> Dict[str, Stage]:
+    """Substitute variables into the stages' templated fields."""
+    expanded = {}
+    for name, stage in stages.items():
+        try:
+            values: Dict[str, Any] = {}
+            for field_name in _TEMPLATED_FIELDS:
+                value = getattr(stage, field_name)
+                if isinstance(value, list):
+                    values[field_name] = [substitute(arg, variables) for arg in value]
+                elif value is not None:
+                    values[field_name] = substitute(value, variables)
+        except RuntimeError as err:
+            raise RuntimeError(f"stage '{name}': {err}") from err
+        expanded[name] = Stage(**{**stage.__dict__, **values})
+    return expanded
+
+
+def stage_levels(stages: Dict[str, Stage]) -> List[List[str]]:
+    """Group stages into waves: each wave only needs stages from earlier waves."""
+    level: Dict[str, int] = {}
+    for name, stage in stages.items():
+        level[name] = max((level[need] + 1 for need in stage.needs if need in level), default=0)
+    waves: List[List[str]] = [[] for _ in range(max(level.values(), default=-1) + 1)]
+    for name, index in level.items():
+        waves[index].append(name)
+    return waves
+
+
+class ApiBudget:
+    """Token bucket shared by all stages: calls_per_minute tokens refill continuously, up to one minute's worth.
+
+    A stage waits until the bucket holds its estimated calls (or is full, for stages larger than the
+    bucket) and is then charged in full, so later stages wait for the overdraft to refill.
+    """
+
+    def __init__(self, calls_per_minute: float):
+        self.rate = calls_per_minute / 60.0
+        self.capacity = float(calls_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, calls: int) -> float:
+        """Block until calls can be spent; returns the seconds waited."""
+        if calls <= 0 or self.rate <= 0:
+            return 0.0
+        needed = min(float(calls), self.capacity)
+        started = time.monotonic()
+        # Holding the lock while sleeping hands out the budget in request order
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= needed:
+                    self.tokens -= calls
+                    return time.monotonic() - started
+                time.sleep((needed - self.tokens) / self.rate)
+
+
+class PipelineRunner:
+    """Runs expanded stages as subprocesses, as soon as the stages they need have succeeded and
+    no running stage holds one of their resources.
+
+    Each stage's stdout (unless redirected to a file) and stderr go to <log_dir>/<stage>.log.
+    When a stage fails, the stages that need it are skipped; independent stages still run.
+    With a store, cache stages whose key is already stored get their outputs restored instead of
+    running (unless their name is in rerun), and successful runs are stored.
+    """
+
+    def __init__(
+        self,
+        stages: Dict[str, Stage],
+        log_dir: Path,
+        max_parallel: int = 4,
+        budget: Optional[ApiBudget] = None,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[Path] = None,
+        store: Optional[ArtifactStore] = None,
+        rerun: Iterable[str] = ()
+    ):
+        self.stages = stages
+        self.log_dir = Path(log_dir)
+        self.max_parallel = max(1, max_parallel)
+        self.budget = budget
+        self.env = env
+        self.cwd = cwd
+        self.store = store
+        self.rerun = set(rerun)
+        self.results = {name: StageResult(name) for name in stages}
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._print_lock = threading.Lock()
+
+    def _echo(self, message: str) -> None:
+        elapsed = time.monotonic() - self.started if self.started is not None else 0.0
+        with self._print_lock:
+            print(f'[{elapsed:7.1f}s] {message}', flush=True)
+
+    def _cache_key(self, stage: Stage, log) -> Optional[str]:
+        """The stage's store key, or None if its key_command fails (the stage then runs uncached)."""
+        extra = ''
+        if stage.key_command:
+            try:
+                completed = subprocess.run(
+                    stage.key_command, stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                    cwd=self.cwd, env=child_env(self.env), timeout=KEY_COMMAND_TIMEOUT
+                )
+            except (OSError, subprocess.TimeoutExpired) as err:
+                log.write(f'Warning: key command failed, running uncached: {err}\n')
+                return None
+            if completed.returncode != 0:
+                log.write(completed.stdout + completed.stderr)
+                log.write(f'Warning: key command exited {completed.returncode}, running uncached\n')
+                return None
+            extra = completed.stdout.strip()
+        return stage_key(stage.name, stage.run, stage.inputs, stage.code, stage.stdin, extra)
+
+    def _restore(self, stage: Stage, result: StageResult, key: str, log) -> bool:
+        entry = self.store.lookup(key)
+        if entry is None:
+            return False
+        result.started = time.monotonic()
+        try:
+            self.store.restore(key, entry)
+        except OSError as err:
+            log.write(f'Warning: unable to restore cached outputs, running the stage: {err}\n')
+            return False
+        result.finished = time.monotonic()
+        result.status = CACHED
+        log.write(f'Restored {len(entry.get("outputs", {}))} output(s) from artifact {key}\n')
+        self._echo(f'cached {stage.name}')
+        return True
+
+    def _run_stage(self, stage: Stage, result: StageResult) -> None:
+        result.log_path = self.log_dir / f'{stage.name}.log'
+        with span(f'stage {stage.name}') as stage_span, open(result.log_path, 'w', encoding='utf-8') as log:
+            key = None
+            if self.store is not None and stage.cache:
+                key = self._cache_key(stage, log)
+                if key and stage.name not in self.rerun and self._restore(stage, result, key, log):
+                    stage_span.set(status=result.status)
+                    return
+            self._execute(stage, result, log)
+            stage_span.set(status=result.status, budget_wait=round(result.budget_wait, 3))
+
+            if result.status == SUCCEEDED and key:
+                try:
+                    self.store.save(key, stage.name, stage.produced_files)
+                except (OSError, RuntimeError) as err:
+                    log.write(f'Warning: outputs not cached: {err}\n')
+                    self._echo(f'Warning: {stage.name} outputs not cached: {err}')
+
+    def _execute(self, stage: Stage, result: StageResult, log) -> None:
+        if self.budget is not None:
+            result.budget_wait = self.budget.acquire(stage.api_calls)
+
+        # Tools refuse to overwrite some outputs, and a failed run must not leave stale ones behind
+        for output in stage.outputs:
+            Path(output).unlink(missing_ok=True)
+
+        self._echo(f'start {stage.name}' + (f' (waited {result.budget_wait:.1f}s for API budget)' if result.budget_wait >= 0.1 else ''))
+        log.flush()
+        result.started = time.monotonic()
+        try:
+            stdin = open(stage.stdin, 'rb') if stage.stdin else subprocess.DEVNULL
+            if stage.stdout:
+                Path(stage.stdout).parent.mkdir(parents=True, exist_ok=True)
+            stdout = open(stage.stdout, 'wb') if stage.stdout else log
+            try:
+                result.returncode = subprocess.run(
+                    stage.run, stdin=stdin, stdout=stdout, stderr=log, cwd=self.cwd, env=child_env(self.env)
+                ).returncode
+            finally:
+                if stage.stdin:
+                    stdin.close()
+                if stage.stdout:
+                    stdout.close()
+        except OSError as err:
+            result.returncode = -1
+            log.write(f'Error: Unable to run stage: {err}\n')
+        result.finished = time.monotonic()
+
+        result.status = SUCCEEDED if result.returncode == 0 else FAILED
+        if result.status == SUCCEEDED:
+            self._echo(f'done  {stage.name} in {result.duration:.1f}s')
+        else:
+            self._echo(f'FAIL  {stage.name} (exit {result.returncode}) after {result.duration:.1f}s, see {result.log_path}')
+
+    def run(self) -> Dict[str, StageResult]:
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.started = time.monotonic()
+        running = {}
+        held = set()
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            while True:
+                # Stages are in topological order, so one pass settles skips along whole chains
+                for name, stage in self.stages.items():
+                    result = self.results[name]
+                    if result.status != PENDING:
+                        continue
+                    needs = [self.results[need].status for need in stage.needs]
+                    if any(status in (FAILED, SKIPPED) for status in needs):
+                        result.status = SKIPPED
+                        self._echo(f'skip  {name} (a stage it needs did not succeed)')
+                    elif (
+                        all(status in DONE for status in needs)
+                        and len(running) < self.max_parallel
+                        and held.isdisjoint(stage.resources)
+                    ):
+                        result.status = RUNNING
+                        held.update(stage.resources)
+                        running[pool.submit(self._run_stage, stage, result)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    held.difference_update(self.stages[running.pop(future)].resources)
+                    future.result()
+        self.finished = time.monotonic()
+        return self.results
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """Longest chain of dependent stages by measured duration, and its total seconds."""
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name, stage in self.stages.items():
+            result = self.results[name]
+            if result.started is None:
+                continue
+            before = max((need for need in stage.needs if need in finish), key=finish.get, default=None)
+            finish[name] = result.duration + (finish[before] if before else 0.0)
+            previous[name] = before
+        if not finish:
+            return [], 0.0
+
+        name: Optional[str] = max(finish, key=finish.get)
+        total = finish[name]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1], total
+
+    def summary(self) -> str:
+        """Per-stage timing table plus the critical path and wall time versus summed stage time."""
+        width = max([len('stage')] + [len(name) for name in self.stages])
+        lines = [f"{'stage':<{width}}  {'status':<9}  {'start':>7}  {'time':>7}  {'budget':>7}"]
+        for name, result in self.results.items():
+            start = f'{result.started - self.started:6.1f}s' if result.started is not None else '      -'
+            lines.append(
+                f'{name:<{width}}  {result.status:<9}  {start:>7}  {result.duration:6.1f}s  {result.budget_wait:6.1f}s'
+            )
+
+        path, path_seconds = self.critical_path()
+        wall = (self.finished or time.monotonic()) - self.started
+        stage_total = sum(result.duration for result in self.results.values())
+        lines.append('')
+        if path:
+            lines.append(f"Critical path ({path_seconds:.1f}s): {' -> '.join(path)}")
+        concurrency = f' ({stage_total / wall:.1f}x concurrency)' if wall > 0 and stage_total > 0 else ''
+        lines.append(f'Wall time {wall:.1f}s; sum of stage times {stage_total:.1f}s{concurrency}')
+        return '\n'.join(lines)
+
+
+@contextmanager
+def shared_tools_daemon(daemon_script: Path, log_path: Path) -> Iterator[Dict[str, str]]:
+    """Yield environment overrides that point stages at one tools daemon for the whole run.
+
+    Reuses a daemon already listening on the default socket; otherwise starts a private one on a
+    temporary socket and stops it afterwards. Yields {} (stages authenticate in-process) if the
+    platform has no daemon support or the daemon does not come up.
+    """
+    if not is_supported():
+        yield {}
+        return
+
+    def status(socket_path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return send_command('status', socket_path)
+        except (OSError, ConnectionError):
+            return None
+
+    existing = default_socket_path()
+    if status(existing) is not None:
+        print(f'Using the running tools daemon on {existing}', flush=True)
+        yield {SOCKET_ENV: str(existing)}
+        return
+
+    socket_dir = Path(tempfile.mkdtemp(prefix='ff-pipeline-'))
+    socket_path = socket_dir / 'tools-daemon.sock'
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    print(f'Starting a tools daemon for this run (log: {log_path})', flush=True)
+    with open(log_path, 'w', encoding='utf-8') as log:
+        process = subprocess.Popen(
+            [sys.executable, str(daemon_script), 'serve', '--socket', str(socket_path)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT
+        )
+
+    try:
+        deadline = time.monotonic() + DAEMON_STARTUP_TIMEOUT
+        while status(socket_path) is None:
+            if process.poll() is not None or time.monotonic() > deadline:
+                print(f'Warning: Tools daemon did not start (see {log_path}); stages will authenticate separately',
+                      file=sys.stderr)
+                yield {}
+                return
+            time.sleep(0.2)
+        yield {SOCKET_ENV: str(socket_path)}
+    finally:
+        if process.poll() is None:
+            try:
+                send_command('stop', socket_path)
+            except (OSError, ConnectionError):
+                process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+def stage_environment(overrides: Dict[str, str]) -> Dict[str, str]:
+    """Environment for stage subprocesses: ours, unbuffered output, plus overrides."""
+    env = dict(os.environ)
+    env['PYTHONUNBUFFERED'] = '1'
+    env.update(overrides)
+    return env
@@ -0,0 +1,286 @@
+"""ABOUTME: One in-memory player table joined across Flock ROS, FantasyPros rankings and league rosters.
+ABOUTME: Rows are keyed by a canonical player key so every source joins with dict lookups instead of sheet VLOOKUPs."""
+import csv
+import io
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from lib.fantasypros import PlayerRanking, Rankings
+
+if TYPE_CHECKING:
+    from lib.ownership import Ownership
+
+# Rank sources in column order: (source id, column label)
+SOURCES = [('flock', 'Flock'), ('fp_ros', 'FP ROS'), ('fp_weekly', 'FP wk')]
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+# Normalized names that differ between sources -> the FantasyPros spelling
+NAME_ALIASES = {
+    'cameron-ward': 'cam-ward',
+    'chigoziem-okonkwo': 'chig-okonkwo',
+}
+
+# Optional 'tier' and owner columns (one per league, see lib.ownership) go after 'opp'
+LEADING_HEADERS = ['key', 'player', 'pos', 'tm', 'bye', 'opp']
+TRAILING_HEADERS = ['FP/G', 'snap%'] + [f'{label} {column}' for _, label in SOURCES for column in ('rk', 'pos rk')]
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).strip().rstrip('%'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    number = _to_float(value)
+    return int(number) if number is not None else None
+
+
+def normalize_name(name: str) -> str:
+    """'Marvin Harrison Jr.' -> 'marvin-harrison', "Ja'Marr Chase" -> 'jamarr-chase', 'A.J. Brown' -> 'aj-brown'."""
+    text = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    text = re.sub(r"['.’]", '', text)
+    words = re.split(r'[^a-z0-9]+', text)
+    words = [word for word in words if word]
+    while len(words) > 1 and words[-1] in NAME_SUFFIXES:
+        words.pop()
+    slug = '-'.join(words)
+    return NAME_ALIASES.get(slug, slug)
+
+
+def canonical_key(name: str, position: str, team: Optional[str] = None) -> str:
+    """Join key for a player: position plus normalized name (team defenses by team, since their names vary)."""
+    position = (position or '').upper()
+    if position in ('DST', 'DEF', 'D/ST') and team:
+        return f'DST:{team.upper()}'
+    return f'{position}:{normalize_name(name)}'
+
+
+def parse_position_rank(text: str) -> Tuple[Optional[str], Optional[int]]:
+    """'RB12' -> ('RB', 12)."""
+    match = re.match(r'^\s*([A-Za-z/]+)\s*(\d+)\s*$', text or '')
+    if not match:
+        return None, None
+    return match.group(1).upper(), int(match.group(2))
+
+
+def split_rank_name(text: str) -> Tuple[Optional[int], str]:
+    """Flock 'rank + name' cell: '12. Jahmyr Gibbs' -> (12, 'Jahmyr Gibbs')."""
+    match = re.match(r'^\s*(\d+)\.\s+(.+?)\s*$', text or '')
+    if not match:
+        return None, (text or '').strip()
+    return int(match.group(1)), match.group(2)
+
+
+@dataclass(frozen=True)
+class FlockPlayer:
+    rank: Optional[float]
+    name: str
+    position: Optional[str]
+    pos_rank: Optional[int]
+    team: Optional[str]
+    snap_pct: Optional[float] = None
+    fp_per_game: Optional[float] = None
+
+
+def parse_flock_ros_tsv(text: str) -> List[FlockPlayer]:
+    """Rows of the Flock ROS TSV written by flock-rankings-to-tsv.py (rank + name, pos + rk, tm, snap%, PPR FPs, ...)."""
+    players = []
+    for row in csv.DictReader(io.StringIO(text), delimiter='\t'):
+        rank, name = split_rank_name(row.get('rank + name') or '')
+        if rank is None:
+            continue
+        position, pos_rank = parse_position_rank(row.get('pos + rk') or '')
+        players.append(FlockPlayer(
+            rank=float(rank),
+            name=name,
+            position=position,
+            pos_rank=pos_rank,
+            team=(row.get('tm') or '').strip() or None,
+            snap_pct=_to_float(row.get('snap%')),
+            fp_per_game=_to_float(row.get('PPR FPs')),
+        ))
+    return players
+
+
+def parse_flock_api(data: Dict[str, Any]) -> List[FlockPlayer]:
+    """Players of a Flock rankings API response (see docs/api-samples/flockfantasy-REDRAFT-ALL.json)."""
+    players = []
+    for player in data.get('data') or []:
+        if player.get('isDraftPick') or not player.get('playerName'):
+            continue
+        players.append(FlockPlayer(
+            rank=_to_float(player.get('averageRank')),
+            name=player['playerName'],
+            position=player.get('position'),
+            pos_rank=_to_int(player.get('averagePositionalRank')),
+            team=player.get('team'),
+        ))
+    return players
+
+
+def load_flock_ros(path: Path) -> List[FlockPlayer]:
+    """Flock ROS rankings from a flock-rankings-to-tsv.py TSV or a saved Flock API JSON response."""
+    path = Path(path)
+    try:
+        text = path.read_text(encoding='utf-8')
+    except OSError as err:
+        raise RuntimeError(f"Unable to read Flock rankings '{path}': {err}") from err
+    if path.suffix.lower() == '.json':
+        try:
+            return parse_flock_api(json.loads(text))
+        except json.JSONDecodeError as err:
+            raise RuntimeError(f"'{path}' is not valid JSON: {err}") from err
+    return parse_flock_ros_tsv(text)
+
+
+@dataclass
+class SourceRank:
+    rank: Optional[float]
+    pos_rank: Optional[int]
+
+
+@dataclass
+class PlayerRow:
+    key: str
+    name: str
+    position: str
+    team: Optional[str] = None
+    bye: Optional[int] = None
+    opponent: Optional[str] = None
+    tier: Optional[int] = None
+    owners: List[str] = field(default_factory=list)
+    fantasypros_id: Optional[int] = None
+    fp_per_game: Optional[float] = None
+    snap_pct: Optional[float] = None
+    ranks: Dict[str, SourceRank] = field(default_factory=dict)
+
+    def sort_rank(self) -> Tuple[int, float]:
+        """Order by the first source (in SOURCES order) that ranks the player; unranked players last."""
+        for index, (source, _) in enumerate(SOURCES):
+            rank = self.ranks.get(source)
+            if rank and rank.rank is not None:
+                return index, rank.rank
+        return len(SOURCES), 0.0
+
+    def values(self, tiers: bool = False) -> List[Any]:
+        row = [self.key, self.name, self.position, self.team, self.bye, self.opponent]
+        row += [self.tier] if tiers else []
+        row += self.owners
+        row += [self.fp_per_game, self.snap_pct]
+        for source, _ in SOURCES:
+            rank = self.ranks.get(source)
+            row.extend([rank.rank, rank.pos_rank] if rank else [None, None])
+        return row
+
+
+class PlayerMaster:
+    """Player rows by canonical key, plus a FantasyPros player ID index for joining roster data.
+
+    Each add_* call is one pass over its source with dict lookups, so building the table is linear
+    in the total number of source rows.
+    """
+
+    def __init__(self):
+        self.players: Dict[str, PlayerRow] = {}
+        self.by_fantasypros_id: Dict[int, str] = {}
+        self.ownership: Optional['Ownership'] = None
+        self.tiered = False
+        # Week of the weekly rankings joined in (None before any are added)
+        self.week: Optional[int] = None
+
+    def _row(self, name: str, position: str, team: Optional[str]) -> PlayerRow:
+        key = canonical_key(name, position, team)
+        row = self.players.get(key)
+        if row is None:
+            row = self.players[key] = PlayerRow(key=key, name=name, position=(position or '').upper(), team=team)
+        return row
+
+    def add_flock(self, players: Iterable[FlockPlayer], source: str = 'flock') -> None:
+        for player in players:
+            row = self._row(player.name, player.position or '', player.team)
+            row.ranks[source] = SourceRank(player.rank, player.pos_rank)
+            row.team = row.team or player.team
+            if player.fp_per_game is not None:
+                row.fp_per_game = player.fp_per_game
+            if player.snap_pct is not None:
+                row.snap_pct = player.snap_pct
+
+    def add_fantasypros(self, rankings: Rankings, source: str) -> None:
+        for player in rankings.players:
+            row = self._row(player.name, player.position or '', player.team)
+            _, pos_rank = parse_position_rank(player.pos_rank or '')
+            row.ranks[source] = SourceRank(player.rank, pos_rank)
+            # FantasyPros names and teams are the display values (Flock may lag on trades)
+            row.name = player.name
+            row.team = player.team or row.team
+            row.bye = _to_int(player.bye) or row.bye
+            row.opponent = player.opponent or row.opponent
+            if player.player_id is not None:
+                row.fantasypros_id = player.player_id
+                self.by_fantasypros_id[player.player_id] = row.key
+
+    def add_tiers(self, players: Iterable[PlayerRanking], tiers: Iterable[int]) -> None:
+        """Tier per FantasyPros player (from lib.tiers.ranking_tiers); adds the 'tier' column."""
+        self.tiered = True
+        for player, tier in zip(players, tiers):
+            row = self.players.get(canonical_key(player.name, player.position or '', player.team))
+            if row is not None:
+                row.tier = int(tier) or None
+
+    def add_ownership(self, ownership: 'Ownership') -> None:
+        """Owner label per league for every row; rows without a FantasyPros ID get blank owners."""
+        self.ownership = ownership
+        for row in self.players.values():
+            row.owners = ownership.labels(row.fantasypros_id)
+
+    def rows(self, available_only: bool = False) -> List[PlayerRow]:
+        """Rows by rank; available_only keeps players unrostered in at least one league."""
+        rows = self.players.values()
+        if available_only and self.ownership is not None:
+            rows = [
+                row for row in rows
+                if row.fantasypros_id is not None and self.ownership.is_available(row.fantasypros_id)
+            ]
+        return sorted(rows, key=lambda row: (row.sort_rank(), row.key))
+
+    def headers(self) -> List[str]:
+        owner_headers = self.ownership.column_headers() if self.ownership is not None else []
+        return LEADING_HEADERS + (['tier'] if self.tiered else []) + owner_headers + TRAILING_HEADERS
+
+    def table(self, available_only: bool = False) -> List[List[Any]]:
+        """Header row plus one row of values per player (None for unknown cells)."""
+        return [self.headers()] + [row.values(self.tiered) for row in self.rows(available_only)]
+
+
+def _format_tsv_value(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def table_to_tsv(table: List[List[Any]]) -> str:
+    return '\n'.join('\t'.join(_format_tsv_value(value) for value in row) for row in table) + '\n'
+
+
+def table_to_rows(table: List[List[Any]]) -> List[Dict[str, Any]]:
+    """Cells for a single updateCells request: numbers as numbers, unknown cells blank."""
+    rows = []
+    for values in table:
+        cells = []
+        for value in values:
+            if value is None:
+                # No value clears the cell (fields=userEnteredValue)
+                cells.append({})
+            elif isinstance(value, (int, float)):
+                cells.append({'userEnteredValue': {'numberValue': value}})
+            else:
+                cells.append({'userEnteredValue': {'stringValue': str(value)}})
+        rows.append({'values': cells})
+    return rows
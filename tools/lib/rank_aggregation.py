@@ -0,0 +1,182 @@
+"""ABOUTME: Blends N ranking sources per position pool: weighted Borda, weighted median rank and a Kemeny local search.
+ABOUTME: Sources are columns of a players x sources rank matrix (the player master is the crosswalk), all in NumPy."""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lib.player_master import SOURCES, PlayerMaster, PlayerRow
+
+METHODS = ['borda', 'median', 'kemeny']
+DEFAULT_METHOD = 'kemeny'
+
+
+def pool_ranks(ranks: np.ndarray, groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Re-rank each source within each pool: 1..n over the players it ranks there (NaN elsewhere).
+
+    Returns (ranks, counts) where counts[i, s] is how many players source s ranks in player i's pool.
+    Sources rank against their own full lists, so a pool can skip numbers; ordinals make them comparable.
+    """
+    sources = ranks.shape[1]
+    ordinals = np.full(ranks.shape, np.nan)
+    counts = np.zeros(ranks.shape, dtype=int)
+    _, group_index = np.unique(groups, return_inverse=True)
+    for source in range(sources):
+        column = ranks[:, source]
+        ranked = np.flatnonzero(~np.isnan(column))
+        if not len(ranked):
+            continue
+        order = ranked[np.lexsort((column[ranked], group_index[ranked]))]
+        sorted_groups = group_index[order]
+        starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        sizes = np.diff(np.r_[starts, len(order)])
+        ordinals[order, source] = np.arange(len(order)) - np.repeat(starts, sizes) + 1
+        pool_sizes = np.bincount(group_index[ranked], minlength=group_index.max() + 1)
+        counts[:, source] = pool_sizes[group_index]
+    return ordinals, counts
+
+
+def borda_scores(ordinals: np.ndarray, counts: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted Borda score in [0, 1]: each source gives (n - rank + 1) / n, unranked players get 0."""
+    points = np.where(np.isnan(ordinals), 0.0, (counts - np.nan_to_num(ordinals) + 1) / np.maximum(counts, 1))
+    return points @ weights / weights.sum()
+
+
+def weighted_median(ordinals: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Lower weighted median of each row's available ranks (NaN when no source ranks the player)."""
+    weight_matrix = np.where(np.isnan(ordinals), 0.0, weights[None, :])
+    order = np.argsort(ordinals, axis=1)  # NaN sorts last
+    sorted_ranks = np.take_along_axis(ordinals, order, axis=1)
+    cumulative = np.cumsum(np.take_along_axis(weight_matrix, order, axis=1), axis=1)
+    total = cumulative[:, -1]
+    pick = np.argmax(cumulative >= total[:, None] / 2, axis=1)
+    median = sorted_ranks[np.arange(len(ordinals)), pick]
+    return np.where(total > 0, median, np.nan)
+
+
+def _pairwise_support(ordinals: np.ndarray, weights: np.ndarray, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Weight of sources ranking first[k] above second[k] (ranked beats unranked)."""
+    a = np.where(np.isnan(ordinals[first]), np.inf, ordinals[first])
+    b = np.where(np.isnan(ordinals[second]), np.inf, ordinals[second])
+    return (a < b) @ weights
+
+
+def kemeny_refine(
+    order: np.ndarray,
+    groups: np.ndarray,
+    ordinals: np.ndarray,
+    weights: np.ndarray,
+    max_passes: Optional[int] = None
+) -> Tuple[np.ndarray, int]:
+    """Local Kemeny search from a starting order: swap adjacent players whenever more source weight
+    prefers the lower one, until no adjacent pair disagrees with the sources (a locally Kemeny-optimal
+    ranking). Odd-even transposition passes swap disjoint pairs at once across every pool.
+
+    order lists player indices grouped by pool (pools contiguous). Returns (order, swaps made).
+    """
+    order = order.copy()
+    count = len(order)
+    max_passes = max_passes or 2 * count
+    swaps = 0
+    quiet = 0
+    for step in range(max_passes):
+        left = np.arange(step % 2, count - 1, 2)
+        left = left[groups[order[left]] == groups[order[left + 1]]]
+        first, second = order[left], order[left + 1]
+        flip = _pairwise_support(ordinals, weights, second, first) > _pairwise_support(ordinals, weights, first, second)
+        if flip.any():
+            order[left[flip]], order[left[flip] + 1] = second[flip], first[flip]
+            swaps += int(flip.sum())
+            quiet = 0
+        else:
+            quiet += 1
+            if quiet == 2:
+                break
+    return order, swaps
+
+
+def positions_of(order: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """1-based position of each player within its pool, for an order with contiguous pools."""
+    sorted_groups = groups[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    within = np.empty(len(order), dtype=int)
+    within[order] = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)])) + 1
+    return within
+
+
+def aggregate(ranks: np.ndarray, groups: np.ndarray, weights: Sequence[float]) -> Dict[str, Any]:
+    """Blend a players x sources rank matrix per pool (groups); every result is aligned with the rows.
+
+    Keys: borda (score), median (weighted median rank), borda_rank, median_rank, kemeny_rank, and
+    swaps (how many adjacent swaps the Kemeny search made).
+    Borda orders ties by median; median orders ties by Borda; Kemeny starts from the Borda order.
+    """
+    weights = np.asarray(weights, dtype=float)
+    groups = np.asarray(groups)
+    ordinals, counts = pool_ranks(ranks, groups)
+    borda = borda_scores(ordinals, counts, weights)
+    median = weighted_median(ordinals, weights)
+    median_key = np.nan_to_num(median, nan=np.inf)
+
+    borda_order = np.lexsort((median_key, -borda, groups))
+    median_order = np.lexsort((-borda, median_key, groups))
+    kemeny_order, swaps = kemeny_refine(borda_order, groups, ordinals, weights)
+    return {
+        'borda': borda,
+        'median': median,
+        'borda_rank': positions_of(borda_order, groups),
+        'median_rank': positions_of(median_order, groups),
+        'kemeny_rank': positions_of(kemeny_order, groups),
+        'swaps': swaps,
+    }
+
+
+def master_rank_matrix(rows: List[PlayerRow], sources: Sequence[str]) -> np.ndarray:
+    """Positional rank of every row in each source (NaN where the source does not rank the player)."""
+    ranks = np.full((len(rows), len(sources)), np.nan)
+    for index, row in enumerate(rows):
+        for column, source in enumerate(sources):
+            rank = row.ranks.get(source)
+            if rank is not None and rank.pos_rank is not None:
+                ranks[index, column] = rank.pos_rank
+    return ranks
+
+
+def blend_table(
+    master: PlayerMaster,
+    weights: Dict[str, float],
+    method: str = DEFAULT_METHOD,
+    week: Optional[int] = None
+) -> Tuple[List[List[Any]], int]:
+    """Blended positional ranking for every position pool in the player master.
+
+    weights maps source IDs (lib.player_master.SOURCES) to weights; sources weighted 0 are left out.
+    Returns (table, Kemeny swaps): a header row plus one row per player, by position then blended rank.
+    """
+    sources = [source for source, _ in SOURCES if weights.get(source, 0) > 0]
+    if not sources:
+        raise RuntimeError('Rank blending needs at least one source with a positive weight')
+    labels = dict(SOURCES)
+    rows = [
+        row for row in master.players.values()
+        if row.position and any(source in row.ranks for source in sources)
+    ]
+    ranks = master_rank_matrix(rows, sources)
+    result = aggregate(ranks, np.array([row.position for row in rows], dtype=str), [weights[source] for source in sources])
+    final = result[f'{method}_rank']
+
+    headers = ['wk', 'pos', 'rk', 'key', 'player', 'tm'] + [f'{labels[source]} pos rk' for source in sources]
+    headers += ['borda', 'median rk', 'borda rk', 'kemeny rk']
+    table: List[List[Any]] = [headers]
+    for index in sorted(range(len(rows)), key=lambda index: (rows[index].position, final[index])):
+        row = rows[index]
+        values: List[Any] = [week, row.position, int(final[index]), row.key, row.name, row.team]
+        values += [None if np.isnan(rank) else int(rank) for rank in ranks[index]]
+        median = result['median'][index]
+        values += [
+            round(float(result['borda'][index]), 3),
+            None if np.isnan(median) else float(median),
+            int(result['borda_rank'][index]),
+            int(result['kemeny_rank'][index]),
+        ]
+        table.append(values)
+    return table, result['swaps']
@@ -0,0 +1,108 @@
+"""ABOUTME: Hidden, pre-formatted template tabs for report tools.
+ABOUTME: New tabs are created with one server-side duplicateSheet instead of re-applying formatting."""
+import secrets
+from typing import Any, Callable, Dict, List
+
+from googleapiclient.errors import HttpError
+from lib.tracing import traced
+
+
+@traced()
+def get_tab_properties(sheets_service, sheet_id: str) -> Dict[str, Dict[str, Any]]:
+    """Return {title: properties} for every tab (sheetId, title, index, hidden) in one read."""
+    try:
+        spreadsheet = sheets_service.spreadsheets().get(
+            spreadsheetId=sheet_id,
+            fields='sheets(properties(sheetId,title,index,hidden))'
+        ).execute()
+    except HttpError as err:
+        raise RuntimeError(
+            f"Unable to read Google Sheet '{sheet_id}'. Status: {err.resp.status}"
+        ) from err
+
+    tabs: Dict[str, Dict[str, Any]] = {}
+    for sheet in spreadsheet.get('sheets', []):
+        props = sheet.get('properties', {})
+        tabs[props.get('title')] = props
+    return tabs
+
+
+def unused_tab_id(tabs: Dict[str, Dict[str, Any]]) -> int:
+    """Pick a sheetId that is not in use, so later requests in the same batch can reference it."""
+    used = {props.get('sheetId') for props in tabs.values()}
+    while True:
+        candidate = secrets.randbelow(2**31 - 2) + 1
+        if candidate not in used:
+            return candidate
+
+
+def create_template_requests(
+    template_id: int,
+    template_title: str,
+    format_requests: List[Dict[str, Any]],
+    row_count: int = 2,
+    column_count: int = 2
+) -> List[Dict[str, Any]]:
+    """Add a hidden template tab and apply the report's formatting to it."""
+    requests: List[Dict[str, Any]] = [{
+        'addSheet': {
+            'properties': {
+                'sheetId': template_id,
+                'title': template_title,
+                'hidden': True,
+                'gridProperties': {
+                    'rowCount': row_count,
+                    'columnCount': column_count
+                }
+            }
+        }
+    }]
+    requests.extend(format_requests)
+    return requests
+
+
+def tab_from_template_requests(
+    tabs: Dict[str, Dict[str, Any]],
+    template_title: str,
+    template_format_requests: Callable[[int], List[Dict[str, Any]]],
+    tab_id: int,
+    tab_title: str
+) -> List[Dict[str, Any]]:
+    """Requests that create tab_title as a visible copy of the template.
+
+    When the template does not exist yet it is created (hidden, formatted via
+    template_format_requests(template_id)) earlier in the same batch, so first use costs
+    no extra round trip.
+    """
+    requests: List[Dict[str, Any]] = []
+
+    template = tabs.get(template_title)
+    if template is None:
+        template_id = unused_tab_id(tabs)
+        while template_id == tab_id:
+            template_id = unused_tab_id(tabs)
+        requests.extend(create_template_requests(template_id, template_title, template_format_requests(template_id)))
+        insert_index = len(tabs) + 1
+    else:
+        template_id = template['sheetId']
+        insert_index = len(tabs)
+
+    requests.append({
+        'duplicateSheet': {
+            'sourceSheetId': template_id,
+            'insertSheetIndex': insert_index,
+            'newSheetId': tab_id,
+            'newSheetName': tab_title
+        }
+    })
+    # Duplicates inherit the template's hidden flag
+    requests.append({
+        'updateSheetProperties': {
+            'properties': {
+                'sheetId': tab_id,
+                'hidden': False
+            },
+            'fields': 'hidden'
+        }
+    })
+    return requests
@@ -3,8 +3,187 @@ ABOUTME: Functions for managing Google Sheets tabs and grids."""
 from typing import Any, Dict, List, Optional, Tuple
 
 from googleapiclient.errors import HttpError
+from lib.tracing import traced
 
 
+def column_index_to_letter(col_idx: int) -> str:
+    """Convert a 0-indexed column to its A1 letters (0 = A, 25 = Z, 26 = AA, 702 = AAA)."""
+    letters = ''
+    col_idx += 1
+    while col_idx > 0:
+        col_idx, remainder = divmod(col_idx - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def column_letter_to_index(letters: str) -> int:
+    """Convert A1 column letters to a 0-indexed column (A = 0, Z = 25, AA = 26); inverse of column_index_to_letter."""
+    col_idx = 0
+    for letter in letters.upper():
+        col_idx = col_idx * 26 + ord(letter) - 64
+    return col_idx - 1
+
+
+def format_rectangles(format_ids: List[List[int]]) -> List[Tuple[int, int, int, int, int]]:
+    """Cover a grid of format ids with rectangles of one format each.
+
+    Each row is split into runs of equal ids; a run continues the rectangle above it when the
+    columns and id match. Returns (row_start, row_end, col_start, col_end, format_id) with
+    exclusive ends.
+    """
+    rectangles: List[Tuple[int, int, int, int, int]] = []
+    open_rects: Dict[Tuple[int, int, int], int] = {}  # (col_start, col_end, format_id) -> row_start
+
+    for row_idx, row in enumerate(format_ids):
+        runs = set()
+        col_start = 0
+        for col_idx in range(1, len(row) + 1):
+            if col_idx == len(row) or row[col_idx] != row[col_start]:
+                runs.add((col_start, col_idx, row[col_start]))
+                col_start = col_idx
+
+        for run in list(open_rects):
+            if run not in runs:
+                rectangles.append((open_rects.pop(run), row_idx, run[0], run[1], run[2]))
+        for run in runs:
+            open_rects.setdefault(run, row_idx)
+
+    for run, row_start in open_rects.items():
+        rectangles.append((row_start, len(format_ids), run[0], run[1], run[2]))
+
+    return rectangles
+
+
+# Single-row probes per range per batchGet while narrowing down the last row
+PROBES_PER_STEP = 4
+
+
+def _row_has_content(value_range: Dict[str, Any]) -> bool:
+    return any(cell and str(cell).strip() for row in value_range.get('values', []) for cell in row)
+
+
+def tab_row_counts(sheets_service, sheet_id: str) -> Dict[str, int]:
+    """{tab title: gridProperties.rowCount} for every tab, in one field-masked read."""
+    try:
+        spreadsheet = sheets_service.spreadsheets().get(
+            spreadsheetId=sheet_id,
+            fields='sheets(properties(title,gridProperties(rowCount)))'
+        ).execute()
+    except HttpError as err:
+        raise RuntimeError(
+            f"Unable to read Google Sheet '{sheet_id}'. Status: {err.resp.status}"
+        ) from err
+    return {
+        sheet['properties'].get('title'): sheet['properties'].get('gridProperties', {}).get('rowCount', 1000)
+        for sheet in spreadsheet.get('sheets', [])
+        if 'properties' in sheet
+    }
+
+
+@traced()
+def find_last_rows_by_probing(
+    sheets_service,
+    sheet_id: str,
+    blocks: List[Tuple[str, int, int, int]],
+    max_rows: int = 1000,
+    probes_per_step: int = PROBES_PER_STEP,
+    row_counts: Optional[Dict[str, int]] = None
+) -> List[int]:
+    """Find the last row with data in several column blocks by probing single rows instead of reading them whole.
+
+    blocks are (tab_name, start_row, start_col, num_cols) with start_row 1-indexed and start_col 0-indexed.
+    The first batchGet probes rows at offsets 0, 1, 3, 7, 15, ... from start_row. Later batchGets
+    probe probes_per_step evenly spaced rows between the last non-empty and first empty probe, for every
+    block at once. That is O(log max_rows) rows transferred per block instead of max_rows. Assumes the
+    data is contiguous (a fully blank row inside the data can end the search early).
+
+    A row past the tab's grid is an error rather than an empty row, so each block's window stops at
+    the grid's last row. row_counts maps tab names to gridProperties.rowCount; tabs missing from it
+    are looked up with one extra read.
+    Returns the last row (1-indexed) per block, or start_row - 1 if the block is empty.
+    """
+    row_counts = dict(row_counts or {})
+    if any(block[0] not in row_counts for block in blocks):
+        row_counts = {**tab_row_counts(sheets_service, sheet_id), **row_counts}
+
+    def probe(requests: List[Tuple[int, int]]) -> List[bool]:
+        ranges = []
+        for index, offset in requests:
+            tab_name, start_row, start_col, num_cols = blocks[index]
+            row = start_row + offset
+            ranges.append(
+                f"'{tab_name}'!{column_index_to_letter(start_col)}{row}:"
+                f"{column_index_to_letter(start_col + num_cols - 1)}{row}"
+            )
+        try:
+            result = sheets_service.spreadsheets().values().batchGet(
+                spreadsheetId=sheet_id,
+                ranges=ranges,
+                majorDimension='ROWS',
+                fields='valueRanges(values)'
+            ).execute()
+        except HttpError as err:
+            raise RuntimeError(
+                f"Unable to probe rows in sheet '{sheet_id}'. Status: {err.resp.status}"
+            ) from err
+        value_ranges = result.get('valueRanges', [])
+        return [_row_has_content(value_ranges[i]) if i < len(value_ranges) else False for i in range(len(ranges))]
+
+    # last known non-empty offset (-1: none) and first known empty offset (the window size: past the window)
+    lows = [-1] * len(blocks)
+    highs = [
+        max(0, min(max_rows, row_counts.get(tab_name, 0) - start_row + 1))
+        for tab_name, start_row, _, _ in blocks
+    ]
+
+    requests = []
+    for index in range(len(blocks)):
+        offset = 0
+        while offset < highs[index]:
+            requests.append((index, offset))
+            offset = offset * 2 + 1
+
+    while requests:
+        results = probe(requests)
+        for (index, offset), has_content in zip(requests, results):
+            if has_content:
+                lows[index] = max(lows[index], offset)
+        for (index, offset), has_content in zip(requests, results):
+            if not has_content and lows[index] < offset < highs[index]:
+                highs[index] = offset
+
+        # Next step: evenly spaced probes strictly between each block's bounds
+        requests = []
+        for index in range(len(blocks)):
+            unprobed = highs[index] - lows[index] - 1
+            count = min(probes_per_step, unprobed)
+            for k in range(1, count + 1):
+                requests.append((index, lows[index] + (unprobed + 1) * k // (count + 1)))
+
+    return [block[1] + low for block, low in zip(blocks, lows)]
+
+
+def find_last_row_by_probing(
+    sheets_service,
+    sheet_id: str,
+    tab_name: str,
+    start_row: int,
+    start_col: int,
+    num_cols: int,
+    max_rows: int = 1000,
+    row_count: Optional[int] = None
+) -> int:
+    """find_last_rows_by_probing for a single block (start_col 0-indexed; row_count is the tab's, if known)."""
+    return find_last_rows_by_probing(
+        sheets_service,
+        sheet_id,
+        [(tab_name, start_row, start_col, num_cols)],
+        max_rows,
+        row_counts={tab_name: row_count} if row_count is not None else None
+    )[0]
+
+
+@traced()
 def ensure_grid_with_boundary(sheets_service, sheet_id: str, tab_id: int, data_rows: int, data_cols: int, minimize_a1: bool = False, minimize_boundary: bool = True) -> None:
     """Ensure grid has at least (data_rows + 1) x (data_cols + 1) dimensions.
     
@@ -144,6 +323,7 @@ def ensure_grid_with_boundary(sheets_service, sheet_id: str, tab_id: int, data_r
             ) from err
 
 
+@traced()
 def auto_resize_rows(sheets_service, sheet_id: str, tab_id: int, start_row: int, end_row: int) -> None:
     """Auto-resize specific rows in a tab.
     
@@ -169,6 +349,7 @@ def auto_resize_rows(sheets_service, sheet_id: str, tab_id: int, start_row: int,
     ).execute()
 
 
+@traced()
 def clear_cells_in_range(
     sheets_service,
     sheet_id: str,
@@ -238,6 +419,7 @@ def clear_cells_in_range(
     ).execute()
 
 
+@traced()
 def auto_resize_columns(sheets_service, sheet_id: str, tab_id: int, start_col: int, end_col: int) -> None:
     """Auto-resize specific columns in a tab using Google Sheets autoResizeDimensions API.
     
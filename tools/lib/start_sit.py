@@ -0,0 +1,235 @@
+"""ABOUTME: Monte Carlo start/sit: weekly point distributions from FantasyPros projections (r2p_pts) and rank spread.
+ABOUTME: Samples players x simulations in NumPy batches and fills the league's lineup slots for every simulation at once."""
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from lib.fantasypros import POSITIONS, PlayerRanking, Rankings
+from lib.tracing import traced
+
+# Roster slot spellings -> FantasyPros positions ('WR/RB/TE', 'W/R/T', 'Q/W/R/T', 'D/ST', ...)
+SLOT_ALIASES = {'Q': 'QB', 'R': 'RB', 'W': 'WR', 'T': 'TE', 'D': 'DST', 'DEF': 'DST', 'D/ST': 'DST', 'PK': 'K'}
+BENCH_SLOTS = {'BN', 'BE', 'IR', 'RES', 'NA'}
+# Week-to-week scoring noise around the projection, as a fraction of it. The rank spread only covers
+# expert disagreement, which is far narrower than what actually happens on Sunday.
+OUTCOME_CV = {'QB': 0.35, 'RB': 0.5, 'WR': 0.6, 'TE': 0.65, 'K': 0.45, 'DST': 0.7}
+DEFAULT_SIMULATIONS = 100_000
+# Simulations per batch: bounds the players x batch temporaries while keeping each batch one array op
+BATCH_SIZE = 25_000
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+@dataclass(frozen=True)
+class LineupSlot:
+    label: str
+    positions: FrozenSet[str]
+
+
+def parse_lineup_slots(positions: str) -> List[LineupSlot]:
+    """League 'positions' string from the roster JSON -> starting slots (bench and IR left out).
+
+    'QB,RB,RB,WR,WR,TE,WR/RB/TE,DST,K,BN' -> QB, RB, RB, WR, WR, TE, {WR, RB, TE}, DST, K.
+    """
+    slots = []
+    for label in (positions or '').split(','):
+        label = label.strip().upper()
+        if not label or label in BENCH_SLOTS:
+            continue
+        parts = [label] if label in SLOT_ALIASES or label in POSITIONS else label.split('/')
+        eligible = frozenset(SLOT_ALIASES.get(part, part) for part in parts)
+        unknown = eligible - set(POSITIONS)
+        if unknown:
+            raise RuntimeError(f"Unknown lineup slot '{label}' ({', '.join(sorted(unknown))})")
+        slots.append(LineupSlot(label, eligible))
+    if not slots:
+        raise RuntimeError(f"No starting lineup slots in '{positions}'")
+    return slots
+
+
+def projection_curves(rankings: Iterable[Rankings]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Per position: (average ranks, projected points) of every projected player, points non-increasing in rank.
+
+    Maps a sampled rank to points, so a rank move is worth what the projections say that rank is worth.
+    """
+    curves = {}
+    for ranking in rankings:
+        players = [
+            player for player in ranking.players
+            if player.projected_points is not None and player.position
+        ]
+        if not players:
+            continue
+        ranks = np.array([player.rank_ave if player.rank_ave is not None else player.rank for player in players], dtype=float)
+        points = np.array([player.projected_points for player in players], dtype=float)
+        order = np.argsort(ranks, kind='stable')
+        curves[players[0].position] = (ranks[order], np.minimum.accumulate(points[order]))
+    return curves
+
+
+@dataclass
+class StartSitResult:
+    simulations: int
+    players: List[PlayerRanking]
+    slots: List[LineupSlot]
+    # Recommended (highest projection) lineup: player index per slot, -1 when no eligible player
+    lineup: List[int]
+    # Per player, over all simulations
+    mean_points: np.ndarray
+    std_points: np.ndarray
+    start_rate: np.ndarray
+    # Totals: recommended lineup as set, and the best lineup in hindsight
+    lineup_points: np.ndarray
+    optimal_points: np.ndarray
+    # Per slot: best bench alternative (-1 if none) and how often it outscores the starter
+    alternatives: List[int] = field(default_factory=list)
+    alternative_wins: List[float] = field(default_factory=list)
+
+    def distribution(self, totals: np.ndarray) -> Dict[str, float]:
+        summary = {'mean': float(totals.mean()), 'std': float(totals.std())}
+        summary.update({f'p{pct}': float(value) for pct, value in zip(PERCENTILES, np.percentile(totals, PERCENTILES))})
+        return summary
+
+
+class StartSitSimulator:
+    """Weekly outcome model for a roster, sampled for every player and simulation at once.
+
+    Each player's week is drawn in two steps:
+    1. A rank is drawn from N(rank_ave, rank_std), clipped to the experts' [rank_min, rank_max]. The
+       projection moves by the difference in projected points between that rank and rank_ave on the
+       position's projection curve.
+    2. The week's score is drawn as that mean x (1 + OUTCOME_CV[position] x N(0, 1)), floored at 0.
+    """
+
+    def __init__(
+        self,
+        players: List[PlayerRanking],
+        curves: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        slots: List[LineupSlot],
+        outcome_cv: Optional[Dict[str, float]] = None
+    ):
+        self.players = players
+        self.curves = curves
+        self.slots = slots
+        outcome_cv = outcome_cv or OUTCOME_CV
+
+        self.positions = np.array([player.position or '' for player in players], dtype=str)
+        self.projection = np.array([player.projected_points or 0.0 for player in players], dtype=float)
+        self.rank_ave = np.array([
+            player.rank_ave if player.rank_ave is not None else player.rank for player in players
+        ], dtype=float)
+        self.rank_std = np.array([player.rank_std or 0.0 for player in players], dtype=float)
+        self.rank_min = np.array([
+            player.rank_min if player.rank_min is not None else -np.inf for player in players
+        ], dtype=float)
+        self.rank_max = np.array([
+            player.rank_max if player.rank_max is not None else np.inf for player in players
+        ], dtype=float)
+        self.cv = np.array([outcome_cv.get(position, 0.5) for position in self.positions], dtype=float)
+        self.eligible = np.array([[player.position in slot.positions for player in players] for slot in slots], dtype=bool)
+        # Most restrictive slots fill first, so flex slots take whoever the dedicated slots leave
+        self.fill_order = sorted(range(len(slots)), key=lambda index: len(slots[index].positions))
+
+    def sample(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """Points for every player (rows) in count simulated weeks (columns)."""
+        ranks = self.rank_ave[:, None] + self.rank_std[:, None] * rng.standard_normal((len(self.players), count))
+        ranks = np.clip(ranks, self.rank_min[:, None], self.rank_max[:, None])
+        means = np.repeat(self.projection[:, None], count, axis=1)
+        for position, (curve_ranks, curve_points) in self.curves.items():
+            rows = np.flatnonzero(self.positions == position)
+            if len(rows):
+                shift = np.interp(ranks[rows], curve_ranks, curve_points) - np.interp(self.rank_ave[rows], curve_ranks, curve_points)[:, None]
+                means[rows] += shift
+        points = means * (1 + self.cv[:, None] * rng.standard_normal(means.shape))
+        return np.maximum(points, 0.0)
+
+    def fill_lineup(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Best lineup for each column of points: (player index per slot x column, -1 if unfilled; totals).
+
+        Slot by slot (most restrictive first), each column takes its highest-scoring eligible player left.
+        """
+        count = points.shape[1]
+        columns = np.arange(count)
+        taken = np.zeros(points.shape, dtype=bool)
+        chosen = np.full((len(self.slots), count), -1, dtype=int)
+        totals = np.zeros(count)
+        for slot in self.fill_order:
+            candidates = np.where(self.eligible[slot][:, None] & ~taken, points, -np.inf)
+            pick = np.argmax(candidates, axis=0)
+            filled = np.isfinite(candidates[pick, columns])
+            taken[pick[filled], columns[filled]] = True
+            chosen[slot, filled] = pick[filled]
+            totals += np.where(filled, candidates[pick, columns], 0.0)
+        return chosen, totals
+
+    @traced('start_sit.simulate')
+    def run(self, simulations: int = DEFAULT_SIMULATIONS, seed: Optional[int] = None, batch_size: int = BATCH_SIZE) -> StartSitResult:
+        rng = np.random.default_rng(seed)
+        lineup = self.fill_lineup(self.projection[:, None])[0][:, 0]
+        starters = lineup[lineup >= 0]
+        bench = np.setdiff1d(np.arange(len(self.players)), starters)
+
+        # Best bench player by projection for each slot (the start/sit question that slot poses)
+        alternatives = []
+        for slot, starter in enumerate(lineup):
+            options = bench[self.eligible[slot][bench]]
+            alternatives.append(int(options[np.argmax(self.projection[options])]) if len(options) and starter >= 0 else -1)
+        pairs = [(slot, lineup[slot], alt) for slot, alt in enumerate(alternatives) if alt >= 0]
+
+        sums = np.zeros(len(self.players))
+        squares = np.zeros(len(self.players))
+        starts = np.zeros(len(self.players))
+        wins = np.zeros(len(pairs))
+        lineup_points = []
+        optimal_points = []
+        for done in range(0, simulations, batch_size):
+            count = min(batch_size, simulations - done)
+            points = self.sample(count, rng)
+            sums += points.sum(axis=1)
+            squares += (points ** 2).sum(axis=1)
+            chosen, optimal = self.fill_lineup(points)
+            starts += np.bincount(chosen[chosen >= 0], minlength=len(self.players))
+            optimal_points.append(optimal)
+            lineup_points.append(points[starters].sum(axis=0))
+            if pairs:
+                starter_rows = np.array([starter for _, starter, _ in pairs])
+                alternative_rows = np.array([alt for _, _, alt in pairs])
+                wins += (points[alternative_rows] > points[starter_rows]).sum(axis=1)
+
+        mean = sums / simulations
+        alternative_wins = [0.0] * len(self.slots)
+        for (slot, _, _), won in zip(pairs, wins):
+            alternative_wins[slot] = float(won / simulations)
+        return StartSitResult(
+            simulations=simulations,
+            players=self.players,
+            slots=self.slots,
+            lineup=[int(index) for index in lineup],
+            mean_points=mean,
+            std_points=np.sqrt(np.maximum(squares / simulations - mean ** 2, 0.0)),
+            start_rate=starts / simulations,
+            lineup_points=np.concatenate(lineup_points),
+            optimal_points=np.concatenate(optimal_points),
+            alternatives=alternatives,
+            alternative_wins=alternative_wins,
+        )
+
+
+def roster_players(
+    roster: Dict[str, Any],
+    rankings: Iterable[Rankings],
+    team_id: Optional[str] = None
+) -> Tuple[str, List[PlayerRanking], List[int]]:
+    """(team name, weekly-ranked players, player IDs with no weekly ranking) for a team in a roster JSON.
+
+    team_id defaults to the roster's own team (teamId).
+    """
+    team_id = str(team_id or roster.get('teamId'))
+    team = next((team for team in roster.get('teams') or [] if str(team.get('id')) == team_id), None)
+    if team is None:
+        raise RuntimeError(f"Team '{team_id}' is not in the league roster")
+    by_id = {player.player_id: player for ranking in rankings for player in ranking.players if player.player_id is not None}
+    player_ids = [int(player_id) for player_id in team.get('players') or []]
+    ranked = [by_id[player_id] for player_id in player_ids if player_id in by_id]
+    missing = [player_id for player_id in player_ids if player_id not in by_id]
+    return team.get('name') or f'team {team_id}', ranked, missing
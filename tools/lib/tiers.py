@@ -0,0 +1,75 @@
+"""ABOUTME: Automatic tiers per position from average rank and its dispersion, by vectorized gap detection.
+ABOUTME: Shared by the FantasyPros dump, the Flock consensus TSV and the player master so every source tiers alike."""
+from typing import Optional, Sequence
+
+import numpy as np
+
+from lib.fantasypros import PlayerRanking
+
+# A new tier starts where the jump in average rank exceeds this many (mean) rank std devs
+DEFAULT_GAP_THRESHOLD = 1.0
+# Std dev floor in ranks, so unanimous players (std 0) or single-expert rows still need a real gap
+MIN_STD = 1.0
+# Positions get at least ceil(players / MAX_TIER_SIZE) tiers, split at their largest gaps
+MAX_TIER_SIZE = 12
+
+
+def assign_tiers(
+    avg: np.ndarray,
+    std: Optional[np.ndarray] = None,
+    groups: Optional[np.ndarray] = None,
+    threshold: float = DEFAULT_GAP_THRESHOLD,
+    min_std: float = MIN_STD,
+    max_tier_size: int = MAX_TIER_SIZE
+) -> np.ndarray:
+    """1-based tier of each player within its group (position), 0 where avg is NaN.
+
+    Players are sorted by average rank within each group; a tier breaks between neighbours whose
+    average ranks differ by more than threshold x the mean of their std devs (each floored at
+    min_std). Experts rarely separate the tail of a position that clearly (its std devs are wide),
+    so each group also breaks at its largest raw gaps in average rank, which sit in that tail, until
+    it has at least ceil(size / max_tier_size) tiers. Sorts plus whole-array comparisons, so every
+    position tiers in a single pass.
+    """
+    avg = np.asarray(avg, dtype=float)
+    count = len(avg)
+    std = np.zeros(count) if std is None else np.nan_to_num(np.asarray(std, dtype=float), nan=0.0)
+    groups = np.zeros(count, dtype=int) if groups is None else np.asarray(groups)
+    tiers = np.zeros(count, dtype=int)
+
+    ranked = np.flatnonzero(~np.isnan(avg))
+    if not len(ranked):
+        return tiers
+    order = ranked[np.lexsort((avg[ranked], groups[ranked]))]
+    sorted_avg = avg[order]
+    sorted_groups = groups[order]
+    spread = np.maximum(std[order], min_std)
+
+    new_group = np.r_[True, sorted_groups[1:] != sorted_groups[:-1]]
+    # Gap to the previous player (-inf at group starts, which always break), raw and in std devs
+    gap = np.r_[-np.inf, np.diff(sorted_avg)]
+    gap[new_group] = -np.inf
+    score = gap / np.r_[1.0, (spread[1:] + spread[:-1]) / 2]
+
+    # Largest-gap breaks: rank each position's gaps (descending) and keep the top ceil(size / max) - 1
+    _, group_index, group_sizes = np.unique(sorted_groups, return_inverse=True, return_counts=True)
+    by_gap = np.lexsort((-gap, group_index))
+    starts = np.searchsorted(group_index[by_gap], np.arange(len(group_sizes)))
+    gap_rank = np.empty(len(order), dtype=int)
+    gap_rank[by_gap] = np.arange(len(order)) - starts[group_index[by_gap]] + 1
+    forced = gap_rank <= -(-group_sizes[group_index] // max_tier_size) - 1
+
+    gap_break = (score > threshold) | (forced & (gap > 0))
+    running = np.cumsum(new_group | gap_break)
+    # Restart the count at each group: subtract the running tier number of the group's first player
+    group_first = np.maximum.accumulate(np.where(new_group, running, 0))
+    tiers[order] = running - group_first + 1
+    return tiers
+
+
+def ranking_tiers(players: Sequence[PlayerRanking], threshold: float = DEFAULT_GAP_THRESHOLD) -> np.ndarray:
+    """Tiers for FantasyPros rankings per position, from rank_ave/rank_std (rank when rank_ave is missing)."""
+    avg = np.array([player.rank_ave if player.rank_ave is not None else player.rank for player in players], dtype=float)
+    std = np.array([player.rank_std if player.rank_std is not None else np.nan for player in players], dtype=float)
+    positions = np.array([player.position or '' for player in players], dtype=str)
+    return assign_tiers(avg, std, positions, threshold)
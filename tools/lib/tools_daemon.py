@@ -0,0 +1,333 @@
+"""ABOUTME: Optional local daemon that keeps Google credentials and API clients warm between tool runs.
+ABOUTME: CLIs call delegate_to_daemon() first; a running daemon forks a job with the caller's stdio, else the CLI runs in-process."""
+import json
+import os
+import runpy
+import select
+import signal
+import socket
+import struct
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+SOCKET_ENV = 'FF_TOOLS_DAEMON_SOCKET'
+# Set to run a CLI in-process even if the daemon is up
+DISABLE_ENV = 'FF_TOOLS_NO_DAEMON'
+# Set inside daemon jobs so the re-executed CLI does not delegate again
+JOB_ENV = 'FF_TOOLS_DAEMON_JOB'
+
+_HEADER = struct.Struct('>I')
+_STATUS = struct.Struct('>i')
+_STDIO_FDS = 3
+# lib modules daemon jobs keep from the daemon instead of re-importing: the warm credential and
+# discovery cache, the tracing jobs report to, and helpers that hold no module state
+_SHARED_MODULES = (
+    'lib.google_clients',
+    'lib.tracing',
+    'lib.developer_metadata',
+    'lib.sheet_templates',
+    'lib.sheets_utils',
+)
+
+
+def is_supported() -> bool:
+    """Unix sockets with fd passing (socket.send_fds, Python 3.9+ on Linux/macOS)."""
+    return hasattr(socket, 'AF_UNIX') and hasattr(socket, 'send_fds') and hasattr(os, 'fork')
+
+
+def default_socket_path() -> Path:
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    base = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'fantasy-football-tools' / 'tools-daemon.sock'
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError('connection closed')
+        data += chunk
+    return data
+
+
+def _send_message(sock: socket.socket, message: Dict[str, Any], fds: Optional[List[int]] = None) -> None:
+    body = json.dumps(message).encode('utf-8')
+    # Length prefix carries the descriptors; the body follows as plain stream data
+    if fds:
+        socket.send_fds(sock, [_HEADER.pack(len(body))], fds)
+    else:
+        sock.sendall(_HEADER.pack(len(body)))
+    sock.sendall(body)
+
+
+def _recv_message(sock: socket.socket) -> Tuple[Dict[str, Any], List[int]]:
+    header, fds, _flags, _addr = socket.recv_fds(sock, _HEADER.size, _STDIO_FDS)
+    if not header:
+        raise ConnectionError('connection closed')
+    header += _recv_exact(sock, _HEADER.size - len(header))
+    (length,) = _HEADER.unpack(header)
+    return json.loads(_recv_exact(sock, length).decode('utf-8')), fds
+
+
+def _connect(socket_path: Path) -> Optional[socket.socket]:
+    if not socket_path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def delegate_to_daemon(script_path: str) -> None:
+    """Run this CLI invocation inside the daemon if one is listening; returns only if it is not.
+
+    Call after the script's sys.path setup and before importing the Google stack. The daemon
+    job gets this process's stdin/stdout/stderr, cwd, environment and sys.path, and its exit
+    code becomes ours.
+    """
+    if os.environ.get(DISABLE_ENV) or os.environ.get(JOB_ENV) or not is_supported():
+        return
+
+    sock = _connect(default_socket_path())
+    if sock is None:
+        return
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        _send_message(sock, {
+            'command': 'run',
+            'script': str(Path(script_path).resolve()),
+            'argv': sys.argv[1:],
+            'cwd': os.getcwd(),
+            'env': dict(os.environ),
+            'sys_path': sys.path,
+        }, [0, 1, 2])
+    except OSError:
+        sock.close()
+        return  # daemon went away before taking the job: run in-process
+
+    try:
+        (status,) = _STATUS.unpack(_recv_exact(sock, _STATUS.size))
+    except KeyboardInterrupt:
+        sock.close()  # the daemon interrupts the job when the connection drops
+        raise SystemExit(130)
+    except (OSError, ConnectionError) as err:
+        print(f'Error: Lost connection to tools daemon: {err}', file=sys.stderr)
+        raise SystemExit(1)
+    finally:
+        sock.close()
+    raise SystemExit(status)
+
+
+def send_command(command: str, socket_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Send a control command ('status' or 'stop'); None if no daemon is listening."""
+    sock = _connect(socket_path or default_socket_path())
+    if sock is None:
+        return None
+    try:
+        _send_message(sock, {'command': command})
+        response, _fds = _recv_message(sock)
+        return response
+    finally:
+        sock.close()
+
+
+def _run_job(request: Dict[str, Any], fds: List[int]) -> int:
+    """Child side of a fork: adopt the client's stdio and context, then run its script as __main__."""
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    os.chdir(request['cwd'])
+    os.environ.clear()
+    os.environ.update(request['env'])
+    os.environ[JOB_ENV] = '1'
+    sys.path[:] = request['sys_path']
+    sys.argv = [request['script']] + request['argv']
+
+    # Jobs import the other lib modules fresh (no state left over from earlier jobs)
+    for name in list(sys.modules):
+        if (name == 'lib' or name.startswith('lib.')) and name not in _SHARED_MODULES:
+            del sys.modules[name]
+
+    code = 0
+    try:
+        runpy.run_path(request['script'], run_name='__main__')
+    except SystemExit as err:
+        if isinstance(err.code, int):
+            code = err.code
+        elif err.code is not None:
+            print(err.code, file=sys.stderr)
+            code = 1
+    except KeyboardInterrupt:
+        code = 130
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        # os._exit skips atexit, so close the job's trace root span here
+        tracing = sys.modules.get('lib.tracing')
+        if tracing is not None:
+            tracing.shutdown(code)
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return code
+
+
+class ToolsDaemon:
+    """Accepts jobs on a Unix socket and runs each in a forked child of the warm process.
+
+    The daemon is single-threaded: the accept loop also watches job clients and reaps finished
+    jobs, so os.fork() never copies a lock held by another thread into a job.
+    """
+
+    def __init__(self, socket_path: Path):
+        self.socket_path = Path(socket_path)
+        self.started = time.time()
+        self.jobs_started = 0
+        self.running: Dict[int, str] = {}
+        self.connections: Dict[int, socket.socket] = {}
+        self.interrupted: Set[int] = set()
+        self.stopping = False
+        self.server: Optional[socket.socket] = None
+
+    def _bind(self) -> None:
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        probe = _connect(self.socket_path)
+        if probe is not None:
+            probe.close()
+            raise RuntimeError(f'A tools daemon is already listening on {self.socket_path}')
+        if self.socket_path.exists():
+            self.socket_path.unlink()  # stale socket from a daemon that did not shut down cleanly
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        self.server.listen(16)
+
+    def _reap_jobs(self) -> None:
+        """Send each finished job's exit code to its client."""
+        while self.connections:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            code = os.waitstatus_to_exitcode(status)
+            if code < 0:
+                code = 128 - code
+            self.running.pop(pid, None)
+            self.interrupted.discard(pid)
+            conn = self.connections.pop(pid, None)
+            if conn is None:
+                continue
+            try:
+                conn.sendall(_STATUS.pack(code))
+            except OSError:
+                pass
+            conn.close()
+
+    def _poll(self, refresh, accept: bool) -> None:
+        """One turn of the loop: accept a connection (if accept), watch job clients, reap jobs."""
+        # Interrupted clients stay readable (EOF) until their job exits, so stop watching them
+        watched = {conn: pid for pid, conn in self.connections.items() if pid not in self.interrupted}
+        sockets: List[socket.socket] = list(watched)
+        if accept:
+            sockets.append(self.server)
+        readable, _, _ = select.select(sockets, [], [], 0.1)
+
+        for sock in readable:
+            if sock is self.server:
+                conn, _addr = self.server.accept()
+                self._handle(conn, refresh)
+            elif not sock.recv(1):
+                # Client went away (Ctrl-C): interrupt the job like a terminal would
+                os.kill(watched[sock], signal.SIGINT)
+                self.interrupted.add(watched[sock])
+        self._reap_jobs()
+
+    def _handle(self, conn: socket.socket, refresh) -> None:
+        try:
+            request, fds = _recv_message(conn)
+        except (OSError, ConnectionError, ValueError):
+            conn.close()
+            return
+
+        command = request.get('command')
+        if command == 'status':
+            _send_message(conn, {
+                'pid': os.getpid(),
+                'uptime_seconds': round(time.time() - self.started, 1),
+                'jobs_started': self.jobs_started,
+                'running': sorted(self.running.values()),
+            })
+            conn.close()
+            return
+        if command == 'stop':
+            self.stopping = True
+            _send_message(conn, {'stopping': True, 'running': sorted(self.running.values())})
+            conn.close()
+            return
+        if command != 'run' or len(fds) != _STDIO_FDS:
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+            return
+
+        try:
+            refresh()
+        except RuntimeError as err:
+            print(f'Warning: {err}', file=sys.stderr)
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                self.server.close()
+                conn.close()
+                code = _run_job(request, fds)
+            finally:
+                os._exit(code)
+
+        for fd in fds:
+            os.close(fd)
+        self.jobs_started += 1
+        self.running[pid] = ' '.join([Path(request['script']).name] + request['argv'])
+        self.connections[pid] = conn
+        print(f"[{time.strftime('%H:%M:%S')}] job {pid}: {self.running[pid]}", flush=True)
+
+    def serve_forever(self, refresh) -> None:
+        """Accept jobs until a 'stop' command or SIGTERM/SIGINT, then wait for running jobs."""
+        self._bind()
+
+        def request_stop(signum, frame):
+            self.stopping = True
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        print(f'Tools daemon {os.getpid()} listening on {self.socket_path}', flush=True)
+        try:
+            while not self.stopping:
+                self._poll(refresh, accept=True)
+        finally:
+            self.server.close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            while self.connections:
+                self._poll(refresh, accept=False)
+            print('Tools daemon stopped', flush=True)
@@ -0,0 +1,166 @@
+"""ABOUTME: Reads $FF_TRACE_FILE span logs and renders them as a self-contained HTML timeline.
+ABOUTME: One lane per process/thread with nested spans stacked by depth, plus a per-span-name time summary."""
+import hashlib
+import html
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROW_HEIGHT = 18
+
+
+def load_spans(trace_path: Path) -> List[Dict[str, Any]]:
+    """Every span in a trace file (skipping partial or malformed lines)."""
+    spans = []
+    try:
+        lines = Path(trace_path).read_text(encoding='utf-8').splitlines()
+    except OSError as err:
+        raise RuntimeError(f"Unable to read trace file '{trace_path}': {err}") from err
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict) and {'id', 'name', 'start', 'duration'} <= record.keys():
+            spans.append(record)
+    return spans
+
+
+def list_traces(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One summary per trace ID (runs appended to the same file), oldest first."""
+    traces: Dict[str, Dict[str, Any]] = {}
+    for record in spans:
+        trace = traces.setdefault(record.get('trace'), {'trace': record.get('trace'), 'spans': 0, 'start': record['start'], 'end': 0.0, 'root': None})
+        trace['spans'] += 1
+        trace['start'] = min(trace['start'], record['start'])
+        trace['end'] = max(trace['end'], record['start'] + record['duration'])
+        if not record.get('parent'):
+            trace['root'] = record['name']
+    return sorted(traces.values(), key=lambda trace: trace['start'])
+
+
+def select_trace(spans: List[Dict[str, Any]], trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Spans of one trace: trace_id (or a unique prefix of it), else the most recent trace."""
+    traces = list_traces(spans)
+    if not traces:
+        return []
+    if trace_id is None:
+        wanted = traces[-1]['trace']
+    else:
+        matches = [trace['trace'] for trace in traces if str(trace['trace']).startswith(trace_id)]
+        if len(matches) != 1:
+            raise RuntimeError(f"trace '{trace_id}' matches {len(matches)} traces in the file")
+        wanted = matches[0]
+    return [record for record in spans if record.get('trace') == wanted]
+
+
+def summarize(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per span name: calls, total and self seconds (total minus direct children), max; by self time."""
+    child_time: Dict[str, float] = {}
+    for record in spans:
+        if record.get('parent'):
+            child_time[record['parent']] = child_time.get(record['parent'], 0.0) + record['duration']
+
+    by_name: Dict[str, Dict[str, Any]] = {}
+    for record in spans:
+        entry = by_name.setdefault(record['name'], {'name': record['name'], 'calls': 0, 'total': 0.0, 'self': 0.0, 'max': 0.0})
+        entry['calls'] += 1
+        entry['total'] += record['duration']
+        # Children running concurrently can add up to more than their parent
+        entry['self'] += max(0.0, record['duration'] - child_time.get(record['id'], 0.0))
+        entry['max'] = max(entry['max'], record['duration'])
+    return sorted(by_name.values(), key=lambda entry: entry['self'], reverse=True)
+
+
+def _lanes(spans: List[Dict[str, Any]]) -> List[Tuple[str, List[Tuple[Dict[str, Any], int]]]]:
+    """Group spans by (pid, thread) and give each a depth counted through parents in the same lane."""
+    by_id = {record['id']: record for record in spans}
+    lanes: Dict[Tuple[Any, Any], List[Dict[str, Any]]] = {}
+    for record in spans:
+        lanes.setdefault((record.get('pid'), record.get('thread')), []).append(record)
+
+    def depth(record: Dict[str, Any]) -> int:
+        level = 0
+        lane = (record.get('pid'), record.get('thread'))
+        parent = by_id.get(record.get('parent'))
+        while parent is not None and (parent.get('pid'), parent.get('thread')) == lane:
+            level += 1
+            parent = by_id.get(parent.get('parent'))
+        return level
+
+    result = []
+    for (pid, thread), records in sorted(lanes.items(), key=lambda item: min(r['start'] for r in item[1])):
+        records.sort(key=lambda record: record['start'])
+        roots = [record['name'] for record in records if depth(record) == 0]
+        label = f"pid {pid} · {thread} · {roots[0] if roots else ''}"
+        result.append((label, [(record, depth(record)) for record in records]))
+    return result
+
+
+def _color(name: str) -> str:
+    # Same name, same color; API calls share one hue family so they stand out from local work
+    hue = int(hashlib.md5(name.encode('utf-8')).hexdigest()[:4], 16) % 360
+    if name.startswith('api '):
+        hue = 200 + hue % 40
+    return f'hsl({hue}, 60%, 72%)'
+
+
+def render_html(spans: List[Dict[str, Any]], title: str = 'Trace') -> str:
+    """Self-contained HTML page: a timeline with one lane per process/thread and a summary table."""
+    if not spans:
+        return f'<html><body><h1>{html.escape(title)}</h1><p>No spans.</p></body></html>'
+
+    t0 = min(record['start'] for record in spans)
+    total = max(record['start'] + record['duration'] for record in spans) - t0 or 1e-9
+
+    def pct(seconds: float) -> float:
+        return round(100.0 * seconds / total, 4)
+
+    parts = [
+        '<html><head><meta charset="utf-8"><title>', html.escape(title), '</title><style>',
+        'body { font-family: sans-serif; font-size: 13px; margin: 16px; }',
+        '.lane { margin: 10px 0 2px; font-weight: bold; }',
+        '.track { position: relative; border-left: 1px solid #999; border-bottom: 1px solid #eee; }',
+        '.span { position: absolute; height: 16px; overflow: hidden; white-space: nowrap; font-size: 11px;',
+        '        line-height: 16px; padding-left: 2px; box-sizing: border-box; border: 1px solid rgba(0,0,0,0.25); }',
+        '.span.error { border: 2px solid #c00; }',
+        '.axis { position: relative; height: 16px; color: #666; font-size: 11px; }',
+        '.axis span { position: absolute; }',
+        'table { border-collapse: collapse; margin-top: 24px; } th, td { border: 1px solid #ddd; padding: 4px 8px; }',
+        'td.num { text-align: right; } th { background-color: #f2f2f2; }',
+        '</style></head><body>',
+        f'<h1>{html.escape(title)}</h1>',
+        f'<p>{len(spans)} spans, {total:.3f}s. Hover a span for details.</p>',
+        '<div class="axis">',
+    ]
+    for tick in range(11):
+        parts.append(f'<span style="left: {tick * 10}%">{total * tick / 10:.2f}s</span>')
+    parts.append('</div>')
+
+    for label, records in _lanes(spans):
+        height = (max(level for _, level in records) + 1) * ROW_HEIGHT
+        parts.append(f'<div class="lane">{html.escape(label)}</div>')
+        parts.append(f'<div class="track" style="height: {height}px">')
+        for record, level in records:
+            details = [f"{record['name']}: {record['duration'] * 1000:.1f} ms"]
+            details += [f'{key}={value}' for key, value in (record.get('attrs') or {}).items()]
+            if record.get('error'):
+                details.append(f"error: {record['error']}")
+            width = max(pct(record['duration']), 0.05)
+            css = 'span error' if record.get('error') else 'span'
+            parts.append(
+                f'<div class="{css}" title="{html.escape(chr(10).join(details))}" style="left: {pct(record["start"] - t0)}%; '
+                f'width: {width}%; top: {level * ROW_HEIGHT}px; background: {_color(record["name"])}">'
+                f'{html.escape(record["name"])}</div>'
+            )
+        parts.append('</div>')
+
+    parts.append('<table><thead><tr><th>span</th><th>calls</th><th>self (s)</th><th>total (s)</th><th>max (s)</th></tr></thead><tbody>')
+    for entry in summarize(spans):
+        parts.append(
+            f"<tr><td>{html.escape(entry['name'])}</td><td class=\"num\">{entry['calls']}</td>"
+            f"<td class=\"num\">{entry['self']:.3f}</td><td class=\"num\">{entry['total']:.3f}</td>"
+            f"<td class=\"num\">{entry['max']:.3f}</td></tr>"
+        )
+    parts.append('</tbody></table></body></html>')
+    return '\n'.join(parts)
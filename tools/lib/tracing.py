@@ -0,0 +1,192 @@
+"""ABOUTME: Opt-in nested trace spans for the tools, appended as JSON lines to the file named by $FF_TRACE_FILE.
+ABOUTME: Spans carry parent IDs across threads and subprocesses; every googleapiclient request becomes a span too."""
+import atexit
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+TRACE_FILE_ENV = 'FF_TRACE_FILE'
+# "<trace id>:<span id>" of the span a subprocess was started under
+TRACE_PARENT_ENV = 'FF_TRACE_PARENT'
+
+_current: contextvars.ContextVar = contextvars.ContextVar('ff_trace_span', default=None)
+_write_lock = threading.Lock()
+_trace_path: Optional[Path] = None
+_trace_id: Optional[str] = None
+_root = None
+
+
+class Span:
+    __slots__ = ('name', 'span_id', 'parent_id', 'attrs', 'start', 'started', 'error')
+
+    def __init__(self, name: str, parent_id: Optional[str], attrs: Dict[str, Any]):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attrs = attrs
+        # Wall clock to line up processes; perf_counter for the duration
+        self.start = time.time()
+        self.started = time.perf_counter()
+        self.error: Optional[str] = None
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+
+class _NoSpan:
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def enabled() -> bool:
+    return _trace_path is not None
+
+
+def _emit(span: Span) -> None:
+    record = {
+        'trace': _trace_id,
+        'id': span.span_id,
+        'parent': span.parent_id,
+        'name': span.name,
+        'start': span.start,
+        'duration': time.perf_counter() - span.started,
+        'pid': os.getpid(),
+        'thread': threading.current_thread().name,
+    }
+    if span.attrs:
+        record['attrs'] = span.attrs
+    if span.error:
+        record['error'] = span.error
+    line = json.dumps(record, default=str) + '\n'
+    # One append per span keeps lines from concurrent processes intact; tracing never fails a tool
+    with _write_lock:
+        try:
+            with open(_trace_path, 'a', encoding='utf-8') as handle:
+                handle.write(line)
+        except OSError:
+            pass
+
+
+def _parent_id() -> Optional[str]:
+    current = _current.get()
+    if current is not None:
+        return current.span_id
+    return _root.span_id if _root is not None else None
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Any]:
+    """Time the block as a child of the current span (spans in new threads hang off the process root)."""
+    if _trace_path is None:
+        yield _NO_SPAN
+        return
+
+    current = Span(name, _parent_id(), attrs)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as err:
+        if not (isinstance(err, SystemExit) and not err.code):
+            current.error = f'{type(err).__name__}: {err}'
+        raise
+    finally:
+        _current.reset(token)
+        _emit(current)
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of span(); the span is named after the function unless name is given."""
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _trace_path is None:
+                return func(*args, **kwargs)
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def in_current_span(func):
+    """Bind func to the current span, so spans it opens on a worker thread nest under it (wrap per submit)."""
+    if _trace_path is None:
+        return func
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def child_env(env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Environment for a subprocess whose spans should nest under the current span."""
+    env = dict(os.environ if env is None else env)
+    parent = _parent_id()
+    if _trace_path is not None and parent:
+        env[TRACE_FILE_ENV] = str(_trace_path)
+        env[TRACE_PARENT_ENV] = f'{_trace_id}:{parent}'
+    return env
+
+
+def _patch_http() -> None:
+    """Make every googleapiclient request (and so every batchUpdate, values.get, ...) a span."""
+    try:
+        from googleapiclient import http
+    except ImportError:
+        return
+    original = http.HttpRequest.execute
+    if getattr(original, '_ff_traced', False):
+        return
+
+    @functools.wraps(original)
+    def execute(self, *args, **kwargs):
+        if _trace_path is None:
+            return original(self, *args, **kwargs)
+        with span(f'api {self.methodId or self.method}', method=self.method, uri=self.uri.split('?', 1)[0]):
+            return original(self, *args, **kwargs)
+
+    execute._ff_traced = True
+    http.HttpRequest.execute = execute
+
+
+def trace_script(script_path: str) -> None:
+    """Start tracing this process if $FF_TRACE_FILE is set.
+
+    Opens a root span named after the script, closed when the process exits (or by shutdown()). The
+    root span's parent is $FF_TRACE_PARENT, and subprocesses inherit this process's root as theirs.
+    """
+    global _trace_path, _trace_id, _root
+    path = os.environ.get(TRACE_FILE_ENV)
+    if not path or _root is not None:
+        return
+
+    _trace_path = Path(path).resolve()
+    trace_id, _, parent = os.environ.get(TRACE_PARENT_ENV, '').partition(':')
+    _trace_id = trace_id or uuid.uuid4().hex[:16]
+    _root = Span(Path(script_path).name, parent or None, {'argv': sys.argv[1:]})
+    # Absolute path so subprocesses with another working directory write to the same file
+    os.environ[TRACE_FILE_ENV] = str(_trace_path)
+    os.environ[TRACE_PARENT_ENV] = f'{_trace_id}:{_root.span_id}'
+
+    _patch_http()
+    atexit.register(shutdown)
+
+
+def shutdown(exit_code: Optional[int] = None) -> None:
+    """Close the process root span (runs at exit; tools daemon jobs call it before os._exit)."""
+    global _root
+    if _root is None:
+        return
+    root, _root = _root, None
+    if exit_code is not None:
+        root.attrs['exit_code'] = exit_code
+    _emit(root)
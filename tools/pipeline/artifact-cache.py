@@ -0,0 +1,58 @@
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script
+trace_script(__file__)
+
+from lib.artifact_store import ArtifactStore
+
+SIZE_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*', text.upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size '{text}' (examples: 500M, 2G, 1048576)")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Inspect or garbage-collect the pipeline artifact cache')
+    parser.add_argument('command', choices=['stats', 'gc'], help='stats: show usage; gc: evict old/least recently used entries')
+    parser.add_argument('--cache-dir', help='Artifact cache directory (default: per-user cache dir)')
+    parser.add_argument('--max-size', type=parse_size, help='gc: keep the stored outputs under this size (e.g. 500M, 2G)')
+    parser.add_argument('--max-age-days', type=float, help='gc: evict entries not stored or restored for this many days')
+    args = parser.parse_args()
+    if args.command == 'gc' and args.max_size is None and args.max_age_days is None:
+        parser.error('gc needs --max-size and/or --max-age-days')
+    return args
+
+
+def main():
+    args = parse_args()
+    store = ArtifactStore(Path(args.cache_dir) if args.cache_dir else None)
+
+    if args.command == 'stats':
+        print(json.dumps(store.stats(), indent=2))
+        return
+
+    max_age = args.max_age_days * 86400 if args.max_age_days is not None else None
+    result = store.gc(max_bytes=args.max_size, max_age_seconds=max_age)
+    print(f"Removed {result['removed_entries']} entries and {result['removed_objects']} objects "
+          f"({result['freed_bytes'] / (1 << 20):.1f} MiB) from {store.root}")
+
+
+if __name__ == '__main__':
+    main()
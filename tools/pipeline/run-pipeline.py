@@ -0,0 +1,170 @@
+import argparse
+import sys
+from contextlib import nullcontext
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+ROOT_DIR = TOOLS_DIR.parent
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script
+trace_script(__file__)
+
+from lib.artifact_store import ArtifactStore
+from lib.pipeline import (
+    FAILED,
+    SKIPPED,
+    ApiBudget,
+    PipelineRunner,
+    expand_stages,
+    load_graph,
+    resolve_variables,
+    select_stages,
+    shared_tools_daemon,
+    stage_environment,
+    stage_levels,
+)
+
+DEFAULT_GRAPH = SCRIPT_DIR / 'weekly-pipeline.json'
+DAEMON_SCRIPT = TOOLS_DIR / 'daemon' / 'tools-daemon.py'
+DEFAULT_MAX_PARALLEL = 4
+# Sheets allows 60 write requests per minute per user
+DEFAULT_API_BUDGET = 60
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Run the weekly update as a stage graph: independent stages in parallel, dependent ones in order'
+    )
+    parser.add_argument('--week', '-w', type=int, required=True, help='Week number ({week} in the stage graph)')
+    parser.add_argument('--graph', default=str(DEFAULT_GRAPH), help='Stage graph JSON file (default: weekly-pipeline.json)')
+    parser.add_argument(
+        '--set',
+        dest='overrides',
+        action='append',
+        default=[],
+        metavar='NAME=VALUE',
+        help='Set a graph variable, e.g. --set waiver_doc=<doc id> (repeatable)'
+    )
+    parser.add_argument(
+        '--only',
+        action='append',
+        default=[],
+        metavar='STAGE',
+        help='Run only stages matching this glob (plus the stages they need); repeatable'
+    )
+    parser.add_argument('--dry-run', action='store_true', help='Print the stage waves and commands without running them')
+    parser.add_argument(
+        '--max-parallel',
+        type=int,
+        default=DEFAULT_MAX_PARALLEL,
+        help=f'Maximum stages running at once (default: {DEFAULT_MAX_PARALLEL})'
+    )
+    parser.add_argument(
+        '--api-budget',
+        type=float,
+        default=DEFAULT_API_BUDGET,
+        help=f'Google API calls per minute shared by all stages, 0 for unlimited (default: {DEFAULT_API_BUDGET})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Run every stage, ignoring and not updating the artifact cache'
+    )
+    parser.add_argument(
+        '--rerun',
+        action='append',
+        default=[],
+        metavar='STAGE',
+        help='Run cached stages matching this glob even if their inputs are unchanged (repeatable)'
+    )
+    parser.add_argument('--cache-dir', help='Artifact cache directory (default: per-user cache dir)')
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Do not share a tools daemon; every stage loads credentials itself'
+    )
+    args = parser.parse_args()
+
+    if args.max_parallel < 1:
+        parser.error('--max-parallel must be at least 1')
+    if args.api_budget < 0:
+        parser.error('--api-budget cannot be negative')
+    for override in args.overrides:
+        if '=' not in override:
+            parser.error(f"--set expects NAME=VALUE, got '{override}'")
+    return args
+
+
+def print_plan(stages, variables) -> None:
+    print(f"Run directory: {variables['run_dir']}")
+    for index, wave in enumerate(stage_levels(stages), start=1):
+        print(f'\nWave {index}:')
+        for name in wave:
+            stage = stages[name]
+            budget = f', ~{stage.api_calls} API calls' if stage.api_calls else ''
+            needs = f" (after {', '.join(stage.needs)})" if stage.needs else ''
+            cached = ', cacheable' if stage.cache else ''
+            resources = f", one at a time on {', '.join(stage.resources)}" if stage.resources else ''
+            print(f'  {name}{needs}{budget}{cached}{resources}')
+            print(f"    {' '.join(stage.run)}")
+
+
+def main():
+    args = parse_args()
+    overrides = dict(override.split('=', 1) for override in args.overrides)
+    builtins = {
+        'root': str(ROOT_DIR),
+        'tools': str(TOOLS_DIR),
+        'python': sys.executable,
+        'week': str(args.week),
+        'run_dir': str(ROOT_DIR / 'pipeline-runs' / f'week-{args.week}'),
+    }
+
+    try:
+        defaults, stages = load_graph(Path(args.graph))
+        variables = resolve_variables({**builtins, **defaults}, overrides)
+        stages = expand_stages(select_stages(stages, args.only), variables)
+    except RuntimeError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+
+    if args.dry_run:
+        print_plan(stages, variables)
+        return
+
+    run_dir = Path(variables['run_dir'])
+    budget = ApiBudget(args.api_budget) if args.api_budget else None
+    store = None if args.no_cache else ArtifactStore(Path(args.cache_dir) if args.cache_dir else None)
+    rerun = [name for name in stages if any(fnmatchcase(name, pattern) for pattern in args.rerun)]
+    uses_google = any(stage.api_calls for stage in stages.values())
+
+    print(f'Running {len(stages)} stage(s), up to {args.max_parallel} at once; logs in {run_dir / "logs"}', flush=True)
+    daemon = nullcontext({}) if args.no_daemon or not uses_google else shared_tools_daemon(
+        DAEMON_SCRIPT, run_dir / 'logs' / 'tools-daemon.log'
+    )
+    with daemon as env_overrides:
+        runner = PipelineRunner(
+            stages, run_dir / 'logs', args.max_parallel, budget, stage_environment(env_overrides), ROOT_DIR,
+            store=store, rerun=rerun
+        )
+        runner.run()
+
+    print()
+    print(runner.summary())
+
+    failed = [name for name, result in runner.results.items() if result.status in (FAILED, SKIPPED)]
+    if failed:
+        print(f"\nError: {len(failed)} stage(s) failed or were skipped: {', '.join(failed)}")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+ROOT_DIR = TOOLS_DIR.parent
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Hand this run to the tools daemon if one is running (returns if not)
+from lib.tools_daemon import delegate_to_daemon
+delegate_to_daemon(__file__)
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script, traced
+trace_script(__file__)
+
+from lib.fantasypros import POSITIONS, add_fantasypros_args, fetch_rankings
+from lib.ownership import load_ownership
+from lib.player_master import SOURCES, PlayerMaster, load_flock_ros, table_to_rows, table_to_tsv
+
+CONFIG_FILE = SCRIPT_DIR / 'player-master-sheets.json'
+DEFAULT_TAB_NAME = 'player master'
+# Player master rank source -> FantasyPros ranking type
+FANTASYPROS_SOURCES = {'fp_ros': 'ROS', 'fp_weekly': 'WEEKLY'}
+# Same as lib.rank_aggregation.METHODS, which needs numpy and loads only for --blend-output
+BLEND_METHODS = ['borda', 'median', 'kemeny']
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Join Flock ROS, FantasyPros ROS/weekly rankings and league rosters into one player table'
+    )
+    parser.add_argument('--flock-ros', help='Flock ROS TSV from flock-rankings-to-tsv.py (or a saved Flock API .json)')
+    parser.add_argument(
+        '--roster',
+        action='append',
+        default=[],
+        help='League roster JSON (FantasyPros getLeagueRostersJSON response) as PATH or NAME=PATH; '
+             'repeat for several leagues (one owner column each)'
+    )
+    parser.add_argument('--available-only', action='store_true', help='Only players unrostered in at least one --roster league')
+    parser.add_argument('--tiers', action='store_true', help='Add a tier column from the FantasyPros ROS rank_ave/rank_std (needs numpy)')
+    parser.add_argument('--blend-output', help='Also write a blended ranking per position (all sources, one TSV) to this file (needs numpy)')
+    parser.add_argument(
+        '--blend-method',
+        choices=BLEND_METHODS,
+        default='kemeny',
+        help='Order of the blended rk column: weighted Borda, weighted median rank, or Borda refined by a Kemeny local search (default: kemeny)'
+    )
+    parser.add_argument(
+        '--blend-weight',
+        action='append',
+        default=[],
+        metavar='SOURCE=WEIGHT',
+        help=f"Source weight for --blend-output, repeatable; sources: {', '.join(source for source, _ in SOURCES)} (default: 1 each, 0 drops a source)"
+    )
+    parser.add_argument('--week', type=int, help='Week for --blend-output (default: the week of the FantasyPros weekly rankings)')
+    parser.add_argument('--output', '-o', help='Write the table as TSV to this file (default: stdout unless --upload)')
+    parser.add_argument('--upload', action='store_true', help='Write the table to the player master tab in one batched request')
+    parser.add_argument('--tab-name', help=f"Target tab (default: config 'tab_name' or '{DEFAULT_TAB_NAME}')")
+    add_fantasypros_args(parser)
+    args = parser.parse_args()
+    if args.available_only and not args.roster:
+        parser.error('--available-only needs at least one --roster')
+    try:
+        args.blend_weights = parse_blend_weights(args.blend_weight)
+    except ValueError as err:
+        parser.error(str(err))
+    return args
+
+
+def parse_blend_weights(specs: List[str]) -> Dict[str, float]:
+    """['fp_weekly=2', ...] -> weight per source, 1.0 for sources not given."""
+    weights = {source: 1.0 for source, _ in SOURCES}
+    for spec in specs:
+        source, sep, value = spec.partition('=')
+        if not sep or source not in weights:
+            raise ValueError(f"--blend-weight expects SOURCE=WEIGHT with SOURCE one of {', '.join(weights)}, got '{spec}'")
+        try:
+            weights[source] = float(value)
+        except ValueError:
+            raise ValueError(f"--blend-weight: '{value}' is not a number") from None
+        if weights[source] < 0:
+            raise ValueError(f'--blend-weight: {source} weight must not be negative')
+    return weights
+
+
+def load_config() -> Dict[str, Any]:
+    config_path = CONFIG_FILE
+    if not config_path.exists():
+        print(f"Warning: Config file '{config_path.name}' not found in {config_path.parent}.")
+        print("Creating placeholder config. Please populate 'target_sheet_id' and rerun.")
+        config_path.write_text(json.dumps({'target_sheet_id': 'TARGET_SHEET_ID_HERE'}, indent=2), encoding='utf-8')
+        raise SystemExit(1)
+
+    data = json.loads(config_path.read_text(encoding='utf-8'))
+    target_sheet = data.get('target_sheet_id')
+    if not target_sheet or target_sheet == 'TARGET_SHEET_ID_HERE':
+        print(f"Error: '{config_path}' must contain a valid 'target_sheet_id'.")
+        raise SystemExit(1)
+
+    sheet_id_match = re.search(r'/d/([a-zA-Z0-9_-]+)', target_sheet)
+    if sheet_id_match:
+        data['target_sheet_id'] = sheet_id_match.group(1)
+    elif re.match(r'^[a-zA-Z0-9_-]+$', target_sheet):
+        data['target_sheet_id'] = target_sheet
+    else:
+        print(f"Error: Could not extract sheet ID from '{target_sheet}'.")
+        raise SystemExit(1)
+
+    return data
+
+
+@traced()
+def build_master(args) -> PlayerMaster:
+    master = PlayerMaster()
+
+    if args.flock_ros:
+        flock_players = load_flock_ros(Path(args.flock_ros))
+        master.add_flock(flock_players)
+        print(f'Flock ROS: {len(flock_players)} players', file=sys.stderr)
+
+    combinations = [(ranking_type, position) for ranking_type in FANTASYPROS_SOURCES.values() for position in POSITIONS]
+    results = fetch_rankings(args, combinations)
+    for source, ranking_type in FANTASYPROS_SOURCES.items():
+        for position in POSITIONS:
+            master.add_fantasypros(results[(ranking_type, position)], source)
+    master.week = results[('WEEKLY', POSITIONS[0])].week
+    print(f'FantasyPros: {sum(len(rankings.players) for rankings in results.values())} rankings '
+          f'across {len(results)} type/position combinations', file=sys.stderr)
+
+    if args.tiers:
+        try:
+            from lib.tiers import ranking_tiers
+        except ModuleNotFoundError as err:
+            raise RuntimeError(f'{err.name} is not installed (needed for --tiers). Run "pip install numpy"') from err
+        # Every position in one pass; tiers restart per position
+        ros_players = [player for position in POSITIONS for player in results[('ROS', position)].players]
+        master.add_tiers(ros_players, ranking_tiers(ros_players))
+
+    if args.roster:
+        ownership = load_ownership(args.roster)
+        master.add_ownership(ownership)
+        for league in ownership.leagues.values():
+            unranked = sum(1 for player_id in league.team_of if player_id not in master.by_fantasypros_id)
+            print(f"Roster '{league.name}': {len(league.team_of)} rostered players "
+                  f"({unranked} not in any FantasyPros ranking)", file=sys.stderr)
+
+    if args.flock_ros:
+        unmatched = [
+            row.name for row in master.players.values()
+            if 'flock' in row.ranks and row.fantasypros_id is None
+        ]
+        if unmatched:
+            print(f"Flock players without a FantasyPros match ({len(unmatched)}): {', '.join(sorted(unmatched)[:10])}"
+                  f"{' ...' if len(unmatched) > 10 else ''}", file=sys.stderr)
+    return master
+
+
+def write_requests(
+    tabs: Dict[str, Dict[str, Any]],
+    tab_id: int,
+    tab_name: str,
+    table: List[List[Any]]
+) -> List[Dict[str, Any]]:
+    """Requests that size the tab to the table exactly, write every cell and bold the header row.
+
+    Sent as one batchUpdate; rows and columns beyond the table are dropped by the resize, so
+    nothing from a longer previous table is left behind.
+    """
+    data_rows = len(table)
+    data_cols = len(table[0])
+    # Sheets refuses to freeze every row, so an empty table keeps one blank row
+    grid = {'rowCount': max(data_rows, 2), 'columnCount': data_cols, 'frozenRowCount': 1}
+
+    requests: List[Dict[str, Any]] = []
+    if tab_name in tabs:
+        requests.append({
+            'updateSheetProperties': {
+                'properties': {'sheetId': tab_id, 'gridProperties': grid},
+                'fields': 'gridProperties.rowCount,gridProperties.columnCount,gridProperties.frozenRowCount'
+            }
+        })
+    else:
+        requests.append({'addSheet': {'properties': {'sheetId': tab_id, 'title': tab_name, 'gridProperties': grid}}})
+
+    full_range = {'sheetId': tab_id, 'startRowIndex': 0, 'endRowIndex': data_rows, 'startColumnIndex': 0, 'endColumnIndex': data_cols}
+    requests.append({'updateCells': {'range': full_range, 'rows': table_to_rows(table), 'fields': 'userEnteredValue'}})
+    requests.append({
+        'repeatCell': {
+            'range': dict(full_range, endRowIndex=1),
+            'cell': {'userEnteredFormat': {'textFormat': {'bold': True}}},
+            'fields': 'userEnteredFormat.textFormat.bold'
+        }
+    })
+    requests.append({
+        'autoResizeDimensions': {
+            'dimensions': {'sheetId': tab_id, 'dimension': 'COLUMNS', 'startIndex': 0, 'endIndex': data_cols}
+        }
+    })
+    return requests
+
+
+@traced()
+def upload_table(sheet_id: str, tab_name: str, table: List[List[Any]]) -> Tuple[int, bool]:
+    """Write the table to tab_name (created if missing). Returns (tab ID, created)."""
+    try:
+        from googleapiclient.errors import HttpError
+    except ModuleNotFoundError as err:
+        print('Error: google-api-python-client is not installed.')
+        print('Run "pip install google-api-python-client google-auth-oauthlib google-auth"')
+        raise SystemExit(1) from err
+
+    from lib.google_clients import SHEETS_SCOPE, build_service, get_credentials
+    from lib.sheet_templates import get_tab_properties, unused_tab_id
+
+    creds = get_credentials([SHEETS_SCOPE], app_name='fantasy-football-tools')
+    sheets_service = build_service('sheets', 'v4', creds)
+
+    tabs = get_tab_properties(sheets_service, sheet_id)
+    created = tab_name not in tabs
+    tab_id = unused_tab_id(tabs) if created else tabs[tab_name]['sheetId']
+    try:
+        sheets_service.spreadsheets().batchUpdate(
+            spreadsheetId=sheet_id,
+            body={'requests': write_requests(tabs, tab_id, tab_name, table)}
+        ).execute()
+    except HttpError as err:
+        raise RuntimeError(f'Google Sheets API error ({err.resp.status}): {err}') from err
+    return tab_id, created
+
+
+@traced()
+def write_blend(master: PlayerMaster, args) -> None:
+    try:
+        from lib.rank_aggregation import blend_table
+    except ModuleNotFoundError as err:
+        raise RuntimeError(f'{err.name} is not installed (needed for --blend-output). Run "pip install numpy"') from err
+
+    started = time.perf_counter()
+    table, swaps = blend_table(master, args.blend_weights, args.blend_method, args.week or master.week)
+    elapsed = time.perf_counter() - started
+    Path(args.blend_output).write_text(table_to_tsv(table), encoding='utf-8')
+    print(f'Wrote blended {args.blend_method} ranking of {len(table) - 1} players to {args.blend_output} '
+          f'in {elapsed * 1000:.1f}ms ({swaps} Kemeny swaps)', file=sys.stderr)
+
+
+def run(args) -> None:
+    config: Optional[Dict[str, Any]] = load_config() if args.upload else None
+    master = build_master(args)
+    table = master.table(available_only=args.available_only)
+
+    if args.output:
+        Path(args.output).write_text(table_to_tsv(table), encoding='utf-8')
+        print(f'Wrote {len(table) - 1} players to {args.output}', file=sys.stderr)
+    elif not args.upload:
+        sys.stdout.write(table_to_tsv(table))
+
+    if args.blend_output:
+        write_blend(master, args)
+
+    if config:
+        sheet_id = config['target_sheet_id']
+        tab_name = args.tab_name or config.get('tab_name') or DEFAULT_TAB_NAME
+        tab_id, created = upload_table(sheet_id, tab_name, table)
+        print(f"{'Created' if created else 'Updated'} tab '{tab_name}' with {len(table) - 1} players")
+        print('Done! View the sheet at:')
+        print(f'https://docs.google.com/spreadsheets/d/{sheet_id}/edit#gid={tab_id}')
+
+
+def main():
+    args = parse_args()
+    try:
+        run(args)
+    except RuntimeError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
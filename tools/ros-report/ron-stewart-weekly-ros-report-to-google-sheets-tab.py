@@ -3,28 +3,56 @@ import json
 import re
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 # Determine paths
 SCRIPT_DIR = Path(__file__).resolve().parent
 TOOLS_DIR = SCRIPT_DIR.parent
 
-# Add script directory to sys.path for local lib imports
-if str(SCRIPT_DIR) not in sys.path:
-    sys.path.insert(0, str(SCRIPT_DIR))
+# Add script directory and tools directory (shared lib) to sys.path
+for path in (TOOLS_DIR, SCRIPT_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# Hand this run to the tools daemon if one is running (returns if not)
+from lib.tools_daemon import delegate_to_daemon
+delegate_to_daemon(__file__)
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script, traced
+trace_script(__file__)
 
 try:
-    from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
 except ModuleNotFoundError as err:
     print('Error: google-api-python-client is not installed.')
     print('Run "pip install google-api-python-client google-auth-oauthlib google-auth"')
     raise SystemExit(1) from err
 
-# Import google_auth_utils from editable package
-from google_auth_utils import get_credentials
+from lib.google_clients import build_service, get_credentials
+
+from lib.developer_metadata import (
+    SHEET_METADATA_FIELDS,
+    content_hash,
+    find_sheet_metadata,
+    upsert_sheet_metadata_request,
+)
+from lib.sheets_utils import column_index_to_letter, column_letter_to_index, format_rectangles
 
 CONFIG_FILE = SCRIPT_DIR / 'ros-report-sheets.json'
+DATA_START_ROW = 3  # A4 (0-indexed)
+DEFAULT_LAST_COLUMN = 'X'  # The report block is A-X; helper or notes columns to the right are not copied
+SCAN_CHUNK_ROWS = 100
+EMPTY_ROW_RUN = 25  # Stop scanning after this many consecutive empty rows
+SOURCE_HASH_KEY = 'ros-report-source-hash'
+FORMAT_HASH_KEY = 'ros-report-format-hash'
+# Functions that read outside the tab's own cells, so they cannot recompute in a copy of the tab
+EXTERNAL_FUNCTIONS = {'IMPORTRANGE', 'IMPORTDATA', 'IMPORTHTML', 'IMPORTXML', 'IMPORTFEED', 'INDIRECT'}
+STRING_LITERAL = re.compile(r'"(?:[^"]|"")*"')
+FUNCTION_CALL = re.compile(r'([A-Za-z][A-Za-z0-9_.]*)\s*\(')
+# Bare names that are not function calls: cell/column references (A1, AB, $C$3) or named ranges
+BARE_NAME = re.compile(r"(?<![A-Za-z0-9_.$'])([A-Za-z_][A-Za-z0-9_.]*)(?![A-Za-z0-9_.(])")
+CELL_REFERENCE = re.compile(r'[A-Za-z]{1,3}\d*')
 
 
 def extract_sheet_and_tab_ids(url: str) -> Tuple[str, Optional[int]]:
@@ -71,15 +99,40 @@ def load_config() -> Dict[str, Any]:
         print(f"Error: Could not extract sheet ID from '{target_sheet}'.")
         raise SystemExit(1)
 
+    last_column = data.get('source_last_column') or DEFAULT_LAST_COLUMN
+    if not re.match(r'^[A-Za-z]{1,3}$', str(last_column)):
+        print(f"Error: 'source_last_column' in '{config_path}' must be a column letter such as 'X', got '{last_column}'.")
+        raise SystemExit(1)
+    data['source_last_col'] = column_letter_to_index(last_column)
+
     return data
 
 
-def get_tab_name_by_id(sheets_service, sheet_id: str, tab_id: int) -> Optional[str]:
-    """Get the name of a tab by its ID."""
+@traced()
+def read_source_tab(sheets_service, sheet_id: str, tab_id: int) -> Optional[Dict[str, Any]]:
+    """Read the source tab's properties and its A1 cell (value and formatting) in one request.
+
+    Returns {'properties': {...}, 'a1': {...cell data...}}, or None if no tab has tab_id.
+    """
     try:
-        spreadsheet = sheets_service.spreadsheets().get(
+        spreadsheet = sheets_service.spreadsheets().getByDataFilter(
             spreadsheetId=sheet_id,
-            fields='sheets(properties(sheetId,title))'
+            fields=(
+                'sheets(properties(sheetId,title,gridProperties(rowCount,columnCount)),'
+                'data(rowData(values(formattedValue,userEnteredValue,userEnteredFormat,textFormatRuns))))'
+            ),
+            body={
+                'dataFilters': [{
+                    'gridRange': {
+                        'sheetId': tab_id,
+                        'startRowIndex': 0,
+                        'endRowIndex': 1,
+                        'startColumnIndex': 0,
+                        'endColumnIndex': 1
+                    }
+                }],
+                'includeGridData': True
+            }
         ).execute()
     except HttpError as err:
         if err.resp.status == 403:
@@ -95,18 +148,30 @@ def get_tab_name_by_id(sheets_service, sheet_id: str, tab_id: int) -> Optional[s
 
     for sheet in spreadsheet.get('sheets', []):
         props = sheet.get('properties', {})
-        if props.get('sheetId') == tab_id:
-            return props.get('title')
-    
+        if props.get('sheetId') != tab_id:
+            continue
+
+        a1_cell: Dict[str, Any] = {}
+        data = sheet.get('data') or [{}]
+        row_data = data[0].get('rowData') or [{}]
+        values = row_data[0].get('values') or [{}]
+        if values[0]:
+            a1_cell = values[0]
+        return {'properties': props, 'a1': a1_cell}
+
     return None
 
 
-def find_or_create_tab(sheets_service, sheet_id: str, tab_name: str) -> int:
-    """Find existing tab by name or create a new one. Returns tab ID."""
+@traced()
+def read_target_tabs(sheets_service, sheet_id: str) -> Dict[str, Dict[str, Any]]:
+    """Read every tab of the target sheet in one request.
+
+    Returns {title: {'properties': {...including grid size...}, 'developerMetadata': [...]}}.
+    """
     try:
         spreadsheet = sheets_service.spreadsheets().get(
             spreadsheetId=sheet_id,
-            fields='sheets(properties(sheetId,title))'
+            fields=f'sheets(properties(sheetId,title,gridProperties(rowCount,columnCount)),{SHEET_METADATA_FIELDS})'
         ).execute()
     except HttpError as err:
         if err.resp.status == 403:
@@ -123,10 +188,25 @@ def find_or_create_tab(sheets_service, sheet_id: str, tab_name: str) -> int:
                 f"Unable to read Google Sheet '{sheet_id}'. Status: {err.resp.status}"
             ) from err
 
+    tabs: Dict[str, Dict[str, Any]] = {}
     for sheet in spreadsheet.get('sheets', []):
-        props = sheet.get('properties', {})
-        if props.get('title') == tab_name:
-            return props.get('sheetId')
+        tabs[sheet.get('properties', {}).get('title')] = sheet
+    return tabs
+
+
+@traced()
+def find_or_create_tab(
+    sheets_service,
+    sheet_id: str,
+    tab_name: str,
+    target_tabs: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Find existing tab by name (in target_tabs from read_target_tabs) or create a new one.
+
+    Returns the tab in the same shape as read_target_tabs values.
+    """
+    if tab_name in target_tabs:
+        return target_tabs[tab_name]
 
     # Tab doesn't exist, create it
     result = sheets_service.spreadsheets().batchUpdate(
@@ -134,69 +214,190 @@ def find_or_create_tab(sheets_service, sheet_id: str, tab_name: str) -> int:
         body={'requests': [{'addSheet': {'properties': {'title': tab_name}}}]}
     ).execute()
 
-    return result['replies'][0]['addSheet']['properties']['sheetId']
+    return {'properties': result['replies'][0]['addSheet']['properties'], 'developerMetadata': []}
 
 
-def find_data_range(sheets_service, sheet_id: str, tab_id: int) -> Tuple[int, int, int, int]:
+@traced()
+def find_data_range(
+    sheets_service,
+    sheet_id: str,
+    tab_name: str,
+    row_count: int,
+    column_count: int,
+    last_col: int
+) -> Tuple[int, int, int, int]:
     """Find the data range starting at A4 and ending at the bottom-right of Top 150 Position column.
     Returns (start_row, start_col, end_row, end_col) where A4 = (3, 0) (0-indexed).
+
+    The tab is scanned in SCAN_CHUNK_ROWS-row chunks across columns A..last_col (capped at the grid's
+    column_count; row_count and column_count come from the tab's gridProperties). Scanning stops at
+    the end of the grid or after EMPTY_ROW_RUN consecutive empty rows, and only the running extent is
+    kept in memory. Only the row extent adapts; columns past last_col are never read or copied.
+    """
+    last_col_letter = column_index_to_letter(max(min(column_count, last_col + 1), 1) - 1)
+    end_row = None
+    end_col = 0
+    empty_run = 0
+
+    chunk_start = DATA_START_ROW
+    while chunk_start < row_count and empty_run < EMPTY_ROW_RUN:
+        chunk_end = min(chunk_start + SCAN_CHUNK_ROWS, row_count)  # exclusive
+        range_name = f"'{tab_name}'!A{chunk_start + 1}:{last_col_letter}{chunk_end}"
+
+        try:
+            result = sheets_service.spreadsheets().values().get(
+                spreadsheetId=sheet_id,
+                range=range_name,
+                majorDimension='ROWS'
+            ).execute()
+        except HttpError as err:
+            raise RuntimeError(
+                f"Unable to read data range '{range_name}' from sheet '{sheet_id}'. Status: {err.resp.status}"
+            ) from err
+
+        # Trailing empty rows are omitted from the response, so pad to the chunk size
+        values = result.get('values', [])
+        for offset in range(chunk_end - chunk_start):
+            row = values[offset] if offset < len(values) else []
+            filled = [col_idx for col_idx, cell in enumerate(row) if cell and str(cell).strip()]
+            if filled:
+                end_row = chunk_start + offset
+                end_col = max(end_col, filled[-1])
+                empty_run = 0
+            else:
+                empty_run += 1
+                if empty_run >= EMPTY_ROW_RUN:
+                    break
+
+        chunk_start = chunk_end
+
+    if end_row is None:
+        raise RuntimeError("No data found starting at A4")
+
+    # Return: start_row=3 (A4), start_col=0 (A), end_row, end_col
+    return DATA_START_ROW, 0, end_row, end_col
+
+
+def range_a1(tab_name: str, start_row: int, start_col: int, end_row: int, end_col: int) -> str:
+    return (
+        f"'{tab_name}'!{column_index_to_letter(start_col)}{start_row + 1}:"
+        f"{column_index_to_letter(end_col)}{end_row + 1}"
+    )
+
+
+@traced()
+def read_source_cells(
+    sheets_service,
+    sheet_id: str,
+    tab_name: str,
+    start_row: int,
+    start_col: int,
+    end_row: int,
+    end_col: int
+) -> List[Dict[str, Any]]:
+    """rowData for the range with only formattedValue, effectiveFormat and textFormatRuns per cell.
+
+    One field-masked read that both change hashes come from, so an unchanged source costs a single
+    request on top of the metadata reads and the extent scan.
     """
-    # Get tab name to construct proper range reference
+    range_name = range_a1(tab_name, start_row, start_col, end_row, end_col)
     try:
-        spreadsheet = sheets_service.spreadsheets().get(
+        result = sheets_service.spreadsheets().get(
             spreadsheetId=sheet_id,
-            fields='sheets(properties(sheetId,title))'
+            ranges=[range_name],
+            fields='sheets(data(rowData(values(formattedValue,effectiveFormat,textFormatRuns))))'
         ).execute()
     except HttpError as err:
         raise RuntimeError(
-            f"Unable to read sheet metadata for '{sheet_id}'. Status: {err.resp.status}"
+            f"Unable to read source range '{range_name}'. Status: {err.resp.status}"
         ) from err
-    
-    tab_name = None
-    for sheet in spreadsheet.get('sheets', []):
-        props = sheet.get('properties', {})
-        if props.get('sheetId') == tab_id:
-            tab_name = props.get('title')
-            break
-    
-    if not tab_name:
-        raise RuntimeError(f"Could not find tab with ID {tab_id} in sheet '{sheet_id}'")
-    
-    # Read a large range to find the actual data extent
-    # Start from A4 (row index 3) and read down to row 200, across columns A-X (0-23)
-    range_name = f"'{tab_name}'!A4:X200"
-    
+
+    sheets = result.get('sheets') or [{}]
+    data = sheets[0].get('data') or [{}]
+    return data[0].get('rowData', [])
+
+
+def source_content_hash(
+    sheet_id: str,
+    tab_id: int,
+    a1_cell: Dict[str, Any],
+    start_row: int,
+    start_col: int,
+    end_row: int,
+    end_col: int,
+    rows: List[Dict[str, Any]]
+) -> str:
+    """Hash of everything the copy writes: the range, A1, and every cell's value, format and text runs."""
+    return content_hash({
+        'source': [sheet_id, tab_id, start_row, start_col, end_row, end_col],
+        'a1': a1_cell,
+        'cells': rows,
+    })
+
+
+def source_format_hash(start_row: int, start_col: int, end_row: int, end_col: int, rows: List[Dict[str, Any]]) -> str:
+    """Hash of the range's shape and every cell's effective format, for --format-once."""
+    formats = [
+        [cell.get('effectiveFormat', {}) for cell in row.get('values', [])]
+        for row in rows
+    ]
+    return content_hash({
+        'shape': [end_row - start_row + 1, end_col - start_col + 1],
+        'formats': formats,
+    })
+
+
+def formula_is_portable(formula: str) -> bool:
+    """True if a formula only reads cells of its own tab, so it computes the same in a copy of the tab.
+
+    References to other tabs ('Tab'!A1), named ranges and IMPORTRANGE / INDIRECT style functions
+    would turn into #REF! (or other data) once the tab is copied into another spreadsheet.
+    """
+    code = STRING_LITERAL.sub('""', formula)
+    if '!' in code:
+        return False
+    if any(name.upper() in EXTERNAL_FUNCTIONS for name in FUNCTION_CALL.findall(code)):
+        return False
+    return all(
+        CELL_REFERENCE.fullmatch(name) or name.upper() in ('TRUE', 'FALSE')
+        for name in BARE_NAME.findall(code)
+    )
+
+
+@traced()
+def find_unportable_formulas(
+    sheets_service,
+    sheet_id: str,
+    tab_name: str,
+    start_row: int,
+    start_col: int,
+    end_row: int,
+    end_col: int
+) -> List[Tuple[str, str]]:
+    """(cell, formula) for every formula in the range that formula_is_portable rejects.
+
+    One values().get with FORMULA rendering: formulas come back as their text, other cells as values.
+    """
+    range_name = range_a1(tab_name, start_row, start_col, end_row, end_col)
     try:
         result = sheets_service.spreadsheets().values().get(
             spreadsheetId=sheet_id,
             range=range_name,
-            majorDimension='ROWS'
+            majorDimension='ROWS',
+            valueRenderOption='FORMULA'
         ).execute()
     except HttpError as err:
         raise RuntimeError(
-            f"Unable to read data range '{range_name}' from sheet '{sheet_id}'. Status: {err.resp.status}"
+            f"Unable to read formulas from source range '{range_name}'. Status: {err.resp.status}"
         ) from err
 
-    values = result.get('values', [])
-    if not values:
-        raise RuntimeError("No data found starting at A4")
-
-    # Find the last non-empty row
-    end_row = 3  # Start at row 4 (0-indexed: 3)
-    for i, row in enumerate(values):
-        # Check if any cell in columns A-X (0-23) has content
-        if any(cell and str(cell).strip() for cell in (row[:24] if len(row) > 24 else row)):
-            end_row = 3 + i
-    
-    # Find the rightmost column with data (within A-X, i.e., columns 0-23)
-    end_col = 0
-    for row in values[:end_row - 3 + 1]:
-        for col_idx in range(min(24, len(row))):
-            if row[col_idx] and str(row[col_idx]).strip():
-                end_col = max(end_col, col_idx)
-
-    # Return: start_row=3 (A4), start_col=0 (A), end_row, end_col
-    return 3, 0, end_row, end_col
+    unportable = []
+    for row_offset, row in enumerate(result.get('values', [])):
+        for col_offset, value in enumerate(row):
+            if isinstance(value, str) and value.startswith('=') and not formula_is_portable(value):
+                cell = f'{column_index_to_letter(start_col + col_offset)}{start_row + row_offset + 1}'
+                unportable.append((cell, value))
+    return unportable
 
 
 def modify_a1_cell(cell_value: str) -> str:
@@ -229,6 +430,95 @@ def copy_cell_data(source_cell: Dict[str, Any]) -> Dict[str, Any]:
     return cell_data
 
 
+def cell_value_data(source_cell: Dict[str, Any]) -> Dict[str, Any]:
+    """A cell's value (formulas flattened to their evaluated value) and text runs, without its format."""
+    cell_data: Dict[str, Any] = {}
+
+    value = source_cell.get('userEnteredValue')
+    if value is not None:
+        if 'formulaValue' not in value:
+            cell_data['userEnteredValue'] = value
+        else:
+            # Copy formulas as their evaluated value (empty if there is none)
+            eval_value = source_cell.get('effectiveValue', {})
+            for key in ('numberValue', 'stringValue', 'boolValue'):
+                if key in eval_value:
+                    cell_data['userEnteredValue'] = {key: eval_value[key]}
+                    break
+            return cell_data
+
+    if 'textFormatRuns' in source_cell:
+        cell_data['textFormatRuns'] = source_cell['textFormatRuns']
+
+    return cell_data
+
+
+def intern_format(formats: Dict[str, int], format_list: List[Dict[str, Any]], cell_format: Dict[str, Any]) -> int:
+    """Return the id of cell_format, adding it to format_list the first time it is seen."""
+    key = json.dumps(cell_format, sort_keys=True, separators=(',', ':'))
+    format_id = formats.get(key)
+    if format_id is None:
+        format_id = len(format_list)
+        formats[key] = format_id
+        format_list.append(cell_format)
+    return format_id
+
+
+@traced()
+def write_values_only(
+    sheets_service,
+    sheet_id: str,
+    tab_name: str,
+    target_range: Dict[str, Any],
+    value_rows: List[Dict[str, Any]],
+    before_requests: Sequence[Dict[str, Any]] = (),
+    after_requests: Sequence[Dict[str, Any]] = ()
+) -> None:
+    """Write cell values without touching formats.
+
+    Plain values go through one values().update (RAW, so strings are never parsed as formulas);
+    rows with rich text (textFormatRuns) need updateCells, still without userEnteredFormat. So do
+    writes that come with other requests, so that everything lands in one atomic batchUpdate.
+    """
+    rich_text = any('textFormatRuns' in cell for row in value_rows for cell in row['values'])
+    if rich_text or before_requests or after_requests:
+        sheets_service.spreadsheets().batchUpdate(
+            spreadsheetId=sheet_id,
+            body={'requests': [
+                *before_requests,
+                {
+                    'updateCells': {
+                        'range': target_range,
+                        'rows': value_rows,
+                        'fields': 'userEnteredValue,textFormatRuns'
+                    }
+                },
+                *after_requests
+            ]}
+        ).execute()
+        return
+
+    values = []
+    for row in value_rows:
+        row_values = []
+        for cell in row['values']:
+            value = cell.get('userEnteredValue', {})
+            row_values.append(next(iter(value.values()), '') if value else '')
+        values.append(row_values)
+
+    range_name = (
+        f"'{tab_name}'!{column_index_to_letter(target_range['startColumnIndex'])}{target_range['startRowIndex'] + 1}:"
+        f"{column_index_to_letter(target_range['endColumnIndex'] - 1)}{target_range['endRowIndex']}"
+    )
+    sheets_service.spreadsheets().values().update(
+        spreadsheetId=sheet_id,
+        range=range_name,
+        valueInputOption='RAW',
+        body={'values': values}
+    ).execute()
+
+
+@traced()
 def copy_range_to_target(
     sheets_service,
     source_sheet_id: str,
@@ -241,17 +531,31 @@ def copy_range_to_target(
     source_end_row: int,
     source_end_col: int,
     target_start_row: int,
-    target_start_col: int
+    target_start_col: int,
+    include_formats: bool = True,
+    before_requests: Sequence[Dict[str, Any]] = (),
+    after_requests: Sequence[Dict[str, Any]] = ()
 ) -> None:
-    """Copy a range from source to target, preserving formatting but not formulas."""
+    """Copy a range from source to target, preserving formatting but not formulas.
+
+    With include_formats False only values are written (the target's formatting is left as is);
+    without rich text that is a single compact values().update. before_requests and after_requests
+    go into the same batchUpdate as the copy, so the target is either fully updated or untouched.
+    """
     # Read source cells with formatting - use tab name for range reference
-    source_range = f"'{source_tab_name}'!{chr(65 + source_start_col)}{source_start_row + 1}:{chr(65 + source_end_col)}{source_end_row + 1}"
+    source_range = (
+        f"'{source_tab_name}'!{column_index_to_letter(source_start_col)}{source_start_row + 1}:"
+        f"{column_index_to_letter(source_end_col)}{source_end_row + 1}"
+    )
     
     try:
         source_data = sheets_service.spreadsheets().get(
             spreadsheetId=source_sheet_id,
             ranges=[source_range],
-            includeGridData=True
+            fields=(
+                'sheets(data(rowData(values(userEnteredValue,effectiveValue,textFormatRuns'
+                + (',userEnteredFormat' if include_formats else '') + '))))'
+            )
         ).execute()
     except HttpError as err:
         raise RuntimeError(
@@ -264,116 +568,202 @@ def copy_range_to_target(
     if not source_rows:
         raise RuntimeError(f"No data found in source range '{source_range}'")
 
-    # Build batch update requests
-    requests: List[Dict[str, Any]] = []
-    
     num_rows = source_end_row - source_start_row + 1
     num_cols = source_end_col - source_start_col + 1
-    
+
+    # Values go out in one write; formats are interned and applied per rectangle
+    formats: Dict[str, int] = {}
+    format_list: List[Dict[str, Any]] = []
+    value_rows: List[Dict[str, Any]] = []
+    format_ids: List[List[int]] = []
+
     for row_idx in range(num_rows):
-        if row_idx >= len(source_rows):
-            break
-        
-        source_row = source_rows[row_idx]
-        source_cells = source_row.get('values', [])
-        
+        source_cells = source_rows[row_idx].get('values', []) if row_idx < len(source_rows) else []
+
         target_cells = []
+        row_format_ids = []
         for col_idx in range(num_cols):
-            if col_idx < len(source_cells):
-                source_cell = source_cells[col_idx]
-                # Only copy if it's not a formula (we want to preserve formulas in target)
-                if 'userEnteredValue' in source_cell:
-                    value = source_cell['userEnteredValue']
-                    # Skip formulas - we'll copy values only
-                    if 'formulaValue' not in value:
-                        target_cells.append(copy_cell_data(source_cell))
-                    else:
-                        # For formulas, copy as value if it has an evaluated value
-                        if 'effectiveValue' in source_cell:
-                            eval_value = source_cell['effectiveValue']
-                            cell_copy = {}
-                            if 'numberValue' in eval_value:
-                                cell_copy['userEnteredValue'] = {'numberValue': eval_value['numberValue']}
-                            elif 'stringValue' in eval_value:
-                                cell_copy['userEnteredValue'] = {'stringValue': eval_value['stringValue']}
-                            elif 'boolValue' in eval_value:
-                                cell_copy['userEnteredValue'] = {'boolValue': eval_value['boolValue']}
-                            if 'userEnteredFormat' in source_cell:
-                                cell_copy['userEnteredFormat'] = source_cell['userEnteredFormat']
-                            target_cells.append(cell_copy)
-                        else:
-                            # Empty cell if formula has no evaluated value
-                            target_cells.append({})
-                else:
-                    target_cells.append({})
-            else:
-                target_cells.append({})
-        
+            source_cell = source_cells[col_idx] if col_idx < len(source_cells) else {}
+            target_cells.append(cell_value_data(source_cell))
+            if include_formats:
+                row_format_ids.append(intern_format(formats, format_list, source_cell.get('userEnteredFormat', {})))
+
+        value_rows.append({'values': target_cells})
+        format_ids.append(row_format_ids)
+
+    target_range = {
+        'sheetId': target_tab_id,
+        'startRowIndex': target_start_row,
+        'endRowIndex': target_start_row + num_rows,
+        'startColumnIndex': target_start_col,
+        'endColumnIndex': target_start_col + num_cols
+    }
+
+    if not include_formats:
+        write_values_only(
+            sheets_service, target_sheet_id, source_tab_name, target_range, value_rows, before_requests, after_requests
+        )
+        return
+
+    requests: List[Dict[str, Any]] = [*before_requests, {
+        'updateCells': {
+            'range': target_range,
+            'rows': value_rows,
+            'fields': 'userEnteredValue,textFormatRuns'
+        }
+    }]
+
+    for row_start, row_end, col_start, col_end, format_id in format_rectangles(format_ids):
         requests.append({
-            'updateCells': {
+            'repeatCell': {
                 'range': {
                     'sheetId': target_tab_id,
-                    'startRowIndex': target_start_row + row_idx,
-                    'endRowIndex': target_start_row + row_idx + 1,
-                    'startColumnIndex': target_start_col,
-                    'endColumnIndex': target_start_col + num_cols
+                    'startRowIndex': target_start_row + row_start,
+                    'endRowIndex': target_start_row + row_end,
+                    'startColumnIndex': target_start_col + col_start,
+                    'endColumnIndex': target_start_col + col_end
                 },
-                'rows': [{'values': target_cells}],
-                'fields': 'userEnteredValue,userEnteredFormat,textFormatRuns'
+                # An empty format clears whatever formatting the target cells had
+                'cell': {'userEnteredFormat': format_list[format_id]},
+                'fields': 'userEnteredFormat'
             }
         })
+    requests.extend(after_requests)
 
-    if requests:
-        sheets_service.spreadsheets().batchUpdate(
-            spreadsheetId=target_sheet_id,
-            body={'requests': requests}
-        ).execute()
+    sheets_service.spreadsheets().batchUpdate(
+        spreadsheetId=target_sheet_id,
+        body={'requests': requests}
+    ).execute()
 
 
-def delete_rows_below(
+@traced()
+def copy_range_server_side(
     sheets_service,
+    source_sheet_id: str,
+    source_tab_id: int,
     target_sheet_id: str,
     target_tab_id: int,
-    end_row: int,
-    delete_to_row: int = 1000
+    source_start_row: int,
+    source_start_col: int,
+    source_end_row: int,
+    source_end_col: int,
+    target_start_row: int,
+    target_start_col: int,
+    include_formats: bool = True,
+    before_requests: Sequence[Dict[str, Any]] = (),
+    after_requests: Sequence[Dict[str, Any]] = ()
 ) -> None:
-    """Delete all rows below the pasted range."""
-    if end_row >= delete_to_row:
-        return
-    
-    num_rows_to_delete = delete_to_row - end_row - 1
-    
-    if num_rows_to_delete <= 0:
-        return
-    
-    # Get the actual row count of the sheet to know how many rows exist
+    """Copy a range from source to target without downloading it.
+
+    The source tab is copied into the target spreadsheet as a scratch tab (sheets.copyTo), the range
+    is pasted from there as values and then formats, and the scratch tab is deleted. Cell data never
+    leaves Google's servers. With include_formats False the PASTE_FORMAT step is skipped.
+    before_requests and after_requests go into the same batchUpdate as the paste.
+
+    PASTE_VALUES drops rich text (textFormatRuns) and PASTE_FORMAT only carries cell formats, so a
+    cell with partly bold or linked text arrives as plain text in the cell's format. PASTE_NORMAL
+    would keep the runs but also paste live formulas, shifted by the one-column offset. Sources with
+    text runs therefore go through copy_range_to_target, which writes the runs.
+
+    copyTo copies formulas, not their results: they recompute inside the target spreadsheet, and
+    PASTE_VALUES pastes whatever they compute there. A formula that reads another tab, a named range
+    or an IMPORTRANGE becomes #REF! (or reads the target's data), so only use this path when
+    find_unportable_formulas finds none.
+    """
     try:
-        spreadsheet = sheets_service.spreadsheets().get(
+        scratch = sheets_service.spreadsheets().sheets().copyTo(
+            spreadsheetId=source_sheet_id,
+            sheetId=source_tab_id,
+            body={'destinationSpreadsheetId': target_sheet_id}
+        ).execute()
+    except HttpError as err:
+        raise RuntimeError(
+            f"Unable to copy source tab {source_tab_id} into sheet '{target_sheet_id}'. Status: {err.resp.status}"
+        ) from err
+
+    scratch_tab_id = scratch['sheetId']
+    num_rows = source_end_row - source_start_row + 1
+    num_cols = source_end_col - source_start_col + 1
+
+    source_range = {
+        'sheetId': scratch_tab_id,
+        'startRowIndex': source_start_row,
+        'endRowIndex': source_start_row + num_rows,
+        'startColumnIndex': source_start_col,
+        'endColumnIndex': source_start_col + num_cols
+    }
+    destination_range = {
+        'sheetId': target_tab_id,
+        'startRowIndex': target_start_row,
+        'endRowIndex': target_start_row + num_rows,
+        'startColumnIndex': target_start_col,
+        'endColumnIndex': target_start_col + num_cols
+    }
+
+    requests: List[Dict[str, Any]] = [*before_requests] + [
+        {
+            'copyPaste': {
+                'source': source_range,
+                'destination': destination_range,
+                'pasteType': paste_type,
+                'pasteOrientation': 'NORMAL'
+            }
+        }
+        for paste_type in (('PASTE_VALUES', 'PASTE_FORMAT') if include_formats else ('PASTE_VALUES',))
+    ]
+    requests.extend(after_requests)
+    requests.append({'deleteSheet': {'sheetId': scratch_tab_id}})
+
+    try:
+        sheets_service.spreadsheets().batchUpdate(
             spreadsheetId=target_sheet_id,
-            fields='sheets(properties(sheetId,gridProperties(rowCount)))'
+            body={'requests': requests}
         ).execute()
     except HttpError as err:
+        # The batch is atomic, so the scratch tab is still there
+        try:
+            sheets_service.spreadsheets().batchUpdate(
+                spreadsheetId=target_sheet_id,
+                body={'requests': [{'deleteSheet': {'sheetId': scratch_tab_id}}]}
+            ).execute()
+        except HttpError:
+            print(f"Warning: Could not delete scratch tab '{scratch.get('title')}' from the target sheet.")
         raise RuntimeError(
-            f"Unable to read sheet properties for '{target_sheet_id}'. Status: {err.resp.status}"
+            f"Unable to paste source range into target sheet '{target_sheet_id}'. Status: {err.resp.status}"
         ) from err
-    
-    # Find the tab and get its row count
-    actual_row_count = delete_to_row  # Default fallback
-    for sheet in spreadsheet.get('sheets', []):
-        props = sheet.get('properties', {})
-        if props.get('sheetId') == target_tab_id:
-            grid_props = props.get('gridProperties', {})
-            actual_row_count = grid_props.get('rowCount', delete_to_row)
-            break
-    
+
+
+def grow_grid_requests(tab_id: int, grid: Dict[str, Any], needed_rows: int, needed_cols: int) -> List[Dict[str, Any]]:
+    """appendDimension requests so the tab's grid holds needed_rows x needed_cols."""
+    requests: List[Dict[str, Any]] = []
+    for dimension, current, needed in (
+        ('ROWS', grid.get('rowCount', 1000), needed_rows),
+        ('COLUMNS', grid.get('columnCount', 26), needed_cols),
+    ):
+        if needed > current:
+            requests.append({
+                'appendDimension': {
+                    'sheetId': tab_id,
+                    'dimension': dimension,
+                    'length': needed - current
+                }
+            })
+    return requests
+
+
+def delete_rows_below_requests(
+    target_tab_id: int,
+    end_row: int,
+    row_count: int,
+    delete_to_row: int = 1000
+) -> List[Dict[str, Any]]:
+    """Requests deleting all rows below the pasted range (row_count is the tab's gridProperties.rowCount)."""
     # Only delete rows that actually exist
-    if end_row + 1 >= actual_row_count:
-        return
-    
-    # Delete rows below the pasted range
-    delete_end = min(actual_row_count, delete_to_row)
-    
-    requests = [{
+    delete_end = min(row_count, delete_to_row)
+    if end_row + 1 >= delete_end:
+        return []
+
+    return [{
         'deleteDimension': {
             'range': {
                 'sheetId': target_tab_id,
@@ -383,11 +773,29 @@ def delete_rows_below(
             }
         }
     }]
-    
-    sheets_service.spreadsheets().batchUpdate(
-        spreadsheetId=target_sheet_id,
-        body={'requests': requests}
-    ).execute()
+
+
+def a1_update_requests(target_tab_id: int, a1_cell: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Request writing the source's A1 (with its format) to the target, a line break before ' week N'."""
+    a1_value = a1_cell.get('formattedValue')
+    if not a1_value:
+        return []
+
+    a1_update = copy_cell_data(a1_cell)
+    a1_update['userEnteredValue'] = {'stringValue': modify_a1_cell(str(a1_value))}
+    return [{
+        'updateCells': {
+            'range': {
+                'sheetId': target_tab_id,
+                'startRowIndex': 0,
+                'endRowIndex': 1,
+                'startColumnIndex': 0,
+                'endColumnIndex': 1
+            },
+            'rows': [{'values': [a1_update]}],
+            'fields': 'userEnteredValue,userEnteredFormat,textFormatRuns'
+        }
+    }]
 
 
 def parse_args() -> argparse.Namespace:
@@ -398,6 +806,22 @@ def parse_args() -> argparse.Namespace:
         'source_url',
         help='Google Sheets tab URL (e.g., https://docs.google.com/spreadsheets/d/SHEET_ID/edit?gid=TAB_ID)'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Copy even if the source content hash matches the one stored on the target tab'
+    )
+    parser.add_argument(
+        '--format-once',
+        action='store_true',
+        help='Only write formats when the source format fingerprint changed; otherwise copy values only'
+    )
+    parser.add_argument(
+        '--legacy-copy',
+        action='store_true',
+        help='Download the source range and re-upload it cell by cell instead of the server-side copy '
+             '(chosen automatically when source formulas read other tabs, named ranges or IMPORTRANGE)'
+    )
     return parser.parse_args()
 
 
@@ -420,71 +844,105 @@ def main():
         raise SystemExit(1)
 
     creds = get_credentials(['https://www.googleapis.com/auth/spreadsheets'], app_name='fantasy-football-tools')
-    sheets_service = build('sheets', 'v4', credentials=creds)
+    sheets_service = build_service('sheets', 'v4', creds)
 
-    # Get source tab name
-    source_tab_name = get_tab_name_by_id(sheets_service, source_sheet_id, source_tab_id)
-    if not source_tab_name:
+    # One read per spreadsheet: source tab properties plus A1, then all target tab properties
+    try:
+        source_tab = read_source_tab(sheets_service, source_sheet_id, source_tab_id)
+        target_tabs = read_target_tabs(sheets_service, target_sheet_id)
+    except RuntimeError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+
+    if source_tab is None:
         print(f'Error: Could not find tab with ID {source_tab_id} in source sheet.')
         raise SystemExit(1)
 
+    source_tab_name = source_tab['properties']['title']
     print(f'Source tab: "{source_tab_name}"')
 
-    # Find or create target tab
-    target_tab_id = find_or_create_tab(sheets_service, target_sheet_id, source_tab_name)
-    print(f'Target tab: "{source_tab_name}" (ID: {target_tab_id})')
-
-    # Read and modify A1
+    # Find data range
+    source_grid = source_tab['properties'].get('gridProperties', {})
     try:
-        a1_result = sheets_service.spreadsheets().values().get(
-            spreadsheetId=source_sheet_id,
-            range='A1'
-        ).execute()
-        a1_value = a1_result.get('values', [[None]])[0][0] if a1_result.get('values') else None
-        
-        # Also get A1 with formatting
-        a1_data = sheets_service.spreadsheets().get(
-            spreadsheetId=source_sheet_id,
-            ranges=['A1'],
-            includeGridData=True
-        ).execute()
-        
-        a1_cell_data = {}
-        if a1_data.get('sheets', [{}])[0].get('data', [{}])[0].get('rowData', [{}])[0].get('values', [{}])[0]:
-            a1_cell_data = a1_data['sheets'][0]['data'][0]['rowData'][0]['values'][0]
-        
-        if a1_value:
-            modified_a1 = modify_a1_cell(str(a1_value))
-            
-            # Update A1 in target
-            a1_update = copy_cell_data(a1_cell_data)
-            a1_update['userEnteredValue'] = {'stringValue': modified_a1}
-            
-            sheets_service.spreadsheets().batchUpdate(
-                spreadsheetId=target_sheet_id,
-                body={'requests': [{
-                    'updateCells': {
-                        'range': {
-                            'sheetId': target_tab_id,
-                            'startRowIndex': 0,
-                            'endRowIndex': 1,
-                            'startColumnIndex': 0,
-                            'endColumnIndex': 1
-                        },
-                        'rows': [{'values': [a1_update]}],
-                        'fields': 'userEnteredValue,userEnteredFormat,textFormatRuns'
-                    }
-                }]}
-            ).execute()
-            print('Updated A1 cell')
-    except HttpError as err:
-        print(f'Warning: Could not read/update A1: {err}')
+        source_start_row, source_start_col, source_end_row, source_end_col = find_data_range(
+            sheets_service,
+            source_sheet_id,
+            source_tab_name,
+            source_grid.get('rowCount', 1000),
+            source_grid.get('columnCount', 26),
+            config['source_last_col']
+        )
+        source_rows = read_source_cells(
+            sheets_service,
+            source_sheet_id,
+            source_tab_name,
+            source_start_row,
+            source_start_col,
+            source_end_row,
+            source_end_col
+        )
+    except RuntimeError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+    print(f'Source data range: A{source_start_row + 1}:{column_index_to_letter(source_end_col)}{source_end_row + 1}')
+    source_hash = source_content_hash(
+        source_sheet_id,
+        source_tab_id,
+        source_tab['a1'],
+        source_start_row,
+        source_start_col,
+        source_end_row,
+        source_end_col,
+        source_rows
+    )
+    format_hash = source_format_hash(source_start_row, source_start_col, source_end_row, source_end_col, source_rows)
 
-    # Find data range
-    source_start_row, source_start_col, source_end_row, source_end_col = find_data_range(
-        sheets_service, source_sheet_id, source_tab_id
+    # Skip all writes when the source is unchanged since the last copy (a new tab has no hash yet)
+    target_tab = target_tabs.get(source_tab_name, {})
+    stored_hash = find_sheet_metadata(target_tab, SOURCE_HASH_KEY)
+    if stored_hash is not None and stored_hash.get('metadataValue') == source_hash and not args.force:
+        print('Source unchanged since the last copy; nothing to do (use --force to copy anyway).')
+        return
+
+    stored_format_hash = find_sheet_metadata(target_tab, FORMAT_HASH_KEY)
+    include_formats = not (
+        args.format_once
+        and stored_format_hash is not None
+        and stored_format_hash.get('metadataValue') == format_hash
     )
-    print(f'Source data range: A{source_start_row + 1}:{chr(65 + source_end_col)}{source_end_row + 1}')
+    if not include_formats:
+        print('Source formats unchanged; copying values only')
+
+    # Everything that can stop the run is checked before the first write
+    legacy_copy = args.legacy_copy
+    if not legacy_copy and any('textFormatRuns' in cell for row in source_rows for cell in row.get('values', [])):
+        print('Source cells contain rich text, which the server-side paste drops; using the download path')
+        legacy_copy = True
+    if not legacy_copy:
+        # Formulas recompute in the target after copyTo; ones that read outside the tab need the download path
+        try:
+            unportable = find_unportable_formulas(
+                sheets_service,
+                source_sheet_id,
+                source_tab_name,
+                source_start_row,
+                source_start_col,
+                source_end_row,
+                source_end_col
+            )
+        except RuntimeError as err:
+            print(f'Error: {err}')
+            raise SystemExit(1)
+        if unportable:
+            cell, formula = unportable[0]
+            print(f'{len(unportable)} source formulas read outside the tab (e.g. {cell}: {formula}); '
+                  f'copying their values with the download path')
+            legacy_copy = True
+
+    # Find or create target tab
+    target_tab = find_or_create_tab(sheets_service, target_sheet_id, source_tab_name, target_tabs)
+    target_tab_id = target_tab['properties']['sheetId']
+    print(f'Target tab: "{source_tab_name}" (ID: {target_tab_id})')
 
     # Copy data range to target (shifted one column right: B4 instead of A4)
     target_start_row = source_start_row  # Same row (4)
@@ -492,32 +950,62 @@ def main():
     target_end_row = source_end_row
     target_end_col = target_start_col + (source_end_col - source_start_col)
     
-    print(f'Copying to target range: {chr(65 + target_start_col)}{target_start_row + 1}:{chr(65 + target_end_col)}{target_end_row + 1}')
-    
-    copy_range_to_target(
-        sheets_service,
-        source_sheet_id,
-        source_tab_id,
-        source_tab_name,
-        target_sheet_id,
-        target_tab_id,
-        source_start_row,
-        source_start_col,
-        source_end_row,
-        source_end_col,
-        target_start_row,
-        target_start_col
-    )
-    print('Data copied successfully')
-
-    # Delete all rows below the pasted range
-    delete_rows_below(
-        sheets_service,
-        target_sheet_id,
-        target_tab_id,
-        target_end_row
+    print(f'Copying to target range: {column_index_to_letter(target_start_col)}{target_start_row + 1}:'
+          f'{column_index_to_letter(target_end_col)}{target_end_row + 1}')
+
+    # A1 and a bigger grid (sources past column Z or row 1000) go in before the copy; clearing the rows
+    # below it and remembering what was copied go in after. All of it is one atomic batchUpdate.
+    target_grid = target_tab['properties'].get('gridProperties', {})
+    target_row_count = max(target_grid.get('rowCount', 1000), target_end_row + 1)
+    before_requests = (
+        a1_update_requests(target_tab_id, source_tab['a1'])
+        + grow_grid_requests(target_tab_id, target_grid, target_end_row + 1, target_end_col + 1)
     )
-    print('Deleted outdated rows below pasted range')
+    after_requests = delete_rows_below_requests(target_tab_id, target_end_row, target_row_count) + [
+        upsert_sheet_metadata_request(target_tab_id, SOURCE_HASH_KEY, source_hash, stored_hash),
+        upsert_sheet_metadata_request(target_tab_id, FORMAT_HASH_KEY, format_hash, stored_format_hash),
+    ]
+
+    try:
+        if legacy_copy:
+            copy_range_to_target(
+                sheets_service,
+                source_sheet_id,
+                source_tab_id,
+                source_tab_name,
+                target_sheet_id,
+                target_tab_id,
+                source_start_row,
+                source_start_col,
+                source_end_row,
+                source_end_col,
+                target_start_row,
+                target_start_col,
+                include_formats,
+                before_requests,
+                after_requests
+            )
+        else:
+            copy_range_server_side(
+                sheets_service,
+                source_sheet_id,
+                source_tab_id,
+                target_sheet_id,
+                target_tab_id,
+                source_start_row,
+                source_start_col,
+                source_end_row,
+                source_end_col,
+                target_start_row,
+                target_start_col,
+                include_formats,
+                before_requests,
+                after_requests
+            )
+    except (RuntimeError, HttpError) as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+    print('Updated A1, copied the data range and deleted outdated rows below it')
 
     print('Done! View the sheet at:')
     print(f'https://docs.google.com/spreadsheets/d/{target_sheet_id}')
@@ -0,0 +1,170 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+ROOT_DIR = TOOLS_DIR.parent
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script
+trace_script(__file__)
+
+from lib.fantasypros import DEFAULT_SCORING, POSITIONS, SCORING_TYPES, add_fantasypros_args, fetch_rankings
+
+DEFAULT_SIMULATIONS = 100_000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Monte Carlo start/sit for a league roster from FantasyPros weekly projections and rank spread'
+    )
+    parser.add_argument('roster', help='League roster JSON (FantasyPros getLeagueRostersJSON response)')
+    parser.add_argument('--team-id', help="Team to simulate (default: the roster's own teamId)")
+    parser.add_argument('--sims', type=int, default=DEFAULT_SIMULATIONS, help=f'Simulated weeks (default: {DEFAULT_SIMULATIONS})')
+    parser.add_argument('--seed', type=int, help='Random seed, for repeatable results')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    add_fantasypros_args(parser)
+    args = parser.parse_args()
+    if args.sims < 1:
+        parser.error('--sims must be at least 1')
+    return args
+
+
+def load_roster(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, json.JSONDecodeError) as err:
+        raise RuntimeError(f"Unable to read league roster '{path}': {err}") from err
+
+
+def league_options(roster: dict) -> dict:
+    """FantasyProsClient options for the league's own scoring and settings."""
+    options = {'scoring': roster.get('scoring') if roster.get('scoring') in SCORING_TYPES else DEFAULT_SCORING}
+    if roster.get('key'):
+        options['league_key'] = roster['key']
+    return options
+
+
+def print_report(result, team_name: str, missing, elapsed: float) -> None:
+    players = result.players
+    print(f'{team_name}: {result.simulations:,} simulated weeks in {elapsed:.2f}s')
+    print()
+    print(f"{'Slot':<9} {'Player':<26} {'Proj':>5} {'Sim':>5} {'±':>5} {'Start%':>7}  Alternative (beats starter)")
+    for slot, index, alternative, wins in zip(result.slots, result.lineup, result.alternatives, result.alternative_wins):
+        if index < 0:
+            print(f'{slot.label:<9} (no eligible player)')
+            continue
+        player = players[index]
+        line = (f'{slot.label:<9} {player.name:<26} {player.projected_points or 0:>5.1f} {result.mean_points[index]:>5.1f} '
+                f'{result.std_points[index]:>5.1f} {result.start_rate[index]:>7.1%}')
+        if alternative >= 0:
+            line += f'  {players[alternative].name} ({wins:.1%})'
+        print(line)
+
+    starters = {index for index in result.lineup if index >= 0}
+    bench = sorted((index for index in range(len(players)) if index not in starters), key=lambda index: -result.mean_points[index])
+    if bench:
+        print()
+        print('Bench:')
+        for index in bench:
+            player = players[index]
+            print(f"  {player.position or '':<7} {player.name:<26} {player.projected_points or 0:>5.1f} "
+                  f'{result.mean_points[index]:>5.1f} {result.std_points[index]:>5.1f} {result.start_rate[index]:>7.1%}')
+
+    print()
+    for label, totals in (('Lineup points', result.lineup_points), ('Best possible', result.optimal_points)):
+        summary = result.distribution(totals)
+        percentiles = '  '.join(f"{name} {value:.1f}" for name, value in summary.items() if name.startswith('p'))
+        print(f"{label + ':':<15} mean {summary['mean']:.1f} ± {summary['std']:.1f}   {percentiles}")
+    print(f'Points left on the bench: {(result.optimal_points - result.lineup_points).mean():.1f} per week on average')
+    if missing:
+        print()
+        print(f"No weekly projection (bye, injured or unranked): {', '.join(missing)}")
+
+
+def result_json(result, team_name: str, missing) -> dict:
+    players = result.players
+
+    def player_entry(index):
+        player = players[index]
+        return {
+            'player_id': player.player_id,
+            'name': player.name,
+            'position': player.position,
+            'team': player.team,
+            'opponent': player.opponent,
+            'projection': player.projected_points,
+            'sim_mean': round(float(result.mean_points[index]), 2),
+            'sim_std': round(float(result.std_points[index]), 2),
+            'start_rate': round(float(result.start_rate[index]), 4),
+        }
+
+    lineup = []
+    for slot, index, alternative, wins in zip(result.slots, result.lineup, result.alternatives, result.alternative_wins):
+        lineup.append({
+            'slot': slot.label,
+            'player': player_entry(index) if index >= 0 else None,
+            'alternative': players[alternative].name if alternative >= 0 else None,
+            'alternative_beats_starter': round(wins, 4) if alternative >= 0 else None,
+        })
+    return {
+        'team': team_name,
+        'simulations': result.simulations,
+        'lineup': lineup,
+        'players': [player_entry(index) for index in range(len(players))],
+        'lineup_points': result.distribution(result.lineup_points),
+        'optimal_points': result.distribution(result.optimal_points),
+        'unprojected': missing,
+    }
+
+
+def run(args) -> None:
+    try:
+        from lib.start_sit import StartSitSimulator, parse_lineup_slots, projection_curves, roster_players
+    except ModuleNotFoundError as err:
+        print(f'Error: {err.name} is not installed.')
+        print('Run "pip install numpy"')
+        raise SystemExit(1) from err
+
+    roster = load_roster(Path(args.roster))
+    slots = parse_lineup_slots(roster.get('positions'))
+    # ROS rankings only name the players the weekly rankings leave out (byes, injuries)
+    combinations = [(ranking_type, position) for ranking_type in ('WEEKLY', 'ROS') for position in POSITIONS]
+    results = fetch_rankings(args, combinations, **league_options(roster))
+    rankings = [results[('WEEKLY', position)] for position in POSITIONS]
+    team_name, players, missing = roster_players(roster, rankings, args.team_id)
+    if not players:
+        raise RuntimeError(f"None of {team_name}'s players are in this week's FantasyPros rankings")
+    ros_names = {player.player_id: player.name for position in POSITIONS for player in results[('ROS', position)].players}
+    missing = [ros_names.get(player_id, str(player_id)) for player_id in missing]
+
+    simulator = StartSitSimulator(players, projection_curves(rankings), slots)
+    started = time.perf_counter()
+    result = simulator.run(args.sims, args.seed)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(result_json(result, team_name, missing), indent=2, ensure_ascii=False))
+    else:
+        print_report(result, team_name, missing, elapsed)
+
+
+def main():
+    args = parse_args()
+    try:
+        run(args)
+    except RuntimeError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+"""ABOUTME: pytest setup for the tools tests: puts tools/ on sys.path so the shared lib package imports.
+ABOUTME: Run from the repo root with `python -m pytest tools/tests`."""
+import sys
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parents[1]
+
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
@@ -0,0 +1,92 @@
+"""ABOUTME: Tests for lib.artifact_store: stage keys follow input contents, outputs round-trip, gc evicts by LRU.
+ABOUTME: Every store lives under pytest's tmp_path."""
+import os
+import time
+
+import pytest
+
+from lib.artifact_store import STRAY_GRACE_SECONDS, ArtifactStore, stage_key
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_stage_key_follows_input_contents(tmp_path):
+    source = write(tmp_path / 'in.txt', 'one')
+    key = stage_key('tsv', ['convert', source], inputs=[source])
+    assert stage_key('tsv', ['convert', source], inputs=[source]) == key
+    write(tmp_path / 'in.txt', 'two')
+    assert stage_key('tsv', ['convert', source], inputs=[source]) != key
+    assert stage_key('tsv', ['convert', source, '--week', '9'], inputs=[source]) != key
+    assert stage_key('tsv', ['convert', source], inputs=[source], extra='rev-2') != key
+
+
+def test_save_lookup_restore_round_trip(tmp_path):
+    store = ArtifactStore(tmp_path / 'store')
+    output = write(tmp_path / 'out' / 'ros.tsv', 'rank\tname\n1\tBijan Robinson\n')
+    store.save('key-1', 'flock-ros-tsv', [output])
+
+    os.remove(output)
+    entry = store.lookup('key-1')
+    assert entry['stage'] == 'flock-ros-tsv'
+    assert [str(path) for path in store.restore('key-1', entry)] == [output]
+    assert open(output, encoding='utf-8').read() == 'rank\tname\n1\tBijan Robinson\n'
+    assert store.lookup('missing') is None
+
+
+def test_identical_outputs_share_one_object(tmp_path):
+    store = ArtifactStore(tmp_path / 'store')
+    store.save('a', 'one', [write(tmp_path / 'a.tsv', 'same')])
+    store.save('b', 'two', [write(tmp_path / 'b.tsv', 'same')])
+    assert store.stats()['objects'] == 1
+    assert store.stats()['entries'] == 2
+
+
+def test_missing_output_raises(tmp_path):
+    with pytest.raises(RuntimeError):
+        ArtifactStore(tmp_path / 'store').save('key', 'stage', [str(tmp_path / 'never-written.tsv')])
+
+
+def test_lookup_ignores_entries_with_lost_objects(tmp_path):
+    store = ArtifactStore(tmp_path / 'store')
+    store.save('key', 'stage', [write(tmp_path / 'out.tsv', 'data')])
+    for path in store.objects_dir.glob('*/*'):
+        path.unlink()
+    assert store.lookup('key') is None
+
+
+def test_gc_evicts_least_recently_used_first(tmp_path):
+    store = ArtifactStore(tmp_path / 'store')
+    now = time.time()
+    for age, name in enumerate(['newest', 'middle', 'oldest']):
+        store.save(name, name, [write(tmp_path / f'{name}.tsv', name * 100)])
+        os.utime(store._entry_path(name), (now - age * 60, now - age * 60))
+
+    result = store.gc(max_bytes=1300)
+    assert result['removed_entries'] == 1
+    assert store.lookup('oldest') is None
+    assert store.lookup('middle') and store.lookup('newest')
+    assert store.stats()['bytes'] == 1200
+
+    result = store.gc(max_age_seconds=30)
+    assert result['removed_entries'] == 1
+    assert store.lookup('newest') and store.lookup('middle') is None
+    assert store.stats()['objects'] == 1
+
+
+def test_gc_keeps_temp_files_of_running_saves(tmp_path):
+    store = ArtifactStore(tmp_path / 'store')
+    store.save('key', 'stage', [write(tmp_path / 'out.tsv', 'data')])
+    fresh = store.objects_dir / 'ab' / '.tmp-fresh'
+    stale = store.entries_dir / '.tmp-stale'
+    write(fresh, 'partial')
+    write(stale, 'partial')
+    old = time.time() - STRAY_GRACE_SECONDS - 60
+    os.utime(stale, (old, old))
+
+    store.gc()
+    assert fresh.exists()
+    assert not stale.exists()
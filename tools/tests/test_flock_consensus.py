@@ -0,0 +1,54 @@
+"""ABOUTME: Tests for lib.flock_consensus: consensus order puts thinly covered players after the rest.
+ABOUTME: Small hand-built rank matrices plus the saved Flock rankings API sample."""
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from lib.flock_consensus import MIN_COVERAGE, RankMatrix, consensus, consensus_tsv, load_flock_json, rank_matrix
+
+SAMPLE_FILE = Path(__file__).resolve().parents[2] / 'docs' / 'api-samples' / 'flockfantasy-REDRAFT-ALL.json'
+
+
+def matrix(rows):
+    ranks = np.array(rows, dtype=float)
+    return RankMatrix(
+        experts=[f'Expert {index}' for index in range(ranks.shape[1])],
+        names=[f'Player {index}' for index in range(len(ranks))],
+        positions=np.array(['QB'] * len(ranks)),
+        teams=[''] * len(ranks),
+        ranks=ranks,
+    )
+
+
+def test_single_expert_player_sorts_after_full_coverage():
+    nan = np.nan
+    stats = consensus(matrix([
+        [1, 1, 2, 1],
+        [nan, 2, nan, nan],
+        [3, 3, 3, 2],
+        [2, nan, 1, 3],
+    ]))
+    assert stats.rank.tolist() == [1, 4, 3, 2]
+    assert stats.pos_rank.tolist() == [1, 4, 3, 2]
+    assert stats.tier[1] == 0 and (stats.tier[[0, 2, 3]] > 0).all()
+
+
+def test_low_coverage_rows_have_a_blank_tier():
+    nan = np.nan
+    data = matrix([[1, 1, 1], [nan, nan, 2]])
+    lines = consensus_tsv(data, consensus(data), 'WEEKLY').splitlines()
+    assert lines[1].split('\t')[:3] == ['1. Player 0', '', '1']
+    assert lines[2].split('\t')[:3] == ['2. Player 1', '', '']
+
+
+def test_sample_weekly_order_respects_coverage():
+    data = rank_matrix(load_flock_json(SAMPLE_FILE), 'WEEKLY', 'QB')
+    stats = consensus(data)
+    experts = np.count_nonzero((~np.isnan(data.ranks)).any(axis=0))
+    covered = stats.count >= np.ceil(MIN_COVERAGE * experts)
+    assert covered.any() and not covered.all()
+    # Every covered player comes before every thinly covered one
+    assert stats.rank[covered].max() < stats.rank[~covered].min()
+    assert (stats.tier[~covered] == 0).all()
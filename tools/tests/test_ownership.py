@@ -0,0 +1,120 @@
+"""ABOUTME: Tests for lib.ownership: owner labels and bitset availability across leagues, and name matching.
+ABOUTME: Every defense the saved waiver reports recommend must resolve to a FantasyPros DST, matchup suffix or not."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from lib.fantasypros import POSITIONS, PlayerRanking, Rankings, parse_rankings, sample_file_for
+from lib.ownership import FREE_AGENT, MY_TEAM, Ownership, parse_roster_spec, rankings_tsv_with_owners
+
+TOOLS_DIR = Path(__file__).resolve().parents[1]
+ROOT_DIR = TOOLS_DIR.parent
+SAMPLES_DIR = ROOT_DIR / 'docs' / 'api-samples'
+REPORT_FILES = sorted((ROOT_DIR / 'docs' / 'waiver-reports').glob('W* waivers.json'))
+
+
+def league(name, my_team, teams):
+    return {
+        'name': name,
+        'teamId': my_team,
+        'teams': [{'id': team_id, 'name': f'Team {team_id}', 'players': players} for team_id, players in teams.items()],
+    }
+
+
+@pytest.fixture
+def two_leagues():
+    ownership = Ownership()
+    ownership.add_league(league('home', 1, {1: [10, 11], 2: [12]}))
+    ownership.add_league(league('work', 5, {5: [12], 6: [10, 13]}))
+    return ownership
+
+
+def test_labels_per_league(two_leagues):
+    assert two_leagues.labels(10) == [MY_TEAM, 'Team 6']
+    assert two_leagues.labels(12) == ['Team 2', MY_TEAM]
+    assert two_leagues.labels(99) == [FREE_AGENT, FREE_AGENT]
+    assert two_leagues.labels(None) == ['', '']
+    assert two_leagues.column_headers() == ['owner (home)', 'owner (work)']
+
+
+def test_availability_bitsets(two_leagues):
+    # 10 and 12 are rostered in both leagues; 11 and 13 are free in one of them
+    assert not two_leagues.is_available(10)
+    assert not two_leagues.is_available(12)
+    assert two_leagues.is_available(11) and two_leagues.is_available(13)
+    assert two_leagues.is_available(13, 'home') and not two_leagues.is_available(13, 'work')
+    assert two_leagues.is_available(99)
+    assert sorted(two_leagues.team_players('work', 1)) == [10, 13]
+    assert two_leagues.is_mine(12, 'work') and not two_leagues.is_mine(12, 'home')
+
+
+def test_duplicate_league_name_is_rejected(two_leagues):
+    with pytest.raises(RuntimeError):
+        two_leagues.add_league(league('home', 1, {}))
+
+
+def test_parse_roster_spec():
+    assert parse_roster_spec('work=rosters/work.json') == ('work', Path('rosters/work.json'))
+    assert parse_roster_spec('league.json') == (None, Path('league.json'))
+
+
+def test_available_only_tsv(two_leagues):
+    players = [
+        PlayerRanking(rank=rank, name=f'Player {player_id}', team='ATL', position='RB', bye=None, opponent=None, player_id=player_id)
+        for rank, player_id in enumerate([10, 11, 12, 13], start=1)
+    ]
+    rankings = Rankings('ROS', 'RB', 'STD', 2025, None, None, None, None, players)
+    lines = rankings_tsv_with_owners(rankings, two_leagues, available_only=True).splitlines()
+    assert lines[0] == 'rank\tname\tteam\tbye\towner (home)\towner (work)'
+    assert lines[1:] == ['2\tPlayer 11\tATL\t\tMy Team\tFA', '4\tPlayer 13\tATL\t\tFA\tTeam 6']
+
+
+@pytest.fixture(scope='module')
+def ownership():
+    ownership = Ownership()
+    ownership.index_rankings(
+        parse_rankings(json.loads(sample_file_for(SAMPLES_DIR, 'ros', position).read_text(encoding='utf-8')))
+        for position in POSITIONS
+    )
+    return ownership
+
+
+def report_defenses(path: Path):
+    pytest.importorskip('googleapiclient')
+    waiver_dir = str(TOOLS_DIR / 'waiver-report')
+    if waiver_dir not in sys.path:
+        sys.path.insert(0, waiver_dir)
+    from waiver_lib.waiver_processing import extract_recommendations
+
+    payload = json.loads(path.read_text(encoding='utf-8'))
+    records = payload.get('recommendations')
+    if records is None:
+        records = extract_recommendations(payload.get('rows', []))
+    return [record['player'] for record in records if record.get('position') == 'DST']
+
+
+@pytest.mark.parametrize('path', REPORT_FILES, ids=[path.stem for path in REPORT_FILES])
+def test_report_defenses_resolve(ownership, path):
+    unmatched = [name for name in report_defenses(path) if ownership.player_id_for(name, 'DST') is None]
+    assert unmatched == []
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Giants at LV', 'New York Giants'),
+    ('Saints vs NYJ', 'New Orleans Saints'),
+    ('Bucs at MIA', 'Tampa Bay Buccaneers'),
+    ('Bucs', 'Tampa Bay Buccaneers'),
+    ('Niners @ SEA', 'San Francisco 49ers'),
+    ('Seattle', 'Seattle Seahawks'),
+])
+def test_defense_names(ownership, name, expected):
+    names = {player.player_id: player.name for player in parse_rankings(
+        json.loads(sample_file_for(SAMPLES_DIR, 'ros', 'DST').read_text(encoding='utf-8'))
+    ).players}
+    assert names[ownership.player_id_for(name, 'DST')] == expected
+
+
+def test_ambiguous_city_does_not_match(ownership):
+    assert ownership.player_id_for('New York', 'DST') is None
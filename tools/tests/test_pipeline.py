@@ -0,0 +1,40 @@
+"""ABOUTME: Tests for lib.pipeline scheduling: needs ordering and resource exclusion between parallel stages.
+ABOUTME: Stages are tiny Python subprocesses that record when they start and finish."""
+import sys
+
+from lib.pipeline import SUCCEEDED, PipelineRunner, Stage
+
+
+def sleeper(name, tmp_path, **options):
+    script = f"import time; time.sleep(0.2); open({str(tmp_path / name)!r}, 'w').close()"
+    return Stage(name=name, run=[sys.executable, '-c', script], **options)
+
+
+def overlaps(results, first, second):
+    a, b = results[first], results[second]
+    return a.started < b.finished and b.started < a.finished
+
+
+def test_independent_stages_run_in_parallel(tmp_path):
+    stages = {name: sleeper(name, tmp_path) for name in ('a', 'b')}
+    results = PipelineRunner(stages, tmp_path / 'logs', max_parallel=4).run()
+    assert all(result.status == SUCCEEDED for result in results.values())
+    assert overlaps(results, 'a', 'b')
+
+
+def test_stages_sharing_a_resource_never_overlap(tmp_path):
+    stages = {name: sleeper(name, tmp_path, resources=['sheet']) for name in ('qb', 'rb', 'wr', 'te')}
+    stages['other'] = sleeper('other', tmp_path, resources=['other-sheet'])
+    results = PipelineRunner(stages, tmp_path / 'logs', max_parallel=4).run()
+    assert all(result.status == SUCCEEDED for result in results.values())
+    uploads = ['qb', 'rb', 'wr', 'te']
+    for index, first in enumerate(uploads):
+        for second in uploads[index + 1:]:
+            assert not overlaps(results, first, second)
+    assert overlaps(results, 'qb', 'other')
+
+
+def test_needs_run_first(tmp_path):
+    stages = {'tsv': sleeper('tsv', tmp_path), 'upload': sleeper('upload', tmp_path, needs=['tsv'])}
+    results = PipelineRunner(stages, tmp_path / 'logs').run()
+    assert results['upload'].started >= results['tsv'].finished
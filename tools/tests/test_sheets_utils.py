@@ -0,0 +1,149 @@
+"""ABOUTME: Tests for lib.sheets_utils: last-row probing against a fake Sheets service, and format rectangles.
+ABOUTME: The fake rejects rows past the grid with a 400, like the real API."""
+import random
+import re
+
+import pytest
+
+errors = pytest.importorskip('googleapiclient.errors')
+
+from lib.sheets_utils import (
+    column_index_to_letter,
+    column_letter_to_index,
+    find_last_row_by_probing,
+    find_last_rows_by_probing,
+    format_rectangles,
+)
+
+RANGE = re.compile(r"'(?P<tab>[^']+)'!(?P<col>[A-Z]+)(?P<row>\d+):[A-Z]+(?P<end>\d+)")
+
+
+class _Response(dict):
+    def __init__(self, status):
+        super().__init__(status=str(status))
+        self.status = status
+        self.reason = 'Bad Request'
+
+
+class _Request:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class FakeSheets:
+    """spreadsheets().get / values().batchGet over {tab: (rowCount, last filled row)}."""
+
+    def __init__(self, tabs):
+        self.tabs = tabs
+        self.probed_rows = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, fields):
+        return _Request({'sheets': [
+            {'properties': {'title': tab, 'gridProperties': {'rowCount': row_count}}}
+            for tab, (row_count, _) in self.tabs.items()
+        ]})
+
+    def batchGet(self, spreadsheetId, ranges, majorDimension, fields):
+        value_ranges = []
+        for range_name in ranges:
+            match = RANGE.fullmatch(range_name)
+            row_count, last_row = self.tabs[match['tab']]
+            row = int(match['row'])
+            if row > row_count:
+                message = f'Range ({range_name}) exceeds grid limits. Max rows: {row_count}'
+                return _Request(errors.HttpError(_Response(400), message.encode()))
+            self.probed_rows.append(row)
+            value_ranges.append({'values': [['x']]} if row <= last_row else {})
+        return _Request({'valueRanges': value_ranges})
+
+
+@pytest.mark.parametrize('last_row', [2, 3, 4, 5, 17, 64, 100, 999, 1000])
+def test_finds_last_row(last_row):
+    service = FakeSheets({'Tab': (1000, last_row)})
+    assert find_last_row_by_probing(service, 'sheet', 'Tab', 3, 0, 4, max_rows=1000, row_count=1000) == last_row
+
+
+def test_empty_block():
+    service = FakeSheets({'Tab': (1000, 0)})
+    assert find_last_row_by_probing(service, 'sheet', 'Tab', 3, 0, 4, row_count=1000) == 2
+
+
+def test_probes_stop_at_the_grid():
+    # A template-sized tab that only grew to fit its data: a 1000-row window would probe past row 40
+    service = FakeSheets({'Tab': (40, 37)})
+    assert find_last_row_by_probing(service, 'sheet', 'Tab', 3, 0, 4, max_rows=1000, row_count=40) == 37
+    assert max(service.probed_rows) <= 40
+
+
+def test_full_grid():
+    service = FakeSheets({'Tab': (40, 40)})
+    assert find_last_row_by_probing(service, 'sheet', 'Tab', 3, 0, 4, row_count=40) == 40
+
+
+def test_row_counts_looked_up_when_not_given():
+    service = FakeSheets({'Tab': (12, 9)})
+    assert find_last_row_by_probing(service, 'sheet', 'Tab', 3, 0, 4) == 9
+
+
+def test_start_row_past_the_grid():
+    service = FakeSheets({'Tab': (2, 2)})
+    assert find_last_row_by_probing(service, 'sheet', 'Tab', 3, 0, 4, row_count=2) == 2
+    assert service.probed_rows == []
+
+
+def test_blocks_on_tabs_of_different_sizes():
+    service = FakeSheets({'Small': (30, 25), 'Large': (1200, 480)})
+    blocks = [('Small', 3, 0, 4), ('Large', 3, 5, 4), ('Large', 3, 10, 4)]
+    assert find_last_rows_by_probing(service, 'sheet', blocks, max_rows=1000) == [25, 480, 480]
+
+
+def test_grid_error_is_raised_not_treated_as_empty():
+    # A stale rowCount (tab shrunk since it was read) must surface so callers can fall back to a scan
+    service = FakeSheets({'Tab': (20, 10)})
+    with pytest.raises(RuntimeError, match='Status: 400'):
+        find_last_row_by_probing(service, 'sheet', 'Tab', 3, 0, 4, row_count=1000)
+
+
+def assert_partition(grid):
+    covered = [[0] * len(row) for row in grid]
+    for row_start, row_end, col_start, col_end, format_id in format_rectangles(grid):
+        assert row_start < row_end and col_start < col_end
+        for row in range(row_start, row_end):
+            for col in range(col_start, col_end):
+                assert grid[row][col] == format_id
+                covered[row][col] += 1
+    assert all(count == 1 for row in covered for count in row)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_format_rectangles_partition_the_grid(seed):
+    rng = random.Random(seed)
+    rows, cols = rng.randint(1, 30), rng.randint(1, 12)
+    # Few distinct formats in runs and blocks, like a real tab
+    grid = [[rng.choice([0, 0, 0, 1, 2]) for _ in range(cols)]]
+    for _ in range(rows - 1):
+        grid.append([value if rng.random() < 0.8 else rng.randint(0, 3) for value in grid[-1]])
+    assert_partition(grid)
+
+
+def test_format_rectangles_merge_uniform_blocks():
+    grid = [[1, 1, 2], [1, 1, 2], [3, 3, 2]]
+    assert sorted(format_rectangles(grid)) == [(0, 2, 0, 2, 1), (0, 3, 2, 3, 2), (2, 3, 0, 2, 3)]
+    assert format_rectangles([]) == []
+
+
+@pytest.mark.parametrize('letters, index', [('A', 0), ('X', 23), ('Z', 25), ('AA', 26), ('az', 51), ('AAA', 702)])
+def test_column_letters_round_trip(letters, index):
+    assert column_letter_to_index(letters) == index
+    assert column_index_to_letter(index) == letters.upper()
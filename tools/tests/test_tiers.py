@@ -0,0 +1,59 @@
+"""ABOUTME: Tests for lib.tiers: tiers are monotone in average rank, contiguous from 1 and restart per position.
+ABOUTME: Random rank averages and spreads plus the FantasyPros sample rankings."""
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from lib.fantasypros import POSITIONS, parse_rankings, sample_file_for
+from lib.tiers import MAX_TIER_SIZE, assign_tiers, ranking_tiers
+
+SAMPLES_DIR = Path(__file__).resolve().parents[2] / 'docs' / 'api-samples'
+
+
+def assert_monotone(avg, tiers, groups):
+    for group in np.unique(groups):
+        rows = np.flatnonzero((groups == group) & ~np.isnan(avg))
+        order = rows[np.argsort(avg[rows], kind='stable')]
+        group_tiers = tiers[order]
+        assert group_tiers[0] == 1
+        steps = np.diff(group_tiers)
+        # Never back to an earlier tier, never a skipped tier number
+        assert ((steps == 0) | (steps == 1)).all()
+        # Tied averages share a tier
+        ties = np.diff(avg[order]) == 0
+        assert (steps[ties] == 0).all()
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_random_tiers_are_monotone(seed):
+    rng = np.random.default_rng(seed)
+    count = 150
+    avg = np.round(rng.uniform(1, 120, count), 1)
+    std = rng.uniform(0, 15, count)
+    groups = rng.choice(POSITIONS, count)
+    avg[rng.random(count) < 0.05] = np.nan
+    tiers = assign_tiers(avg, std, groups)
+
+    assert (tiers[np.isnan(avg)] == 0).all()
+    assert_monotone(avg, tiers, groups)
+
+
+def test_tiers_are_split_to_the_maximum_size():
+    avg = np.arange(1, 61, dtype=float)
+    tiers = assign_tiers(avg, np.full(60, 50.0))
+    assert tiers.max() >= -(-60 // MAX_TIER_SIZE)
+
+
+def test_sample_rankings_tiers_are_monotone():
+    players = [
+        player
+        for position in POSITIONS
+        for player in parse_rankings(json.loads(sample_file_for(SAMPLES_DIR, 'ros', position).read_text(encoding='utf-8'))).players
+    ]
+    tiers = ranking_tiers(players)
+    avg = np.array([player.rank_ave if player.rank_ave is not None else player.rank for player in players], dtype=float)
+    groups = np.array([player.position for player in players])
+    assert_monotone(avg, tiers, groups)
@@ -0,0 +1,57 @@
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from lib.trace_report import list_traces, load_spans, render_html, select_trace, summarize
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Render a FF_TRACE_FILE span log as an HTML timeline')
+    parser.add_argument('trace_file', help='JSON-lines trace file written by the tools with FF_TRACE_FILE set')
+    parser.add_argument('--output', '-o', help='HTML output path (default: <trace file>.html)')
+    parser.add_argument('--trace', help='Trace ID (or prefix) to render when the file holds several runs (default: latest)')
+    parser.add_argument('--list', action='store_true', help='List the traces in the file instead of rendering')
+    parser.add_argument('--top', type=int, default=10, help='Span names to print in the terminal summary (default: 10)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    trace_path = Path(args.trace_file)
+    try:
+        spans = load_spans(trace_path)
+        if args.list:
+            for trace in list_traces(spans):
+                started = datetime.fromtimestamp(trace['start']).strftime('%Y-%m-%d %H:%M:%S')
+                print(f"{trace['trace']}  {started}  {trace['end'] - trace['start']:7.2f}s  "
+                      f"{trace['spans']:5d} spans  {trace['root'] or ''}")
+            return
+        spans = select_trace(spans, args.trace)
+    except RuntimeError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+
+    if not spans:
+        print(f"Error: No spans in '{trace_path}'.")
+        raise SystemExit(1)
+
+    output_path = Path(args.output) if args.output else trace_path.with_suffix('.html')
+    output_path.write_text(render_html(spans, title=f'Trace {spans[0].get("trace")}'), encoding='utf-8')
+
+    print(f"{'span':<40} {'calls':>5} {'self (s)':>9} {'total (s)':>9}")
+    for entry in summarize(spans)[:args.top]:
+        print(f"{entry['name'][:40]:<40} {entry['calls']:>5} {entry['self']:>9.3f} {entry['total']:>9.3f}")
+    print(f'Timeline written to {output_path.resolve()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +0,0 @@
-from . import file_utils, sheets_utils, waiver_processing
-
-__all__ = ['file_utils', 'sheets_utils', 'waiver_processing']
-
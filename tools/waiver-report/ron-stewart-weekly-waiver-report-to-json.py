@@ -1,46 +1,69 @@
 import argparse
+import json
 import sys
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
 
 # Determine paths
 SCRIPT_DIR = Path(__file__).resolve().parent
 TOOLS_DIR = SCRIPT_DIR.parent
 ROOT_DIR = TOOLS_DIR.parent
 
-# Add script directory to sys.path for local lib imports
+# Add script directory to sys.path for local waiver_lib imports
 if str(SCRIPT_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPT_DIR))
 
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Hand this run to the tools daemon if one is running (returns if not)
+from lib.tools_daemon import delegate_to_daemon
+delegate_to_daemon(__file__)
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import in_current_span, trace_script, traced
+trace_script(__file__)
+
 try:
-    from googleapiclient.discovery import build
+    from lib.google_clients import build_service, get_credentials
 except ModuleNotFoundError as err:
+    if err.name != 'googleapiclient':
+        raise
     print('Error: google-api-python-client is not installed.')
     print('Run "pip install google-api-python-client google-auth-oauthlib google-auth"')
     raise SystemExit(1) from err
 
-# Import google_auth_utils from editable package
-from google_auth_utils import get_credentials
-
-# Import from local lib (tools/waiver-report/lib/)
-from lib.waiver_processing import (
+# Import from local waiver_lib (tools/waiver-report/waiver_lib/)
+from waiver_lib.waiver_processing import (
     extract_id_from_url,
     extract_tab_name_from_doc,
     process_document,
+    read_doc_revision,
     read_week_doc,
     write_json_report,
     render_rows_to_html,
 )
-from lib.file_utils import ensure_unique_path
+from waiver_lib.file_utils import ensure_unique_path
 
 DEFAULT_REPORT_DIR = ROOT_DIR / 'docs' / 'waiver-reports'
+DEFAULT_WORKERS = 4
+DOCS_SCOPES = ['https://www.googleapis.com/auth/documents.readonly']
 
 
 def parse_args():
     parser = argparse.ArgumentParser(
         description='Fetch Ron Stewart weekly waiver report and serialize it to JSON (optionally HTML)'
     )
-    parser.add_argument('source_doc', help='Google Docs document ID or full URL')
+    parser.add_argument(
+        'source_doc',
+        nargs='*',
+        help='Google Docs document ID or full URL (several IDs switch to batch mode)'
+    )
     parser.add_argument(
         '--output',
         help='Optional path for the generated JSON file (defaults to docs/waiver-reports/<tab name>.json)'
@@ -54,20 +77,114 @@ def parse_args():
         '--html-output',
         help='Optional explicit path for the HTML file (only used when --html is set)'
     )
-    return parser.parse_args()
+    parser.add_argument(
+        '--manifest',
+        help='Batch mode: file listing doc IDs/URLs (one per line, or a JSON list / {"W1": "<doc>"} object)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Batch mode: number of documents fetched concurrently (default: {DEFAULT_WORKERS})'
+    )
+    parser.add_argument(
+        '--output-dir',
+        help='Batch mode: directory for generated files (defaults to docs/waiver-reports/)'
+    )
+    parser.add_argument(
+        '--overwrite',
+        action='store_true',
+        help='Batch mode: replace existing <tab name>.json/.html files instead of adding a numbered suffix'
+    )
+    parser.add_argument(
+        '--print-revision',
+        action='store_true',
+        help="Print the document's current revision ID and exit (a cache key for the pipeline)"
+    )
+    args = parser.parse_args()
 
+    if not args.source_doc and not args.manifest:
+        parser.error('provide a source_doc or --manifest')
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+
+    batch_mode = bool(args.manifest) or len(args.source_doc) > 1
+    if batch_mode and (args.output or args.html_output):
+        parser.error('--output/--html-output apply to a single document; use --output-dir in batch mode')
+    if not batch_mode and (args.output_dir or args.overwrite):
+        parser.error('--output-dir/--overwrite only apply in batch mode (several documents or --manifest)')
+
+    if args.print_revision and (batch_mode or args.output or args.html):
+        parser.error('--print-revision takes a single document and no output options')
+
+    args.batch_mode = batch_mode
+    return args
+
+
+def load_manifest(path: Path) -> List[str]:
+    """Read doc IDs/URLs from a manifest file.
+
+    Accepts a JSON list, a JSON object whose values are the docs (keys are labels such as "W1"),
+    or plain text with one doc per line ('#' starts a comment).
+    """
+    text = path.read_text(encoding='utf-8')
+
+    if path.suffix.lower() == '.json':
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return [str(value) for value in data.values()]
+        if isinstance(data, list):
+            return [str(value) for value in data]
+        raise ValueError(f"Manifest '{path}' must contain a JSON list or object")
+
+    docs = []
+    for line in text.splitlines():
+        entry = line.split('#', 1)[0].strip()
+        if entry:
+            docs.append(entry)
+    return docs
 
-def main():
-    args = parse_args()
 
+@traced()
+def write_report_files(
+    metadata: Dict[str, Any],
+    rows: List[Dict[str, Any]],
+    output_path: Path,
+    html_path: Optional[Path]
+) -> None:
+    """Write the JSON payload atomically (temp file + rename), then the optional HTML preview."""
+    temp_path = output_path.with_name(f"weekly waivers {uuid.uuid4().hex[:8]}.json")
+
+    write_json_report(str(temp_path), metadata, rows)
+
+    try:
+        temp_path.replace(output_path)
+    except OSError as err:
+        raise RuntimeError(f"Error renaming '{temp_path}' to '{output_path}': {err}") from err
+
+    if html_path is not None:
+        html_content = render_rows_to_html(metadata, rows)
+        html_path.write_text(html_content, encoding='utf-8')
+
+
+@traced()
+def run_single(args) -> None:
     try:
-        doc_id = extract_id_from_url(args.source_doc)
+        doc_id = extract_id_from_url(args.source_doc[0])
     except ValueError as err:
         print(f'Error: {err}')
         raise SystemExit(1)
 
-    creds = get_credentials(['https://www.googleapis.com/auth/documents.readonly'], app_name='fantasy-football-tools')
-    docs_service = build('docs', 'v1', credentials=creds)
+    creds = get_credentials(DOCS_SCOPES, app_name='fantasy-football-tools')
+    docs_service = build_service('docs', 'v1', creds)
+
+    if args.print_revision:
+        try:
+            print(read_doc_revision(docs_service, doc_id))
+        except RuntimeError as err:
+            print(f'Error: {err}', file=sys.stderr)
+            raise SystemExit(1)
+        return
 
     print(f'Reading Google Doc {doc_id} ...')
     first_line, lines, nesting_levels = read_week_doc(docs_service, doc_id)
@@ -88,40 +205,185 @@ def main():
         suggested_name = f"{tab_name}.json" if tab_name else 'weekly waivers.json'
         output_path = ensure_unique_path(default_dir / suggested_name)
 
-    temp_path = output_path.with_name(f"weekly waivers {uuid.uuid4().hex[:8]}.json")
+    html_path = None
+    if args.html:
+        if args.html_output:
+            html_path = Path(args.html_output)
+            html_path.parent.mkdir(parents=True, exist_ok=True)
+            if html_path.exists():
+                print(f"Error: HTML output file '{html_path}' already exists. Delete it or specify another path.")
+                raise SystemExit(1)
+        else:
+            html_path = ensure_unique_path(output_path.parent / (output_path.stem + '.html'))
 
     metadata = {
         'tab_name': tab_name,
         'source_doc_id': doc_id,
     }
 
-    write_json_report(str(temp_path), metadata, rows)
-
     try:
-        temp_path.replace(output_path)
-    except OSError as err:
-        print(f"Error renaming '{temp_path}' to '{output_path}': {err}")
+        write_report_files(metadata, rows, output_path, html_path)
+    except RuntimeError as err:
+        print(f'Error: {err}')
         raise SystemExit(1)
 
     print(f'JSON report written to {output_path.resolve()}')
+    if html_path is not None:
+        print(f'HTML preview written to {html_path.resolve()}')
 
-    if args.html:
-        if args.html_output:
-            html_path = Path(args.html_output)
-            html_path.parent.mkdir(parents=True, exist_ok=True)
-            if html_path.exists():
-                print(f"Error: HTML output file '{html_path}' already exists. Delete it or specify another path.")
-                raise SystemExit(1)
+
+class OutputPathReserver:
+    """Hands out unique output paths to concurrent workers.
+
+    ensure_unique_path only looks at the filesystem, so two workers that detect the same tab name
+    could otherwise pick the same file before either one has written it.
+    """
+
+    def __init__(self, output_dir: Path, overwrite: bool):
+        self.output_dir = output_dir
+        self.overwrite = overwrite
+        self._reserved: Set[Path] = set()
+        self._lock = threading.Lock()
+
+    def reserve(self, stem: str, with_html: bool) -> Dict[str, Optional[Path]]:
+        with self._lock:
+            json_path = self._unique(self.output_dir / f'{stem}.json')
+            html_path = self._unique(self.output_dir / f'{json_path.stem}.html') if with_html else None
+            return {'json': json_path, 'html': html_path}
+
+    def _unique(self, path: Path) -> Path:
+        candidate = path
+        counter = 2
+        while candidate in self._reserved or (not self.overwrite and candidate.exists()):
+            candidate = path.with_name(f'{path.stem} ({counter}){path.suffix}')
+            counter += 1
+        self._reserved.add(candidate)
+        return candidate
+
+
+@traced()
+def export_doc(
+    doc_id: str,
+    creds,
+    local: threading.local,
+    reserver: OutputPathReserver,
+    with_html: bool
+) -> Dict[str, Any]:
+    """Fetch, process and write one document. Runs on a worker thread."""
+    started = time.perf_counter()
+
+    # googleapiclient service objects are not thread-safe, so every worker keeps its own
+    docs_service = getattr(local, 'docs_service', None)
+    if docs_service is None:
+        docs_service = build_service('docs', 'v1', creds)
+        local.docs_service = docs_service
+
+    first_line, lines, nesting_levels = read_week_doc(docs_service, doc_id)
+    tab_name = extract_tab_name_from_doc(first_line)
+    rows = process_document(lines, nesting_levels)
+
+    paths = reserver.reserve(tab_name or 'weekly waivers', with_html)
+    metadata = {
+        'tab_name': tab_name,
+        'source_doc_id': doc_id,
+    }
+    write_report_files(metadata, rows, paths['json'], paths['html'])
+
+    return {
+        'tab_name': tab_name,
+        'rows': len(rows),
+        'json_path': paths['json'],
+        'html_path': paths['html'],
+        'seconds': time.perf_counter() - started,
+    }
+
+
+@traced()
+def run_batch(args) -> None:
+    sources: List[str] = list(args.source_doc)
+    if args.manifest:
+        manifest_path = Path(args.manifest)
+        if not manifest_path.exists():
+            print(f"Error: Manifest file '{manifest_path}' does not exist.")
+            raise SystemExit(1)
+        try:
+            sources.extend(load_manifest(manifest_path))
+        except (ValueError, json.JSONDecodeError) as err:
+            print(f'Error: {err}')
+            raise SystemExit(1)
+
+    doc_ids: List[str] = []
+    for source in sources:
+        try:
+            doc_id = extract_id_from_url(source)
+        except ValueError as err:
+            print(f'Error: {err}')
+            raise SystemExit(1)
+        if doc_id not in doc_ids:
+            doc_ids.append(doc_id)
+
+    if not doc_ids:
+        print('Error: No documents to process.')
+        raise SystemExit(1)
+
+    creds = get_credentials(DOCS_SCOPES, app_name='fantasy-football-tools')
+
+    output_dir = Path(args.output_dir) if args.output_dir else DEFAULT_REPORT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+    reserver = OutputPathReserver(output_dir, args.overwrite)
+    local = threading.local()
+
+    workers = min(args.workers, len(doc_ids))
+    print(f'Processing {len(doc_ids)} documents with {workers} workers ...')
+
+    started = time.perf_counter()
+    results: Dict[str, Dict[str, Any]] = {}
+    failures: Dict[str, str] = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(in_current_span(export_doc), doc_id, creds, local, reserver, args.html): doc_id
+            for doc_id in doc_ids
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            doc_id = futures[future]
+            try:
+                result = future.result()
+            except Exception as err:
+                failures[doc_id] = str(err)
+                print(f'[{done}/{len(doc_ids)}] FAILED {doc_id}: {err}')
+                continue
+            results[doc_id] = result
+            print(f"[{done}/{len(doc_ids)}] {result['tab_name']}: {result['rows']} rows "
+                  f"-> {result['json_path'].name} ({result['seconds']:.1f}s)")
+
+    elapsed = time.perf_counter() - started
+
+    print()
+    print('Summary:')
+    for doc_id in doc_ids:
+        if doc_id in results:
+            result = results[doc_id]
+            outputs = [str(result['json_path'].resolve())]
+            if result['html_path'] is not None:
+                outputs.append(str(result['html_path'].resolve()))
+            print(f"  {result['tab_name']:<16} {', '.join(outputs)}")
         else:
-            html_dir = output_path.parent
-            html_name = output_path.stem + '.html'
-            html_path = ensure_unique_path(html_dir / html_name)
+            print(f'  FAILED           {doc_id}: {failures[doc_id]}')
+    print(f'{len(results)} succeeded, {len(failures)} failed in {elapsed:.1f}s')
 
-        html_content = render_rows_to_html(metadata, rows)
-        html_path.write_text(html_content, encoding='utf-8')
-        print(f'HTML preview written to {html_path.resolve()}')
+    if failures:
+        raise SystemExit(1)
+
+
+def main():
+    args = parse_args()
+
+    if args.batch_mode:
+        run_batch(args)
+    else:
+        run_single(args)
 
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,139 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+ROOT_DIR = TOOLS_DIR.parent
+
+# Add script directory to sys.path for local waiver_lib imports
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script, traced
+trace_script(__file__)
+
+from lib.fantasypros import POSITIONS, add_fantasypros_args, fetch_rankings
+from lib.ownership import Ownership, load_ownership
+from waiver_lib.waiver_index import find_report_files, week_from_tab_name
+from waiver_lib.waiver_processing import extract_recommendations, load_rows_from_json
+
+DEFAULT_REPORT_DIR = ROOT_DIR / 'docs' / 'waiver-reports'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Who owns each player in a waiver report, per league (FA / My Team / owning team)'
+    )
+    parser.add_argument('json_path', nargs='?', help='Waiver report JSON (default: the latest week in docs/waiver-reports/)')
+    parser.add_argument(
+        '--roster',
+        action='append',
+        required=True,
+        help='League roster JSON (FantasyPros getLeagueRostersJSON response) as PATH or NAME=PATH; repeat for several leagues'
+    )
+    parser.add_argument('--available-only', action='store_true', help='Only recommendations unrostered in at least one league')
+    parser.add_argument('--json', action='store_true', help='Print the annotated recommendations as JSON')
+    add_fantasypros_args(parser)
+    return parser.parse_args()
+
+
+def latest_report(report_dir: Path) -> Path:
+    reports = find_report_files(report_dir)
+    if not reports:
+        raise RuntimeError(f"No waiver reports in '{report_dir}'")
+    return max(reports, key=lambda path: (week_from_tab_name(path.stem) or 0, path.name))
+
+
+@traced()
+def load_ownership_index(args) -> Ownership:
+    """Rosters plus the FantasyPros ROS name -> player ID index used to match report names."""
+    ownership = load_ownership(args.roster)
+    results = fetch_rankings(args, [('ROS', position) for position in POSITIONS])
+    ownership.index_rankings(results.values())
+    return ownership
+
+
+def format_faab(record) -> str:
+    if record.get('faab_min') is None:
+        return '-'
+    if record['faab_min'] == record['faab_max']:
+        return f"{record['faab_min']}%"
+    return f"{record['faab_min']}-{record['faab_max']}%"
+
+
+def main():
+    args = parse_args()
+    try:
+        report_path = Path(args.json_path) if args.json_path else latest_report(DEFAULT_REPORT_DIR)
+        if not report_path.exists():
+            print(f"Error: JSON file '{report_path}' does not exist.")
+            raise SystemExit(1)
+        ownership = load_ownership_index(args)
+    except RuntimeError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
+
+    payload = load_rows_from_json(str(report_path))
+    records = payload.get('recommendations')
+    if records is None:
+        records = extract_recommendations(payload.get('rows', []))
+
+    leagues = list(ownership.leagues)
+    pickups = []
+    my_drops = []
+    unmatched = []
+    for record in records:
+        player_id = ownership.player_id_for(record['player'], record.get('position'))
+        if player_id is None:
+            unmatched.append(record['player'])
+        if record.get('drop'):
+            # Drop candidates only matter if they are on one of my teams
+            mine = [league for league in leagues if ownership.is_mine(player_id, league)]
+            if mine:
+                my_drops.append(dict(record, leagues=mine))
+            continue
+        if args.available_only and (player_id is None or not ownership.is_available(player_id)):
+            continue
+        pickups.append(dict(record, player_id=player_id, owners=dict(zip(leagues, ownership.labels(player_id)))))
+
+    tab_name = payload.get('metadata', {}).get('tab_name') or report_path.stem
+    if args.json:
+        print(json.dumps({
+            'report': tab_name,
+            'leagues': leagues,
+            'pickups': pickups,
+            'my_drop_candidates': my_drops,
+            'unmatched': sorted(set(unmatched)),
+        }, indent=2, ensure_ascii=False))
+        return
+
+    print(f"{tab_name}: {len(pickups)} pickups{' (available only)' if args.available_only else ''}")
+    owner_headers = ownership.column_headers()
+    widths = [max([len(header)] + [len(record['owners'][league]) for record in pickups]) for header, league in zip(owner_headers, leagues)]
+    owner_columns = '  '.join(f'{header:<{width}}' for header, width in zip(owner_headers, widths))
+    print(f"{'Player':<26} {'Pos':<4} {'FAAB':<8} {owner_columns}".rstrip())
+    for record in pickups:
+        owners = '  '.join(f"{record['owners'][league] or '?':<{width}}" for league, width in zip(leagues, widths))
+        print(f"{record['player']:<26} {record.get('position') or '':<4} {format_faab(record):<8} {owners}".rstrip())
+
+    if my_drops:
+        print()
+        print('On the drop list and on your roster:')
+        for record in my_drops:
+            print(f"  {record['player']:<26} {', '.join(record['leagues'])}")
+
+    if unmatched:
+        print()
+        print(f"Not matched to a FantasyPros player ({len(set(unmatched))}): {', '.join(sorted(set(unmatched)))}")
+
+
+if __name__ == '__main__':
+    main()
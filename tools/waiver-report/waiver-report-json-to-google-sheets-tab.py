@@ -1,6 +1,7 @@
 import argparse
 import json
 import sys
+import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
@@ -8,34 +9,43 @@ from typing import Any, Dict, List, Tuple
 SCRIPT_DIR = Path(__file__).resolve().parent
 TOOLS_DIR = SCRIPT_DIR.parent
 
-# Add script directory to sys.path for local lib imports
+# Add script directory to sys.path for local waiver_lib imports
 if str(SCRIPT_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPT_DIR))
 
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Hand this run to the tools daemon if one is running (returns if not)
+from lib.tools_daemon import delegate_to_daemon
+delegate_to_daemon(__file__)
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script, traced
+trace_script(__file__)
+
 try:
-    from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
 except ModuleNotFoundError as err:
     print('Error: google-api-python-client is not installed.')
     print('Run "pip install google-api-python-client google-auth-oauthlib google-auth"')
     raise SystemExit(1) from err
 
-# Import google_auth_utils from editable package
-from google_auth_utils import get_credentials
-
-# Import from local lib (tools/waiver-report/lib/)
-from lib.waiver_processing import extract_id_from_url, load_rows_from_json
-from lib.sheets_utils import (
-    ensure_grid_with_boundary,
-    initialize_tab,
-    auto_resize_rows,
-    add_tab,
-    rename_tab,
-    create_temp_tab,
-    delete_tab,
+from lib.google_clients import build_service, get_credentials
+
+# Import from local waiver_lib (tools/waiver-report/waiver_lib/)
+from waiver_lib.waiver_processing import extract_id_from_url, load_rows_from_json
+from waiver_lib.sheets_utils import (
+    initialize_tab_requests,
+    boundary_requests,
+    auto_resize_rows_request,
+    rename_tab_request,
 )
+from lib.sheet_templates import get_tab_properties, tab_from_template_requests, unused_tab_id
 
 CONFIG_FILE = SCRIPT_DIR / 'waiver-report-sheets.json'
+TEMPLATE_TAB_NAME = 'waiver report template'
 
 
 def load_config() -> Dict[str, Any]:
@@ -98,41 +108,81 @@ def build_cell_data(cell: Dict[str, Any]) -> Dict[str, Any]:
     return cell_data
 
 
-def write_rows_to_sheet(sheets_service, sheet_id: str, tab_id: int, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+@traced()
+def rows_update_request(tab_id: int, rows: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], int, int]:
+    """Build a single updateCells request covering every row. Returns (request, data_rows, data_cols)."""
     data_rows = len(rows)
     data_cols = max((len(row.get('cells', [])) for row in rows), default=1)
 
-    requests: List[Dict[str, Any]] = []
+    row_data: List[Dict[str, Any]] = []
 
-    for row_index, row in enumerate(rows):
+    for row in rows:
         cells = row.get('cells', [])
         cell_values = []
         for cell in cells:
             cell_values.append(build_cell_data(cell))
         while len(cell_values) < data_cols:
             cell_values.append({'userEnteredValue': {'stringValue': ''}, 'userEnteredFormat': {'wrapStrategy': 'WRAP'}, 'textFormatRuns': []})
+        row_data.append({'values': cell_values})
+
+    request = {
+        'updateCells': {
+            'range': {
+                'sheetId': tab_id,
+                'startRowIndex': 0,
+                'endRowIndex': data_rows,
+                'startColumnIndex': 0,
+                'endColumnIndex': data_cols
+            },
+            'rows': row_data,
+            'fields': 'userEnteredValue,userEnteredFormat.wrapStrategy,textFormatRuns'
+        }
+    }
 
-        requests.append({
-            'updateCells': {
-                'range': {
-                    'sheetId': tab_id,
-                    'startRowIndex': row_index,
-                    'endRowIndex': row_index + 1,
-                    'startColumnIndex': 0,
-                    'endColumnIndex': data_cols
-                },
-                'rows': [{'values': cell_values}],
-                'fields': 'userEnteredValue,userEnteredFormat.wrapStrategy,textFormatRuns'
-            }
-        })
-
-    if requests:
-        sheets_service.spreadsheets().batchUpdate(
-            spreadsheetId=sheet_id,
-            body={'requests': requests}
-        ).execute()
-
-    return data_rows, data_cols
+    return request, data_rows, data_cols
+
+
+def template_format_requests(template_id: int) -> List[Dict[str, Any]]:
+    """Formatting baked into the hidden waiver template tab (wide wrapped column A, 2px boundary)."""
+    requests = initialize_tab_requests(template_id)
+    requests.extend(boundary_requests(template_id, data_rows=1, data_cols=1))
+    return requests
+
+
+@traced()
+def publish_requests(
+    tabs: Dict[str, Dict[str, Any]],
+    tab_id: int,
+    temp_tab_name: str,
+    tab_name: str,
+    rows: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """All requests for one publish, in order: copy the template, size it, write, resize, rename.
+
+    Sent as a single batchUpdate, which Google Sheets applies atomically: either the finished
+    tab appears under its final name or nothing changes (no half-written temp tab to clean up).
+    The template tab is created inside the same batch the first time it is needed.
+    """
+    rows_request, data_rows, data_cols = rows_update_request(tab_id, rows)
+
+    requests = tab_from_template_requests(tabs, TEMPLATE_TAB_NAME, template_format_requests, tab_id, temp_tab_name)
+    requests.append({
+        'updateSheetProperties': {
+            'properties': {
+                'sheetId': tab_id,
+                'gridProperties': {
+                    'rowCount': data_rows + 1,
+                    'columnCount': data_cols + 1
+                }
+            },
+            'fields': 'gridProperties.rowCount,gridProperties.columnCount'
+        }
+    })
+    requests.extend(boundary_requests(tab_id, data_rows, data_cols))
+    requests.append(rows_request)
+    requests.append(auto_resize_rows_request(tab_id, data_rows))
+    requests.append(rename_tab_request(tab_id, tab_name))
+    return requests
 
 
 def parse_args() -> argparse.Namespace:
@@ -165,36 +215,37 @@ def main():
     tab_name = args.tab_name or metadata.get('tab_name', 'weekly waivers')
 
     creds = get_credentials(['https://www.googleapis.com/auth/spreadsheets'], app_name='fantasy-football-tools')
-    sheets_service = build('sheets', 'v4', credentials=creds)
+    sheets_service = build_service('sheets', 'v4', creds)
 
-    tab_id = None
-    temp_tab_name = None
-    finalized = False
     try:
-        tab_id, temp_tab_name = create_temp_tab(sheets_service, sheet_id)
-        print(f"Temporary tab '{temp_tab_name}' created")
-        initialize_tab(sheets_service, sheet_id, tab_id, temp_tab_name)
+        tabs = get_tab_properties(sheets_service, sheet_id)
+    except RuntimeError as err:
+        print(f'Error: {err}')
+        raise SystemExit(1)
 
-        pre_rows = len(rows)
-        pre_cols = max((len(row.get('cells', [])) for row in rows), default=1)
-        ensure_grid_with_boundary(sheets_service, sheet_id, tab_id, pre_rows, pre_cols)
+    if tab_name in tabs:
+        print(f"Error: Tab '{tab_name}' already exists. Rename or remove it before running this script.")
+        raise SystemExit(1)
 
-        data_rows, data_cols = write_rows_to_sheet(sheets_service, sheet_id, tab_id, rows)
-        auto_resize_rows(sheets_service, sheet_id, tab_id, data_rows)
+    if TEMPLATE_TAB_NAME not in tabs:
+        print(f"Template tab '{TEMPLATE_TAB_NAME}' not found; it will be created (hidden)")
 
-        rename_tab(sheets_service, sheet_id, tab_id, tab_name)
-        print(f"Tab renamed to '{tab_name}'")
+    tab_id = unused_tab_id(tabs)
+    temp_tab_name = f"weekly waivers {uuid.uuid4().hex[:8]}"
 
-        print('Done! View the sheet at:')
-        print(f'https://docs.google.com/spreadsheets/d/{sheet_id}')
-        finalized = True
+    try:
+        sheets_service.spreadsheets().batchUpdate(
+            spreadsheetId=sheet_id,
+            body={'requests': publish_requests(tabs, tab_id, temp_tab_name, tab_name, rows)}
+        ).execute()
     except HttpError as err:
         print(f"Google Sheets API error ({err.resp.status}): {err}")
-        finalized = False
         raise SystemExit(1)
-    finally:
-        if tab_id and temp_tab_name and not finalized:
-            delete_tab(sheets_service, sheet_id, temp_tab_name)
+
+    print(f"Tab '{tab_name}' published ({len(rows)} rows)")
+    print('Done! View the sheet at:')
+    print(f'https://docs.google.com/spreadsheets/d/{sheet_id}')
+
 
 if __name__ == '__main__':
     main()
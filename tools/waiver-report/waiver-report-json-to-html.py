@@ -1,10 +1,27 @@
 import argparse
+import sys
 from pathlib import Path
 
-from lib.file_utils import ensure_unique_path
-from lib.waiver_processing import load_rows_from_json, render_rows_to_html
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+ROOT_DIR = TOOLS_DIR.parent
+
+# Add script directory to sys.path for local waiver_lib imports
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script
+trace_script(__file__)
+
+from waiver_lib.file_utils import ensure_unique_path
+from waiver_lib.waiver_processing import load_rows_from_json, render_rows_to_html
 
-ROOT_DIR = Path(__file__).resolve().parents[2]
 DEFAULT_REPORT_DIR = ROOT_DIR / 'docs' / 'waiver-reports'
 
 
@@ -0,0 +1,91 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+ROOT_DIR = TOOLS_DIR.parent
+
+# Add script directory to sys.path for local waiver_lib imports
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script
+trace_script(__file__)
+
+from waiver_lib.waiver_index import open_index
+
+DEFAULT_REPORT_DIR = ROOT_DIR / 'docs' / 'waiver-reports'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Search the archived waiver report JSON files (e.g. which weeks was a player recommended, and at what FAAB %)'
+    )
+    parser.add_argument('query', nargs='+', help='Search terms; every term must appear in the same segment')
+    parser.add_argument(
+        '--report-dir',
+        help='Directory holding the waiver report JSON files (defaults to docs/waiver-reports/)'
+    )
+    parser.add_argument(
+        '--index',
+        help='Path of the persisted index (defaults to <report dir>/.waiver-index.json)'
+    )
+    parser.add_argument(
+        '--players-only',
+        action='store_true',
+        help='Only show hits in player rows that carry a FAAB recommendation'
+    )
+    parser.add_argument('--json', action='store_true', help='Print hits as JSON instead of a table')
+    return parser.parse_args()
+
+
+def format_faab(hit) -> str:
+    if hit['faab_min'] is None:
+        return ''
+    if hit['faab_min'] == hit['faab_max']:
+        return f"{hit['faab_min']}%"
+    return f"{hit['faab_min']}-{hit['faab_max']}%"
+
+
+def main():
+    args = parse_args()
+
+    report_dir = Path(args.report_dir) if args.report_dir else DEFAULT_REPORT_DIR
+    if not report_dir.is_dir():
+        print(f"Error: Report directory '{report_dir}' does not exist.")
+        raise SystemExit(1)
+
+    started = time.perf_counter()
+    index = open_index(report_dir, Path(args.index) if args.index else None)
+    indexed = time.perf_counter()
+
+    hits = index.search(' '.join(args.query))
+    if args.players_only:
+        hits = [hit for hit in hits if hit['player'] is not None]
+    searched = time.perf_counter()
+
+    if args.json:
+        print(json.dumps(hits, indent=2, ensure_ascii=False))
+        return
+
+    for hit in hits:
+        week = f"W{hit['week']}" if hit['week'] is not None else hit['tab_name']
+        # Multi-line segments (merged bullets) are shown on one line
+        text = ' / '.join(line.strip() for line in hit['text'].splitlines() if line.strip())
+        print(f"{week:<5} row {hit['row']:<3} {format_faab(hit):<7} {hit['player'] or '':<24} {text}")
+
+    print(f'{len(hits)} hits across {len({hit["file"] for hit in hits})} reports '
+          f'(index {1000 * (indexed - started):.0f} ms, query {1000 * (searched - indexed):.1f} ms)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Determine paths
+SCRIPT_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = SCRIPT_DIR.parent
+ROOT_DIR = TOOLS_DIR.parent
+
+# Add script directory to sys.path for local waiver_lib imports
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+# Add tools directory to sys.path for shared lib imports
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+# Record trace spans when FF_TRACE_FILE is set
+from lib.tracing import trace_script
+trace_script(__file__)
+
+from waiver_lib.waiver_season import load_season_summary
+
+DEFAULT_REPORT_DIR = ROOT_DIR / 'docs' / 'waiver-reports'
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'DST']
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Season FAAB aggregates from the archived waiver reports (weeks recommended, average/max FAAB, position trends)'
+    )
+    parser.add_argument('--player', help='Show a single player (case-insensitive substring match)')
+    parser.add_argument('--position', choices=POSITIONS, help='Limit the player table to one position')
+    parser.add_argument('--top', type=int, default=25, help='Number of players to list (default: 25)')
+    parser.add_argument(
+        '--sort',
+        choices=['max', 'avg', 'weeks'],
+        default='max',
+        help='Player ordering: max FAAB, average FAAB upper bound, or weeks recommended (default: max)'
+    )
+    parser.add_argument(
+        '--report-dir',
+        help='Directory holding the waiver report JSON files (defaults to docs/waiver-reports/)'
+    )
+    parser.add_argument('--rebuild', action='store_true', help='Recompute the cached aggregates even if no report changed')
+    parser.add_argument('--json', action='store_true', help='Print the selected aggregates as JSON')
+    return parser.parse_args()
+
+
+def format_range(low, high) -> str:
+    if low is None:
+        return '-'
+    if low == high:
+        return f'{low}%'
+    return f'{low}-{high}%'
+
+
+def main():
+    args = parse_args()
+
+    report_dir = Path(args.report_dir) if args.report_dir else DEFAULT_REPORT_DIR
+    if not report_dir.is_dir():
+        print(f"Error: Report directory '{report_dir}' does not exist.")
+        raise SystemExit(1)
+
+    summary = load_season_summary(report_dir, rebuild=args.rebuild)
+    players = summary['players']
+
+    selected = {
+        name: entry for name, entry in players.items()
+        if entry['weeks_recommended']
+        and (not args.position or entry['position'] == args.position)
+        and (not args.player or args.player.lower() in name.lower())
+    }
+    sort_keys = {
+        'max': lambda item: (item[1]['max_faab'] or 0, item[1]['avg_faab_max'] or 0),
+        'avg': lambda item: (item[1]['avg_faab_max'] or 0, item[1]['max_faab'] or 0),
+        'weeks': lambda item: (item[1]['weeks_recommended'], item[1]['max_faab'] or 0),
+    }
+    ranked = sorted(selected.items(), key=sort_keys[args.sort], reverse=True)[:args.top]
+
+    if args.json:
+        print(json.dumps({
+            'players': dict(ranked),
+            'positions': summary['positions'] if not args.position else {args.position: summary['positions'].get(args.position, {})},
+        }, indent=2, ensure_ascii=False))
+        return
+
+    print(f"{'Player':<26} {'Pos':<4} {'Weeks':<20} {'Avg FAAB':<12} {'Max':>5}  Dropped")
+    for name, entry in ranked:
+        weeks = ','.join(str(week) for week in entry['weeks'])
+        dropped = ','.join(str(week) for week in entry['drop_weeks'])
+        max_faab = f"{entry['max_faab']}%" if entry['max_faab'] is not None else '-'
+        print(f"{name:<26} {entry['position'] or '':<4} {weeks:<20} "
+              f"{format_range(entry['avg_faab_min'], entry['avg_faab_max']):<12} {max_faab:>5}  {dropped}")
+
+    if args.player:
+        return
+
+    print()
+    print('Position trends (recommendations / avg FAAB upper bound / max FAAB by week):')
+    for position in POSITIONS:
+        if args.position and position != args.position:
+            continue
+        trend = summary['positions'].get(position)
+        if not trend:
+            continue
+        cells = [
+            f"W{week}: {stats['count']}/{stats['avg_faab_max'] if stats['avg_faab_max'] is not None else '-'}"
+            f"/{stats['max_faab'] if stats['max_faab'] is not None else '-'}"
+            for week, stats in trend.items()
+        ]
+        print(f"  {position:<4} {'  '.join(cells)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+import importlib
+
+__all__ = ['file_utils', 'sheets_utils', 'waiver_index', 'waiver_processing', 'waiver_season']
+
+
+def __getattr__(name):
+    # Submodules load on first use so importing the package does not pull in the Google stack
+    if name in __all__:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
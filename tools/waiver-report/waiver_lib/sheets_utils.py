@@ -3,7 +3,10 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from googleapiclient.errors import HttpError
 
+from lib.tracing import traced
 
+
+@traced()
 def ensure_grid_with_boundary(sheets_service, sheet_id: str, tab_id: int, data_rows: int, data_cols: int) -> None:
     data_rows = max(1, data_rows)
     data_cols = max(1, data_cols)
@@ -57,35 +60,7 @@ def ensure_grid_with_boundary(sheets_service, sheet_id: str, tab_id: int, data_r
             }
         })
 
-    requests.append({
-        'updateDimensionProperties': {
-            'range': {
-                'sheetId': tab_id,
-                'dimension': 'ROWS',
-                'startIndex': data_rows,
-                'endIndex': data_rows + 1
-            },
-            'properties': {
-                'pixelSize': 2
-            },
-            'fields': 'pixelSize'
-        }
-    })
-
-    requests.append({
-        'updateDimensionProperties': {
-            'range': {
-                'sheetId': tab_id,
-                'dimension': 'COLUMNS',
-                'startIndex': data_cols,
-                'endIndex': data_cols + 1
-            },
-            'properties': {
-                'pixelSize': 2
-            },
-            'fields': 'pixelSize'
-        }
-    })
+    requests.extend(boundary_requests(tab_id, data_rows, data_cols))
 
     if requests:
         try:
@@ -99,10 +74,66 @@ def ensure_grid_with_boundary(sheets_service, sheet_id: str, tab_id: int, data_r
             ) from err
 
 
+@traced()
 def initialize_tab(sheets_service, sheet_id: str, tab_id: int, tab_name: str, column_width: int = 1500) -> None:
     ensure_grid_with_boundary(sheets_service, sheet_id, tab_id, data_rows=1, data_cols=1)
 
-    requests = [
+    sheets_service.spreadsheets().batchUpdate(
+        spreadsheetId=sheet_id,
+        body={'requests': initialize_tab_requests(tab_id, column_width)}
+    ).execute()
+
+
+@traced()
+def auto_resize_rows(sheets_service, sheet_id: str, tab_id: int, data_rows: int) -> None:
+    if data_rows <= 0:
+        return
+
+    sheets_service.spreadsheets().batchUpdate(
+        spreadsheetId=sheet_id,
+        body={'requests': [auto_resize_rows_request(tab_id, data_rows)]}
+    ).execute()
+
+
+def boundary_requests(tab_id: int, data_rows: int, data_cols: int) -> List[Dict[str, Any]]:
+    """Shrink the boundary row/column just past the data to 2 pixels."""
+    data_rows = max(1, data_rows)
+    data_cols = max(1, data_cols)
+
+    return [
+        {
+            'updateDimensionProperties': {
+                'range': {
+                    'sheetId': tab_id,
+                    'dimension': 'ROWS',
+                    'startIndex': data_rows,
+                    'endIndex': data_rows + 1
+                },
+                'properties': {
+                    'pixelSize': 2
+                },
+                'fields': 'pixelSize'
+            }
+        },
+        {
+            'updateDimensionProperties': {
+                'range': {
+                    'sheetId': tab_id,
+                    'dimension': 'COLUMNS',
+                    'startIndex': data_cols,
+                    'endIndex': data_cols + 1
+                },
+                'properties': {
+                    'pixelSize': 2
+                },
+                'fields': 'pixelSize'
+            }
+        }
+    ]
+
+
+def initialize_tab_requests(tab_id: int, column_width: int = 1500) -> List[Dict[str, Any]]:
+    return [
         {
             'updateDimensionProperties': {
                 'range': {
@@ -134,31 +165,33 @@ def initialize_tab(sheets_service, sheet_id: str, tab_id: int, tab_name: str, co
         }
     ]
 
-    sheets_service.spreadsheets().batchUpdate(
-        spreadsheetId=sheet_id,
-        body={'requests': requests}
-    ).execute()
 
+def auto_resize_rows_request(tab_id: int, data_rows: int) -> Dict[str, Any]:
+    return {
+        'autoResizeDimensions': {
+            'dimensions': {
+                'sheetId': tab_id,
+                'dimension': 'ROWS',
+                'startIndex': 0,
+                'endIndex': data_rows
+            }
+        }
+    }
 
-def auto_resize_rows(sheets_service, sheet_id: str, tab_id: int, data_rows: int) -> None:
-    if data_rows <= 0:
-        return
 
-    sheets_service.spreadsheets().batchUpdate(
-        spreadsheetId=sheet_id,
-        body={'requests': [{
-            'autoResizeDimensions': {
-                'dimensions': {
-                    'sheetId': tab_id,
-                    'dimension': 'ROWS',
-                    'startIndex': 0,
-                    'endIndex': data_rows
-                }
-            }
-        }]}
-    ).execute()
+def rename_tab_request(tab_id: int, new_title: str) -> Dict[str, Any]:
+    return {
+        'updateSheetProperties': {
+            'properties': {
+                'sheetId': tab_id,
+                'title': new_title
+            },
+            'fields': 'title'
+        }
+    }
 
 
+@traced()
 def add_tab(sheets_service, sheet_id: str, tab_name: str) -> int:
     spreadsheet = sheets_service.spreadsheets().get(
         spreadsheetId=sheet_id,
@@ -177,6 +210,7 @@ def add_tab(sheets_service, sheet_id: str, tab_name: str) -> int:
     return result['replies'][0]['addSheet']['properties']['sheetId']
 
 
+@traced()
 def rename_tab(sheets_service, sheet_id: str, tab_id: int, new_title: str) -> None:
     spreadsheet = sheets_service.spreadsheets().get(
         spreadsheetId=sheet_id,
@@ -190,15 +224,7 @@ def rename_tab(sheets_service, sheet_id: str, tab_id: int, new_title: str) -> No
 
     sheets_service.spreadsheets().batchUpdate(
         spreadsheetId=sheet_id,
-        body={'requests': [{
-            'updateSheetProperties': {
-                'properties': {
-                    'sheetId': tab_id,
-                    'title': new_title
-                },
-                'fields': 'title'
-            }
-        }]}
+        body={'requests': [rename_tab_request(tab_id, new_title)]}
     ).execute()
 
 
@@ -208,6 +234,7 @@ def create_temp_tab(sheets_service, sheet_id: str) -> Tuple[int, str]:
     return tab_id, temp_title
 
 
+@traced()
 def delete_tab(sheets_service, sheet_id: str, tab_name: str) -> None:
     try:
         spreadsheet = sheets_service.spreadsheets().get(spreadsheetId=sheet_id).execute()
@@ -0,0 +1,208 @@
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from lib.tracing import traced
+
+from .waiver_processing import load_rows_from_json, parse_faab_recommendation
+
+INDEX_VERSION = 1
+INDEX_FILE_NAME = '.waiver-index.json'
+
+# A posting is (report_id, row_index, segment_index)
+Posting = Tuple[int, int, int]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens; apostrophes are dropped so "Ja'Marr" and "JaMarr" match."""
+    text = text.lower().replace("'", '').replace('’', '')
+    return re.findall(r'[a-z0-9]+', text)
+
+
+def week_from_tab_name(tab_name: Optional[str]) -> Optional[int]:
+    match = re.search(r'\bW(\d+)\b', tab_name or '', re.IGNORECASE)
+    return int(match.group(1)) if match else None
+
+
+class WaiverIndex:
+    """Persisted inverted index (term -> (report, row, segment)) over archived waiver report JSON files.
+
+    Besides the postings, the index keeps every segment's text and each row's parsed FAAB
+    recommendation so queries never have to reopen the report files.
+    """
+
+    def __init__(self, index_path: Path):
+        self.index_path = Path(index_path)
+        self.reports: Dict[int, Dict[str, Any]] = {}
+        self.postings: Dict[str, Set[Posting]] = {}
+        self.next_report_id = 1
+
+    @classmethod
+    def load(cls, index_path: Path) -> 'WaiverIndex':
+        index = cls(index_path)
+        if not index.index_path.exists():
+            return index
+
+        try:
+            data = json.loads(index.index_path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            # A damaged index is rebuilt from the reports on the next update
+            return index
+
+        if data.get('version') != INDEX_VERSION:
+            return index
+
+        index.next_report_id = data.get('next_report_id', 1)
+        for report_id, report in data.get('reports', {}).items():
+            report['rows'] = {int(row): value for row, value in report.get('rows', {}).items()}
+            index.reports[int(report_id)] = report
+        for term, postings in data.get('postings', {}).items():
+            index.postings[term] = {tuple(posting) for posting in postings}
+        return index
+
+    def save(self) -> None:
+        data = {
+            'version': INDEX_VERSION,
+            'next_report_id': self.next_report_id,
+            'reports': {str(report_id): report for report_id, report in self.reports.items()},
+            'postings': {term: sorted(postings) for term, postings in sorted(self.postings.items())},
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        temp_path.write_text(json.dumps(data, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+        os.replace(temp_path, self.index_path)
+
+    def update(self, report_paths: Iterable[Path]) -> Dict[str, int]:
+        """Bring the index in line with report_paths.
+
+        Only files whose size or modification time changed are re-read; reports that no
+        longer exist are dropped. Returns counts of added, updated, removed and unchanged reports.
+        """
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+        by_file = {report['file']: report_id for report_id, report in self.reports.items()}
+        seen: Set[str] = set()
+
+        for path in sorted(Path(p) for p in report_paths):
+            key = str(path.resolve())
+            seen.add(key)
+            stat = path.stat()
+            report_id = by_file.get(key)
+
+            if report_id is not None:
+                report = self.reports[report_id]
+                if report['mtime_ns'] == stat.st_mtime_ns and report['size'] == stat.st_size:
+                    stats['unchanged'] += 1
+                    continue
+                self._remove_report(report_id)
+                stats['updated'] += 1
+            else:
+                stats['added'] += 1
+
+            self._add_report(path, key, stat)
+
+        for key, report_id in by_file.items():
+            if key not in seen:
+                self._remove_report(report_id)
+                stats['removed'] += 1
+
+        return stats
+
+    def _add_report(self, path: Path, key: str, stat: os.stat_result) -> None:
+        payload = load_rows_from_json(str(path))
+        metadata = payload.get('metadata', {})
+        rows = payload.get('rows', [])
+        tab_name = metadata.get('tab_name') or path.stem
+
+        report_id = self.next_report_id
+        self.next_report_id += 1
+
+        indexed_rows: Dict[int, Dict[str, Any]] = {}
+        for row_index, row in enumerate(rows):
+            cells = row.get('cells') or []
+            segments = cells[0].get('segments', []) if cells else []
+            texts = [segment.get('text', '') for segment in segments]
+            if not any(text.strip() for text in texts):
+                continue
+
+            entry: Dict[str, Any] = {'segments': texts}
+            faab = parse_faab_recommendation(texts[0]) if texts else None
+            if faab is not None:
+                entry['player'], entry['faab_min'], entry['faab_max'] = faab
+            indexed_rows[row_index] = entry
+
+            for segment_index, text in enumerate(texts):
+                for term in set(tokenize(text)):
+                    self.postings.setdefault(term, set()).add((report_id, row_index, segment_index))
+
+        self.reports[report_id] = {
+            'file': key,
+            'tab_name': tab_name,
+            'week': week_from_tab_name(tab_name) or week_from_tab_name(path.stem),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'rows': indexed_rows,
+        }
+
+    def _remove_report(self, report_id: int) -> None:
+        self.reports.pop(report_id, None)
+        for term in list(self.postings):
+            remaining = {posting for posting in self.postings[term] if posting[0] != report_id}
+            if remaining:
+                self.postings[term] = remaining
+            else:
+                del self.postings[term]
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Return segments containing every term of query, ordered by week then row.
+
+        Each hit carries week, tab_name, file, row, segment, text and, for player rows,
+        player/faab_min/faab_max parsed from the row header.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        # Intersect smallest posting lists first
+        posting_sets = sorted((self.postings.get(term, set()) for term in set(terms)), key=len)
+        matches = set(posting_sets[0])
+        for postings in posting_sets[1:]:
+            matches &= postings
+            if not matches:
+                break
+
+        hits = []
+        for report_id, row_index, segment_index in matches:
+            report = self.reports[report_id]
+            row = report['rows'][row_index]
+            hits.append({
+                'week': report['week'],
+                'tab_name': report['tab_name'],
+                'file': report['file'],
+                'row': row_index,
+                'segment': segment_index,
+                'text': row['segments'][segment_index],
+                'player': row.get('player'),
+                'faab_min': row.get('faab_min'),
+                'faab_max': row.get('faab_max'),
+            })
+
+        hits.sort(key=lambda hit: (hit['week'] is None, hit['week'] or 0, hit['tab_name'], hit['row'], hit['segment']))
+        return hits
+
+
+def find_report_files(report_dir: Path) -> List[Path]:
+    return sorted(path for path in Path(report_dir).glob('*.json') if not path.name.startswith('.'))
+
+
+@traced()
+def open_index(report_dir: Path, index_path: Optional[Path] = None, refresh: bool = True) -> WaiverIndex:
+    """Load the index for report_dir (default file: <report_dir>/.waiver-index.json), refreshing it incrementally."""
+    index_path = Path(index_path) if index_path else Path(report_dir) / INDEX_FILE_NAME
+    index = WaiverIndex.load(index_path)
+    if refresh:
+        stats = index.update(find_report_files(report_dir))
+        if stats['added'] or stats['updated'] or stats['removed'] or not index_path.exists():
+            index.save()
+    return index
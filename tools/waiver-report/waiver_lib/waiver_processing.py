@@ -3,10 +3,12 @@ import os
 import re
 import html
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from googleapiclient.errors import HttpError
 
+from lib.tracing import traced
+
 
 def extract_id_from_url(url_or_id: str, *, allow_gid: bool = True) -> str:
     if not ('/' in url_or_id or ':' in url_or_id):
@@ -58,6 +60,21 @@ def transform_player_name(line: str) -> str:
     return line.strip()
 
 
+def parse_faab_recommendation(text: str) -> Optional[Tuple[str, int, int]]:
+    """Parse transform_player_name output back into (player_name, faab_min, faab_max).
+
+    "10-50% - Player Name" -> ('Player Name', 10, 50); "10% - Player Name" -> ('Player Name', 10, 10).
+    Returns None for text without a leading FAAB percentage.
+    """
+    match = re.match(r'^(\d+)(?:-(\d+))?%\s*-\s*(.+)$', text.strip())
+    if not match:
+        return None
+
+    faab_min = int(match.group(1))
+    faab_max = int(match.group(2)) if match.group(2) else faab_min
+    return match.group(3).strip(), faab_min, faab_max
+
+
 def extract_text_from_doc_elements(elements: Sequence[Dict[str, Any]]) -> List[Tuple[str, int]]:
     lines: List[Tuple[str, int]] = []
 
@@ -101,6 +118,19 @@ def extract_text_from_doc_elements(elements: Sequence[Dict[str, Any]]) -> List[T
     return lines
 
 
+@traced()
+def read_doc_revision(docs_service, doc_id: str) -> str:
+    """Current revision ID of a Google Doc (changes whenever the document does), without its content."""
+    try:
+        doc = docs_service.documents().get(documentId=doc_id, fields='revisionId').execute()
+    except HttpError as err:
+        raise RuntimeError(
+            f"Unable to read revision of Google Doc '{doc_id}'. Status: {err.resp.status}"
+        ) from err
+    return doc.get('revisionId', '')
+
+
+@traced()
 def read_week_doc(docs_service, doc_id: str) -> Tuple[str, List[str], List[int]]:
     try:
         doc = docs_service.documents().get(documentId=doc_id).execute()
@@ -152,6 +182,7 @@ def normalize_note_text(text: str) -> str:
     return stripped
 
 
+@traced()
 def process_document(lines: List[str], nesting_levels: List[int]) -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
 
@@ -409,16 +440,106 @@ def process_document(lines: List[str], nesting_levels: List[int]) -> List[Dict[s
     return rows
 
 
+POSITION_SECTIONS = [
+    (r'^RUNNING BACKS:?$', 'RB'),
+    (r'^WIDE RECEIVERS:?$', 'WR'),
+    (r'^TIGHT ENDS:?$', 'TE'),
+    (r'^QUARTERBACKS:?$', 'QB'),
+    (r'^DEFENSES?:?$', 'DST'),
+    (r'^DST:?$', 'DST'),
+]
+
+
+def extract_recommendations(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Structured records for every player row and drop-list entry in processed rows.
+
+    Works on process_document output and on rows loaded from archived JSON reports.
+    Each record has player, position (RB/WR/TE/QB/DST, None on the drop list), faab_min,
+    faab_max (None when no percentage was given), drop and notes.
+    """
+    records: List[Dict[str, Any]] = []
+    position: Optional[str] = None
+    in_drop_section = False
+
+    for row in rows:
+        cells = row.get('cells') or []
+        segments = cells[0].get('segments', []) if cells else []
+        if not segments:
+            continue
+
+        first = segments[0]
+        text = first.get('text', '').strip()
+
+        if first.get('bold') and len(segments) == 1:
+            section = next(
+                (code for pattern, code in POSITION_SECTIONS if re.match(pattern, text, re.IGNORECASE)),
+                None
+            )
+            if section is not None:
+                position = section
+                in_drop_section = False
+                continue
+            if 'DROP LIST' in text.upper():
+                position = None
+                in_drop_section = True
+                continue
+            if re.match(r'^WEEK \d+', text, re.IGNORECASE):
+                position = None
+                in_drop_section = False
+                continue
+
+        if in_drop_section:
+            if not text.startswith('•'):
+                continue
+            entry = text.lstrip('•').strip()
+            notes = []
+            match = re.match(r'^(.*?)\s*\((.*)\)$', entry)
+            if match:
+                entry, notes = match.group(1), [match.group(2)]
+            records.append({
+                'player': entry,
+                'position': None,
+                'faab_min': None,
+                'faab_max': None,
+                'drop': True,
+                'notes': notes,
+            })
+            continue
+
+        if position is None or not first.get('bold'):
+            continue
+
+        faab = parse_faab_recommendation(text)
+        player, faab_min, faab_max = faab if faab is not None else (text, None, None)
+        notes = [
+            segment.get('text', '').lstrip('•').strip()
+            for segment in segments[1:]
+            if segment.get('text', '').strip()
+        ]
+        records.append({
+            'player': player,
+            'position': position,
+            'faab_min': faab_min,
+            'faab_max': faab_max,
+            'drop': False,
+            'notes': notes,
+        })
+
+    return records
+
+
 def rows_to_json(metadata: Dict[str, Any], rows: List[Dict[str, Any]]) -> Dict[str, Any]:
     return {
         'metadata': {
             **metadata,
             'generated_at': datetime.now(timezone.utc).isoformat()
         },
-        'rows': rows
+        'rows': rows,
+        'recommendations': extract_recommendations(rows)
     }
 
 
+@traced()
 def write_json_report(path: str, metadata: Dict[str, Any], rows: List[Dict[str, Any]]) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
     payload = rows_to_json(metadata, rows)
@@ -426,11 +547,13 @@ def write_json_report(path: str, metadata: Dict[str, Any], rows: List[Dict[str,
         json.dump(payload, f, ensure_ascii=False, indent=2)
 
 
+@traced()
 def load_rows_from_json(path: str) -> Dict[str, Any]:
     with open(path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
+@traced()
 def render_rows_to_html(metadata: Dict[str, Any], rows: List[Dict[str, Any]]) -> str:
     def escape(text: str) -> str:
         return (text
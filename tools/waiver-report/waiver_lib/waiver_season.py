@@ -0,0 +1,145 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from lib.tracing import traced
+
+from .waiver_index import find_report_files, week_from_tab_name
+from .waiver_processing import extract_recommendations, load_rows_from_json
+
+SUMMARY_VERSION = 1
+SUMMARY_FILE_NAME = '.season-summary.json'
+
+TABLE_COLUMNS = ['week', 'tab_name', 'player', 'position', 'faab_min', 'faab_max', 'drop', 'notes']
+
+
+def build_recommendation_table(report_paths: List[Path]) -> Dict[str, List[Any]]:
+    """Columnar table ({column: [values]}) of every recommendation across report_paths.
+
+    Reports written before recommendations were embedded in the JSON are extracted from their rows.
+    """
+    table: Dict[str, List[Any]] = {column: [] for column in TABLE_COLUMNS}
+
+    for path in report_paths:
+        payload = load_rows_from_json(str(path))
+        metadata = payload.get('metadata', {})
+        tab_name = metadata.get('tab_name') or path.stem
+        week = week_from_tab_name(tab_name) or week_from_tab_name(path.stem)
+
+        records = payload.get('recommendations')
+        if records is None:
+            records = extract_recommendations(payload.get('rows', []))
+
+        for record in records:
+            table['week'].append(week)
+            table['tab_name'].append(tab_name)
+            for column in TABLE_COLUMNS[2:]:
+                table[column].append(record.get(column))
+
+    return table
+
+
+def _average(values: List[int]) -> Optional[float]:
+    return round(sum(values) / len(values), 1) if values else None
+
+
+def aggregate_players(table: Dict[str, List[Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per player: weeks recommended, average/max FAAB and the weeks they were on the drop list."""
+    players: Dict[str, Dict[str, Any]] = {}
+
+    for week, player, position, faab_min, faab_max, drop in zip(
+        table['week'], table['player'], table['position'],
+        table['faab_min'], table['faab_max'], table['drop']
+    ):
+        entry = players.setdefault(player, {
+            'position': None,
+            'weeks': [],
+            'drop_weeks': [],
+            '_faab_min': [],
+            '_faab_max': [],
+        })
+        if drop:
+            entry['drop_weeks'].append(week)
+            continue
+
+        entry['position'] = position
+        entry['weeks'].append(week)
+        if faab_min is not None:
+            entry['_faab_min'].append(faab_min)
+            entry['_faab_max'].append(faab_max)
+
+    for entry in players.values():
+        faab_min_values = entry.pop('_faab_min')
+        faab_max_values = entry.pop('_faab_max')
+        entry['weeks_recommended'] = len(entry['weeks'])
+        entry['avg_faab_min'] = _average(faab_min_values)
+        entry['avg_faab_max'] = _average(faab_max_values)
+        entry['max_faab'] = max(faab_max_values) if faab_max_values else None
+
+    return players
+
+
+def aggregate_positions(table: Dict[str, List[Any]]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Per position and week: number of recommendations plus average/max of the FAAB upper bound."""
+    buckets: Dict[str, Dict[Any, List[Optional[int]]]] = {}
+
+    for week, position, faab_max, drop in zip(table['week'], table['position'], table['faab_max'], table['drop']):
+        if drop or position is None:
+            continue
+        buckets.setdefault(position, {}).setdefault(week, []).append(faab_max)
+
+    positions: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for position, weeks in buckets.items():
+        trend: Dict[str, Dict[str, Any]] = {}
+        for week in sorted(weeks, key=lambda w: (w is None, w or 0)):
+            faab_values = [value for value in weeks[week] if value is not None]
+            trend[str(week)] = {
+                'count': len(weeks[week]),
+                'avg_faab_max': _average(faab_values),
+                'max_faab': max(faab_values) if faab_values else None,
+            }
+        positions[position] = trend
+    return positions
+
+
+def _signature(report_paths: List[Path]) -> List[List[Any]]:
+    signature = []
+    for path in report_paths:
+        stat = path.stat()
+        signature.append([path.name, stat.st_mtime_ns, stat.st_size])
+    return signature
+
+
+@traced()
+def load_season_summary(report_dir: Path, summary_path: Optional[Path] = None, rebuild: bool = False) -> Dict[str, Any]:
+    """Season table and aggregates for report_dir, cached in <report_dir>/.season-summary.json.
+
+    The cache is rebuilt only when a report file is added, removed or modified (or rebuild is set),
+    so budget queries read precomputed aggregates instead of re-parsing report text.
+    """
+    summary_path = Path(summary_path) if summary_path else Path(report_dir) / SUMMARY_FILE_NAME
+    report_paths = find_report_files(report_dir)
+    signature = _signature(report_paths)
+
+    if not rebuild and summary_path.exists():
+        try:
+            cached = json.loads(summary_path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            cached = {}
+        if cached.get('version') == SUMMARY_VERSION and cached.get('signature') == signature:
+            return cached
+
+    table = build_recommendation_table(report_paths)
+    summary = {
+        'version': SUMMARY_VERSION,
+        'signature': signature,
+        'table': table,
+        'players': aggregate_players(table),
+        'positions': aggregate_positions(table),
+    }
+
+    temp_path = summary_path.with_name(summary_path.name + '.tmp')
+    temp_path.write_text(json.dumps(summary, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+    os.replace(temp_path, summary_path)
+    return summary